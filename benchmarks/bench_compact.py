@@ -0,0 +1,113 @@
+"""Measure the memory of transformed frames with and without compact dtypes.
+
+Run with: python benchmarks/bench_compact.py
+"""
+import random
+
+from defillama_py.client import Llama
+
+DAY = 86400
+START = 1500000000 - 1500000000 % DAY
+DAYS = 1500
+CHAINS = [f"Chain {c}" for c in range(15)]
+PROTOCOLS = [f"protocol-{p}" for p in range(20)]
+TRANSACTIONS = 50000
+
+
+def chart(scale):
+    return [[START + day * DAY, random.random() * scale] for day in range(DAYS)]
+
+
+def responses():
+    bodies = {}
+    for protocol in PROTOCOLS:
+        bodies[f"/protocol/{protocol}"] = {
+            "chainTvls": {
+                chain: {
+                    "tvl": [
+                        {"date": START + d * DAY, "totalLiquidityUSD": random.random()}
+                        for d in range(DAYS)
+                    ]
+                }
+                for chain in CHAINS
+            }
+        }
+        bodies[f"/summary/fees/{protocol}"] = {
+            "totalDataChart": chart(1e6),
+            "totalDataChartBreakdown": [
+                [date, {c: {protocol: random.random() * 1e5} for c in CHAINS[:5]}]
+                for date, _ in chart(1)
+            ],
+        }
+    for chain in CHAINS:
+        bodies[f"/overview/dexs/{chain}"] = {
+            "totalDataChart": chart(1e9),
+            "totalDataChartBreakdown": [
+                [date, {p: random.random() * 1e7 for p in PROTOCOLS}]
+                for date, _ in chart(1)
+            ],
+        }
+        bodies[f"/bridgevolume/{chain}"] = [
+            {
+                "date": str(START + d * DAY),
+                "depositUSD": random.random() * 1e8,
+                "withdrawUSD": random.random() * 1e8,
+                "depositTxs": random.randint(0, 10000),
+                "withdrawTxs": random.randint(0, 10000),
+            }
+            for d in range(DAYS)
+        ]
+    bodies["/transactions/1"] = [
+        {
+            "tx_hash": f"0x{i:064x}",
+            "ts": f"2023-05-{1 + i % 28:02d}T12:00:00.000Z",
+            "tx_block": 17000000 + i,
+            "tx_from": f"0x{random.getrandbits(160):040x}",
+            "tx_to": f"0x{random.getrandbits(160):040x}",
+            "token": f"0x{i % 40:040x}",
+            "amount": str(random.getrandbits(64)),
+            "chain": CHAINS[i % len(CHAINS)],
+            "bridge_name": "bridge",
+            "usd_value": random.random() * 1e4,
+            "sourceChain": CHAINS[(i + 1) % len(CHAINS)],
+        }
+        for i in range(TRANSACTIONS)
+    ]
+    return bodies
+
+
+CALLS = {
+    "get_protocol_historical_tvl": (PROTOCOLS,),
+    "get_chain_bridge_volume": (CHAINS,),
+    "get_bridge_transactions": (1,),
+    "get_chain_dex_volume": (CHAINS, {"excludeTotalDataChart": True}),
+    "get_protocol_fees_revenue": (PROTOCOLS, {"excludeTotalDataChart": True}),
+}
+
+
+def client(bodies, compact):
+    llama = Llama(compact=compact)
+    llama._get = lambda api_tag, endpoint, params=None: bodies[endpoint]
+    return llama
+
+
+def main():
+    random.seed(0)
+    bodies = responses()
+    default, compact = client(bodies, False), client(bodies, True)
+
+    print(f"{'method':<30} {'rows':>9} {'default':>10} {'compact':>10} {'saved':>6}")
+    for method, args in CALLS.items():
+        sizes = []
+        for llama in (default, compact):
+            df = getattr(llama, method)(*args, raw=False)
+            sizes.append(df.memory_usage(deep=True).sum() / 2**20)
+        saved = 1 - sizes[1] / sizes[0]
+        print(
+            f"{method:<30} {len(df):>9,} {sizes[0]:>8.1f}MiB {sizes[1]:>8.1f}MiB "
+            f"{saved:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark JSON parse time per endpoint for each available decoder.
+
+Run with: python benchmarks/bench_json.py          (synthetic bodies)
+      or: python benchmarks/bench_json.py --live   (bodies fetched from DefiLlama)
+"""
+import json
+import random
+import sys
+import time
+
+from defillama_py.decoding import get_decoder
+
+DAYS = 1500
+REPEAT = 5
+
+
+def synthetic_bodies():
+    dates = [1500000000 + day * 86400 for day in range(DAYS)]
+    protocols = [
+        {
+            "id": str(i),
+            "name": f"Protocol {i}",
+            "slug": f"protocol-{i}",
+            "chains": ["Ethereum", "Arbitrum"],
+            "tvl": random.random() * 1e9,
+            "chainTvls": {"Ethereum": random.random(), "Arbitrum": random.random()},
+        }
+        for i in range(3000)
+    ]
+    protocol = {
+        "chainTvls": {
+            f"Chain {c}": {
+                "tvl": [
+                    {"date": d, "totalLiquidityUSD": random.random()} for d in dates
+                ],
+                "tokensInUsd": [
+                    {"date": d, "tokens": {f"T{t}": random.random() for t in range(10)}}
+                    for d in dates
+                ],
+            }
+            for c in range(10)
+        }
+    }
+    overview = {
+        "totalDataChart": [[d, random.random() * 1e9] for d in dates],
+        "totalDataChartBreakdown": [
+            [d, {f"dex-{p}": random.random() for p in range(50)}] for d in dates
+        ],
+    }
+    return {
+        "/protocols": json.dumps(protocols).encode(),
+        "/protocol/{slug}": json.dumps(protocol).encode(),
+        "/overview/dexs": json.dumps(overview).encode(),
+    }
+
+
+def live_bodies():
+    from defillama_py.client import Llama
+
+    llama = Llama()
+    calls = {
+        "/protocols": ("TVL", "/protocols"),
+        "/protocol/aave": ("TVL", "/protocol/aave"),
+        "/overview/dexs": ("VOLUMES", "/overview/dexs"),
+        "/pools": ("YIELDS", "/pools"),
+    }
+    return {name: llama.get_raw(*call).content for name, call in calls.items()}
+
+
+def timed(fn, body):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(0)
+    bodies = live_bodies() if "--live" in sys.argv else synthetic_bodies()
+
+    decoders = {"json": get_decoder("json")}
+    try:
+        decoders["orjson"] = get_decoder("orjson")
+    except ImportError:
+        print("orjson is not installed, only the standard library is measured")
+
+    for endpoint, body in bodies.items():
+        timings = " ".join(
+            f"{name}={timed(fn, body) * 1000:8.1f}ms" for name, fn in decoders.items()
+        )
+        print(f"{endpoint:<18} {len(body) / 2**20:7.1f}MiB {timings}")
+
+
+if __name__ == "__main__":
+    main()
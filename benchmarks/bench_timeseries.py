@@ -0,0 +1,122 @@
+"""Benchmark the shared time-series engine against the previous dict-per-row approach.
+
+Run with: python benchmarks/bench_timeseries.py
+"""
+import random
+import time
+
+import pandas as pd
+
+from defillama_py.client import CHAIN_DEX_VOLUME, PROTOCOL_DEX_VOLUME
+from defillama_py.timeseries import assemble
+
+DAYS = 1500
+PROTOCOLS = 300
+CHAINS = 20
+VERSIONS = 3
+REPEAT = 3
+
+
+def make_overview_response():
+    names = [f"protocol-{i}" for i in range(PROTOCOLS)]
+    return {
+        "totalDataChartBreakdown": [
+            [1500000000 + day * 86400, {name: random.random() * 1e6 for name in names}]
+            for day in range(DAYS)
+        ]
+    }
+
+
+def make_summary_response():
+    chains = [f"Chain {i}" for i in range(CHAINS)]
+    versions = [f"v{i}" for i in range(VERSIONS)]
+    return {
+        "totalDataChartBreakdown": [
+            [
+                1500000000 + day * 86400,
+                {c: {v: random.random() * 1e6 for v in versions} for c in chains},
+            ]
+            for day in range(DAYS)
+        ]
+    }
+
+
+def dict_per_row_overview(responses):
+    records = []
+    for chain, response in responses.items():
+        for timestamp, protocols in response["totalDataChartBreakdown"]:
+            for protocol, volume in protocols.items():
+                records.append(
+                    {
+                        "date": timestamp,
+                        "chain": chain,
+                        "protocol": protocol,
+                        "volume": volume,
+                    }
+                )
+    df = pd.DataFrame(records)
+    df["chain"] = df["chain"].str.lower().str.replace(r"[-\s]", "_", regex=True)
+    return df
+
+
+def dict_per_row_summary(responses):
+    records = []
+    for protocol, response in responses.items():
+        for timestamp, chains in response["totalDataChartBreakdown"]:
+            for chain, versions in chains.items():
+                for version, volume in versions.items():
+                    records.append(
+                        {
+                            "timestamp": timestamp,
+                            "chain": chain,
+                            "protocol": protocol,
+                            "protocol_version": version,
+                            "volume": volume,
+                        }
+                    )
+    return pd.DataFrame(records)
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, baseline, engine):
+    (base_time, base_df), (engine_time, engine_df) = baseline, engine
+    base_mem = base_df.memory_usage(deep=True).sum() / 2**20
+    engine_mem = engine_df.memory_usage(deep=True).sum() / 2**20
+    print(
+        f"{name:<28} rows={len(engine_df):>9,} "
+        f"dict-per-row={base_time:6.2f}s/{base_mem:7.1f}MiB "
+        f"engine={engine_time:6.2f}s/{engine_mem:7.1f}MiB"
+    )
+
+
+def main():
+    random.seed(0)
+    params = {"excludeTotalDataChart": True}
+
+    overview = {"Ethereum": make_overview_response(), "Arbitrum One": None}
+    overview["Arbitrum One"] = overview["Ethereum"]
+    report(
+        "overview breakdown (chain)",
+        timed(dict_per_row_overview, overview),
+        timed(assemble, CHAIN_DEX_VOLUME, overview, params),
+    )
+
+    summary = {"uniswap": make_summary_response(), "curve": None}
+    summary["curve"] = summary["uniswap"]
+    report(
+        "summary breakdown (protocol)",
+        timed(dict_per_row_summary, summary),
+        timed(assemble, PROTOCOL_DEX_VOLUME, summary, params),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark the columnar TVL extractor against the previous dict-per-row approach.
+
+Run with: python benchmarks/bench_tvl.py
+"""
+import random
+import time
+
+import pandas as pd
+
+from defillama_py.tvl import extract_tokens, extract_tvl
+
+PROTOCOLS = 20
+CHAINS = 15
+DAYS = 1500
+TOKENS = 10
+REPEAT = 3
+
+
+def make_response():
+    chain_tvls = {}
+    for c in range(CHAINS):
+        dates = [1500000000 + day * 86400 for day in range(DAYS)]
+        chain_tvls[f"Chain {c}"] = {
+            "tvl": [
+                {"date": d, "totalLiquidityUSD": random.random() * 1e8} for d in dates
+            ],
+            "tokens": [
+                {"date": d, "tokens": {f"T{t}": random.random() for t in range(TOKENS)}}
+                for d in dates
+            ],
+            "tokensInUsd": [
+                {"date": d, "tokens": {f"T{t}": random.random() for t in range(TOKENS)}}
+                for d in dates
+            ],
+        }
+    return {"chainTvls": chain_tvls}
+
+
+def dict_per_row(responses):
+    results = []
+    for protocol, data in responses.items():
+        for chain, chain_data in data.get("chainTvls", {}).items():
+            for entry in chain_data.get("tvl", []):
+                results.append(
+                    {
+                        "date": entry.get("date"),
+                        "chain": chain,
+                        "protocol": protocol,
+                        "tvl": entry.get("totalLiquidityUSD"),
+                    }
+                )
+    df = pd.DataFrame(results)
+    df["chain"] = df["chain"].str.lower().str.replace(r"[-\s]", "_", regex=True)
+    return df
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    random.seed(0)
+    response = make_response()
+    responses = {f"protocol-{i}": response for i in range(PROTOCOLS)}
+
+    for name, fn in [
+        ("dict-per-row tvl", dict_per_row),
+        ("extract_tvl", extract_tvl),
+        ("extract_tokens", extract_tokens),
+    ]:
+        seconds, df = timed(fn, responses)
+        memory = df.memory_usage(deep=True).sum() / 2**20
+        print(f"{name:<18} rows={len(df):>10,} {seconds:6.2f}s {memory:8.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""Compressed, content-addressed archive of raw API responses."""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dictionary INTEGER,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    base TEXT,
+    depth INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    family TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY,
+    api_tag TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest)
+);
+CREATE INDEX IF NOT EXISTS fetches_lookup ON fetches (endpoint, params, fetched_at);
+CREATE INDEX IF NOT EXISTS fetches_time ON fetches (fetched_at);
+"""
+
+
+class ArchiveEntry(NamedTuple):
+    """One archived fetch. The body is read with `ResponseArchive.get(digest)`."""
+
+    api_tag: str
+    endpoint: str
+    params: Dict
+    fetched_at: float
+    digest: str
+
+
+def endpoint_family(api_tag: str, endpoint: str) -> str:
+    """Group endpoints whose responses look alike, e.g. every "/protocol/{slug}".
+
+    The family is the API tag and the first path segment, skipping a version prefix.
+    """
+    segments = [s for s in endpoint.split("/") if s]
+    if segments and segments[0] in ("v1", "v2"):
+        segments = segments[1:]
+    return f"{api_tag}:{segments[0] if segments else ''}"
+
+
+def _params_key(params: Optional[Dict]) -> str:
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _delta_params(zstd, level: int, size: int):
+    """zstandard parameters whose window spans the base body and the new one, so
+    matches anywhere in the base are found."""
+    window_log = max(10, min(31, size.bit_length()))
+    return zstd.ZstdCompressionParameters.from_level(
+        level,
+        window_log=window_log,
+        hash_log=min(window_log, 24),
+        chain_log=min(window_log, 24),
+    )
+
+
+class ResponseArchive:
+    """Stores raw response bodies compressed and deduplicated, with an index by
+    (endpoint, params, fetched_at).
+
+    Bodies are addressed by their SHA-256, so a payload that didn't change since the
+    last pull only adds an index row. A body that changed is delta-compressed
+    against the previous body of the same endpoint and params: a time series that
+    gained a day stores little more than that day. Other bodies are compressed with
+    zstandard when it is installed, using a dictionary trained per endpoint family
+    once `train_after` bodies of that family have been seen, and with zlib
+    otherwise. zlib only looks back 32 KiB, so its deltas mostly help small bodies;
+    install zstandard for large ones.
+
+    Parameters:
+    - path (str, required): SQLite database file holding the index and the bodies.
+    - level (int, optional): Compression level. Bodies are compressed as they are
+    fetched, so the default favours speed: 3 for zstandard and 6 for zlib. Pass
+    e.g. 19 (zstandard) or 9 (zlib) for smaller archives at a much higher CPU cost.
+    - train_after (int, optional): Number of bodies of a family to collect before
+    training its zstandard dictionary. Defaults to 16.
+    - max_delta_depth (int, optional): Longest chain of deltas before a body is
+    stored whole again, which bounds how many bodies `get` decompresses. Defaults
+    to 16. Pass 0 to disable delta compression.
+
+    Example:
+        archive = ResponseArchive("responses.db")
+        llama = Llama(archive=archive)
+        llama.get_protocol_historical_tvl("aave")
+        entry = archive.lookup(endpoint="/protocol/aave")[-1]
+        body = archive.get(entry.digest)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        level: Optional[int] = None,
+        train_after: int = 16,
+        max_delta_depth: int = 16,
+    ):
+        try:
+            import zstandard
+        except ImportError:
+            zstandard = None
+
+        self.zstd = zstandard
+        self.level = level or (3 if zstandard else 6)
+        self.train_after = train_after
+        self.max_delta_depth = max_delta_depth
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        columns = {
+            row[1] for row in self.connection.execute("PRAGMA table_info(blobs)")
+        }
+        if "base" not in columns:
+            # Archives written before delta compression
+            with self.connection:
+                self.connection.execute("ALTER TABLE blobs ADD COLUMN base TEXT")
+                self.connection.execute(
+                    "ALTER TABLE blobs ADD COLUMN depth INTEGER NOT NULL DEFAULT 0"
+                )
+        self.samples: Dict[str, List[bytes]] = {}
+        self.dictionaries: Dict[str, int] = dict(
+            self.connection.execute(
+                "SELECT family, MAX(id) FROM dictionaries GROUP BY family"
+            ).fetchall()
+        )
+        self._dictionary_cache: Dict[int, object] = {}
+
+    # --- Compression --- #
+
+    def _dictionary(self, dictionary_id: int):
+        if dictionary_id not in self._dictionary_cache:
+            (data,) = self.connection.execute(
+                "SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)
+            ).fetchone()
+            self._dictionary_cache[dictionary_id] = self.zstd.ZstdCompressionDict(data)
+        return self._dictionary_cache[dictionary_id]
+
+    def _sample(self, family: str, content: bytes) -> Optional[List[bytes]]:
+        """Collect a training sample; returns the samples once there are enough to
+        train the family's dictionary. Called with the lock held."""
+        samples = self.samples.setdefault(family, [])
+        samples.append(content)
+        if len(samples) < self.train_after:
+            return None
+        return self.samples.pop(family)
+
+    def _train(self, samples: List[bytes]) -> Optional[bytes]:
+        try:
+            trained = self.zstd.train_dictionary(
+                min(112640, sum(map(len, samples)) // 10), samples
+            )
+        except self.zstd.ZstdError:
+            return None
+        return trained.as_bytes()
+
+    def _compress(
+        self,
+        content: bytes,
+        dictionary_id: Optional[int],
+        dictionary: Optional[bytes],
+    ):
+        if self.zstd is None:
+            return "zlib", None, zlib.compress(content, self.level)
+        # A dictionary object per call: compressors prepare it in place, which isn't
+        # safe to share between threads
+        if dictionary is not None:
+            dictionary = self.zstd.ZstdCompressionDict(dictionary)
+        compressor = self.zstd.ZstdCompressor(level=self.level, dict_data=dictionary)
+        return "zstd", dictionary_id, compressor.compress(content)
+
+    def _compress_delta(self, content: bytes, base: bytes):
+        if self.zstd is None:
+            compressor = zlib.compressobj(self.level, zdict=base)
+            return "zlib", compressor.compress(content) + compressor.flush()
+        params = _delta_params(self.zstd, self.level, len(base) + len(content))
+        compressor = self.zstd.ZstdCompressor(
+            compression_params=params, dict_data=self._raw_dictionary(base)
+        )
+        return "zstd", compressor.compress(content)
+
+    def _raw_dictionary(self, base: bytes):
+        return self.zstd.ZstdCompressionDict(
+            base, dict_type=self.zstd.DICT_TYPE_RAWCONTENT
+        )
+
+    def _decompress(
+        self,
+        codec: str,
+        dictionary_id: Optional[int],
+        data: bytes,
+        base: Optional[str] = None,
+    ):
+        """Decompress a stored body, first rebuilding its delta base if it has one.
+        Called with the lock held."""
+        base_body = self._body(base) if base is not None else None
+        if codec == "zlib":
+            if base_body is None:
+                return zlib.decompress(data)
+            decompressor = zlib.decompressobj(zdict=base_body)
+            return decompressor.decompress(data) + decompressor.flush()
+        if self.zstd is None:
+            raise ImportError(
+                "This archive was written with zstandard: pip install zstandard"
+            )
+        if base_body is not None:
+            return self.zstd.ZstdDecompressor(
+                dict_data=self._raw_dictionary(base_body), max_window_size=1 << 31
+            ).decompress(data)
+        if dictionary_id is None:
+            return self.zstd.ZstdDecompressor().decompress(data)
+        return self.zstd.ZstdDecompressor(
+            dict_data=self._dictionary(dictionary_id)
+        ).decompress(data)
+
+    # --- Writing and reading --- #
+
+    def add(
+        self,
+        api_tag: str,
+        endpoint: str,
+        params: Optional[Dict],
+        content: bytes,
+        fetched_at: Optional[float] = None,
+    ) -> str:
+        """Archive a response body and return its digest.
+
+        Only the index lookups, reading the delta base and the inserts run under the
+        lock; compressing a new body and training a dictionary happen outside it.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        family = endpoint_family(api_tag, endpoint)
+        fetch = (api_tag, endpoint, _params_key(params), fetched_at, digest)
+
+        with self.lock:
+            known = self.connection.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+            if known is not None:
+                with self.connection:
+                    self._insert_fetch(fetch)
+                return digest
+            base, base_body, depth = self._delta_base(api_tag, endpoint, fetch[2])
+            dictionary_id, dictionary, samples = None, None, None
+            if self.zstd is not None and base is None:
+                dictionary_id = self.dictionaries.get(family)
+                if dictionary_id is None:
+                    samples = self._sample(family, content)
+                else:
+                    dictionary = self._dictionary(dictionary_id).as_bytes()
+
+        trained = self._train(samples) if samples else None
+        if base is None:
+            codec, dictionary_id, data = self._compress(
+                content, dictionary_id, dictionary
+            )
+        else:
+            codec, data = self._compress_delta(content, base_body)
+
+        with self.lock, self.connection:
+            if trained is not None:
+                cursor = self.connection.execute(
+                    "INSERT INTO dictionaries (family, data) VALUES (?, ?)",
+                    (family, trained),
+                )
+                self.dictionaries[family] = cursor.lastrowid
+            # Another thread may have stored the same body meanwhile
+            self.connection.execute(
+                "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, codec, dictionary_id, len(content), data, base, depth),
+            )
+            self._insert_fetch(fetch)
+        return digest
+
+    def _delta_base(self, api_tag: str, endpoint: str, params: str):
+        """Digest, body and delta depth to compress a new body of this endpoint
+        against, or Nones when it is stored whole. Called with the lock held."""
+        if self.max_delta_depth <= 0:
+            return None, None, 0
+        row = self.connection.execute(
+            "SELECT fetches.digest, blobs.depth FROM fetches JOIN blobs USING (digest) "
+            "WHERE api_tag = ? AND endpoint = ? AND params = ? "
+            "ORDER BY fetched_at DESC, id DESC LIMIT 1",
+            (api_tag, endpoint, params),
+        ).fetchone()
+        if row is None or row[1] >= self.max_delta_depth:
+            return None, None, 0
+        return row[0], self._body(row[0]), row[1] + 1
+
+    def _body(self, digest: str) -> bytes:
+        row = self.connection.execute(
+            "SELECT codec, dictionary, data, base FROM blobs WHERE digest = ?",
+            (digest,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return self._decompress(*row)
+
+    def _insert_fetch(self, fetch: tuple):
+        self.connection.execute(
+            "INSERT INTO fetches (api_tag, endpoint, params, fetched_at, digest) "
+            "VALUES (?, ?, ?, ?, ?)",
+            fetch,
+        )
+
+    def get(self, digest: str) -> bytes:
+        """Return the body stored under `digest`."""
+        with self.lock:
+            return self._body(digest)
+
+    def lookup(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[Dict] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        api_tag: Optional[str] = None,
+    ) -> List[ArchiveEntry]:
+        """Archived fetches matching every given filter, oldest first.
+
+        Parameters:
+        - endpoint (str, optional): Exact endpoint path, e.g. "/protocol/aave".
+        - params (Dict, optional): Exact params the endpoint was called with.
+        - since (float, optional): Earliest fetch time (unix seconds), inclusive.
+        - until (float, optional): Latest fetch time (unix seconds), exclusive.
+        - api_tag (str, optional): API the endpoint belongs to, e.g. "TVL".
+        """
+        clauses, args = [], []
+        if api_tag is not None:
+            clauses.append("api_tag = ?")
+            args.append(api_tag)
+        if endpoint is not None:
+            clauses.append("endpoint = ?")
+            args.append(endpoint)
+        if params is not None:
+            clauses.append("params = ?")
+            args.append(_params_key(params))
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            args.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT api_tag, endpoint, params, fetched_at, digest FROM fetches "
+                f"{where} ORDER BY fetched_at, id",
+                args,
+            ).fetchall()
+        return [
+            ArchiveEntry(api_tag, endpoint, json.loads(params), fetched_at, digest)
+            for api_tag, endpoint, params, fetched_at, digest in rows
+        ]
+
+    def latest(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        api_tag: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """Most recently archived body of an endpoint, or None. Pass `api_tag` to
+        tell apart endpoints with the same path on different APIs."""
+        clauses, args = ["endpoint = ?", "params = ?"], [endpoint, _params_key(params)]
+        if api_tag is not None:
+            clauses.append("api_tag = ?")
+            args.append(api_tag)
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT digest FROM fetches WHERE {' AND '.join(clauses)} "
+                "ORDER BY fetched_at DESC, id DESC LIMIT 1",
+                args,
+            ).fetchone()
+            return self._body(row[0]) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        """Number of fetches and distinct bodies, and their raw and stored sizes."""
+        with self.lock:
+            fetches, raw = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(blobs.size), 0) FROM fetches "
+                "JOIN blobs USING (digest)"
+            ).fetchone()
+            blobs, stored = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "fetches": fetches,
+            "blobs": blobs,
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,117 @@
+"""Output backends: the frame library transformed results are returned in."""
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+BACKENDS = ("pandas", "arrow", "polars")
+
+
+class Backend:
+    """Builds output frames. The default returns pandas DataFrames unchanged.
+
+    Subclasses implement `from_columns`, used for frames assembled column by column
+    (the volume and fees methods), and `from_pandas` for the other methods.
+    """
+
+    name = "pandas"
+
+    def from_columns(self, columns: Dict[str, Union[np.ndarray, pd.Categorical]]):
+        """Build a frame from numpy arrays and Categoricals."""
+        return pd.DataFrame(columns)
+
+    def from_pandas(self, df: pd.DataFrame):
+        return df
+
+    def to_pandas(self, frame) -> pd.DataFrame:
+        return frame
+
+
+class ArrowBackend(Backend):
+    """Returns pyarrow Tables. Numeric columns are wrapped without a copy and
+    categorical columns become dictionary arrays over the same integer codes."""
+
+    name = "arrow"
+
+    def __init__(self):
+        import pyarrow
+
+        self.pa = pyarrow
+
+    def array(self, values: Union[np.ndarray, pd.Categorical]):
+        if isinstance(values, pd.Categorical):
+            codes = self.pa.array(values.codes, mask=values.codes < 0)
+            labels = self.pa.array(values.categories.to_numpy(dtype=object))
+            return self.pa.DictionaryArray.from_arrays(codes, labels)
+        return self.pa.array(values)
+
+    def from_columns(self, columns):
+        return self.pa.table({name: self.array(v) for name, v in columns.items()})
+
+    def from_pandas(self, df):
+        return self.pa.Table.from_pandas(df, preserve_index=False)
+
+    def to_pandas(self, frame):
+        return frame.to_pandas()
+
+
+class PolarsBackend(Backend):
+    """Returns polars DataFrames, built from the numpy columns directly.
+    Categorical columns become Enum columns gathered from their codes, and
+    datetime64[s] columns are widened to milliseconds, the coarsest datetime
+    resolution polars accepts."""
+
+    name = "polars"
+
+    def __init__(self):
+        import polars
+
+        self.pl = polars
+
+    def series(self, name: str, values: Union[np.ndarray, pd.Categorical]):
+        pl = self.pl
+        if isinstance(values, pd.Categorical):
+            categories = [str(label) for label in values.categories]
+            labels = pl.Series(name, categories, dtype=pl.Enum(categories))
+            # Code -1 (missing) doesn't fit UInt32 and becomes null
+            codes = pl.Series(values.codes.astype("int64")).cast(
+                pl.UInt32, strict=False
+            )
+            return labels.gather(codes)
+        if values.dtype == np.dtype("datetime64[s]"):
+            values = values.astype("datetime64[ms]")
+        return pl.Series(name, values)
+
+    def from_columns(self, columns):
+        return self.pl.DataFrame([self.series(n, v) for n, v in columns.items()])
+
+    def from_pandas(self, df):
+        return self.pl.from_pandas(df)
+
+    def to_pandas(self, frame):
+        return frame.to_pandas()
+
+
+def get_backend(backend: Union[str, Backend] = "pandas") -> Backend:
+    """Return the output backend.
+
+    Parameters:
+    - backend (str or Backend, optional): "pandas", "arrow" (requires pyarrow) or
+    "polars" (requires polars). A Backend instance is returned unchanged. Defaults
+    to "pandas".
+    """
+    if isinstance(backend, Backend):
+        return backend
+    if backend == "pandas":
+        return Backend()
+    if backend in ("arrow", "polars"):
+        module = "pyarrow" if backend == "arrow" else "polars"
+        try:
+            return ArrowBackend() if backend == "arrow" else PolarsBackend()
+        except ImportError:
+            raise ImportError(
+                f"The '{backend}' backend requires {module}: pip install {module}"
+            ) from None
+    raise ValueError(
+        f"backend must be a Backend or one of {', '.join(BACKENDS)}, got '{backend}'."
+    )
@@ -0,0 +1,58 @@
+"""Result types for multi-entity calls that tolerate partial failures."""
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+NO_DATA = "no_data"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+INVALID_RESPONSE = "invalid_response"
+INVALID_INPUT = "invalid_input"
+
+ERROR_MODES = ("raise", "collect")
+
+
+class EntityError(NamedTuple):
+    """Why a single entity of a batch failed.
+
+    - kind: One of "no_data", "timeout", "connection", "invalid_response" or
+    "invalid_input" (rejected by validation before any request).
+    - message: Human readable description.
+    - exception: The underlying exception, if any.
+    """
+
+    kind: str
+    message: str
+    exception: Optional[Exception] = None
+
+
+class BatchResult(NamedTuple):
+    """Successful results of a batch along with a per-entity error map.
+
+    - data: What the method returns normally, built from the successful entities
+    only (a dict of raw responses, a DataFrame, or a SeriesPair).
+    - errors: Mapping of each failed entity to an EntityError.
+    """
+
+    data: Any
+    errors: Dict[Hashable, EntityError]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def entity_error(exception: Exception) -> EntityError:
+    """Classify an exception raised by `Llama._get`."""
+    if isinstance(exception, TimeoutError):
+        kind = TIMEOUT
+    elif isinstance(exception, ConnectionError):
+        kind = CONNECTION
+    else:
+        kind = INVALID_RESPONSE
+    return EntityError(kind, str(exception), exception)
+
+
+def check_error_mode(errors: str):
+    if errors not in ERROR_MODES:
+        raise ValueError(
+            f"errors must be one of {', '.join(ERROR_MODES)}, got '{errors}'."
+        )
@@ -0,0 +1,183 @@
+"""Per-host circuit breakers and the last-good response cache they fall back on."""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, NamedTuple, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host that keeps failing.
+
+    The breaker opens when at least `min_requests` requests were made in the last
+    `window` seconds and `failure_rate` or more of them failed. While open, requests
+    fail immediately. After `open_seconds` it lets `probes` requests through
+    (half-open): a success closes it again, a failure reopens it.
+
+    Parameters:
+    - failure_rate (float, optional): Failure ratio that opens the breaker. Defaults
+    to 0.5.
+    - min_requests (int, optional): Requests needed in the window before the ratio
+    is considered. Defaults to 5.
+    - window (float, optional): Length of the rolling window in seconds. Defaults
+    to 60.
+    - open_seconds (float, optional): Time spent open before probing. Defaults to
+    30.
+    - probes (int, optional): Concurrent requests allowed while half-open. Defaults
+    to 1.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 5,
+        window: float = 60.0,
+        open_seconds: float = 30.0,
+        probes: int = 1,
+    ):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = 0
+        self.outcomes: Deque[Tuple[float, bool]] = deque()
+        self.lock = threading.Lock()
+
+    def _trim(self, now: float):
+        while self.outcomes and self.outcomes[0][0] < now - self.window:
+            self.outcomes.popleft()
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.probing = 0
+
+    def before(self):
+        """Call before sending a request; raises CircuitOpenError if it may not be
+        sent. Every allowed request must be followed by `record()`."""
+        with self.lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    raise CircuitOpenError("Circuit is open.")
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self.probing >= self.probes:
+                    raise CircuitOpenError("Circuit is half-open, probe in flight.")
+                self.probing += 1
+
+    def record(self, success: bool):
+        """Record the outcome of a request allowed by `before()`."""
+        now = time.monotonic()
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self.probing = max(0, self.probing - 1)
+                if success:
+                    self.state = CLOSED
+                    self.outcomes.clear()
+                else:
+                    self._open(now)
+                return
+            if self.state == OPEN:
+                return
+
+            self.outcomes.append((now, success))
+            self._trim(now)
+            total = len(self.outcomes)
+            failures = sum(1 for _, ok in self.outcomes if not ok)
+            if total >= self.min_requests and failures >= self.failure_rate * total:
+                self._open(now)
+
+
+class BreakerRegistry:
+    """Keeps one `CircuitBreaker` per host, created with shared settings."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(**self.settings)
+            return self.breakers[host]
+
+    def states(self) -> Dict[str, str]:
+        with self.lock:
+            return {host: breaker.state for host, breaker in self.breakers.items()}
+
+
+class CachedResponse(NamedTuple):
+    """The parts of a response kept by `LastGoodCache`."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+    def response(self) -> requests.Response:
+        """A new `requests.Response` holding the cached body."""
+        response = requests.Response()
+        response._content = self.content
+        response.status_code = self.status_code
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = "utf-8"
+        return response
+
+
+class LastGoodCache:
+    """LRU of the latest successful response body per request, bounded by the
+    total size of the bodies.
+
+    Parameters:
+    - max_bytes (int, optional): Total size of the cached bodies. Least recently
+    used entries are dropped beyond it, and larger bodies are not cached. Defaults
+    to 64 MiB.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def put(self, key: Hashable, response: requests.Response):
+        cached = CachedResponse(
+            response.url,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+        )
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.content)
+            if len(cached.content) > self.max_bytes:
+                return
+            self.entries[key] = cached
+            self.size += len(cached.content)
+            while self.size > self.max_bytes:
+                _, dropped = self.entries.popitem(last=False)
+                self.size -= len(dropped.content)
+
+    def get(self, key: Hashable) -> Optional[requests.Response]:
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is None:
+                return None
+            self.entries.move_to_end(key)
+        return cached.response()
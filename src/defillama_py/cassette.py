@@ -0,0 +1,164 @@
+"""Record/replay of API exchanges for deterministic offline runs."""
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+from typing import Dict, Optional, Set, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+
+def request_key(api_tag: str, endpoint: str, params: Optional[Dict] = None) -> str:
+    """Stable identifier of a request, independent of the params' order."""
+    params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    payload = json.dumps([api_tag, endpoint, params], separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class Cassette:
+    """Records API exchanges to a compressed archive and replays them.
+
+    The archive is a zip file holding one deflate-compressed member per distinct
+    request, named after a hash of (api_tag, endpoint, params). The URL, status
+    code, headers and original latency are kept in the member's comment, so the
+    zip central directory doubles as the index and a single exchange is read
+    without decompressing the others.
+
+    Parameters:
+    - path (str, required): Archive file.
+    - mode (str, optional): "record" to store every exchange (the archive is
+    started afresh and stays open for appending; it is complete once the cassette
+    is closed), or "replay" to serve requests from it. Defaults to "replay".
+    - latency (float or str, optional): Seconds to wait before each replayed
+    response, or "recorded" to wait as long as the original request took.
+    Defaults to 0.
+
+    Example:
+        with Cassette("defillama.zip", mode="record") as cassette:
+            Llama(cassette=cassette).get_protocols()
+
+        llama = Llama(cassette=Cassette("defillama.zip"))
+        llama.get_protocols()  # served offline
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        latency: Union[float, str] = 0.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}, got '{mode}'.")
+        if isinstance(latency, str) and latency != "recorded":
+            raise ValueError("latency must be a number of seconds or 'recorded'.")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.archive: Optional[zipfile.ZipFile] = None
+        self.recorded: Set[str] = set()
+
+        self.archive = zipfile.ZipFile(path, "w" if mode == RECORD else "r")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def record(
+        self,
+        api_tag: str,
+        endpoint: str,
+        params: Optional[Dict],
+        response: requests.Response,
+    ):
+        """Store an exchange. Repeated requests keep their first response."""
+        key = request_key(api_tag, endpoint, params)
+        info = zipfile.ZipInfo(key, date_time=time.gmtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.comment = json.dumps(
+            {
+                "url": response.url,
+                "status": response.status_code,
+                "headers": dict(response.headers),
+                "elapsed": response.elapsed.total_seconds(),
+            }
+        ).encode()
+
+        with self.lock:
+            if self.archive is None:
+                raise ValueError(f"Cassette '{self.path}' is closed.")
+            if key in self.recorded:
+                return
+            self.archive.writestr(info, response.content)
+            self.recorded.add(key)
+
+    def play(
+        self, api_tag: str, endpoint: str, params: Optional[Dict] = None
+    ) -> requests.Response:
+        """Return the recorded response of a request.
+
+        Raises ConnectionError if the request was not recorded, so that a miss is
+        handled like any other failed request.
+        """
+        key = request_key(api_tag, endpoint, params)
+        with self.lock:
+            try:
+                info = self.archive.getinfo(key)
+            except KeyError:
+                raise ConnectionError(
+                    f"No recorded response for '{endpoint}' with params {params} "
+                    f"in cassette '{self.path}'."
+                ) from None
+            content = self.archive.read(info)
+
+        meta = json.loads(info.comment)
+        delay = meta["elapsed"] if self.latency == "recorded" else self.latency
+        if delay:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response._content = content
+        response.status_code = meta["status"]
+        response.url = meta["url"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.elapsed = datetime.timedelta(seconds=meta["elapsed"])
+        response.encoding = "utf-8"
+        return response
+
+    def __len__(self) -> int:
+        if self.recording:
+            return len(self.recorded)
+        return len(self.archive.infolist())
+
+    def __contains__(self, request) -> bool:
+        """Whether an (api_tag, endpoint[, params]) request is in the cassette."""
+        key = request_key(*request)
+        if self.recording:
+            return key in self.recorded
+        return key in self.archive.NameToInfo
+
+    def size(self) -> int:
+        """Size of the archive on disk, in bytes. While recording, the index is only
+        written on `close()`."""
+        return os.path.getsize(self.path)
+
+    def close(self):
+        """Close the archive; when recording, this writes its index."""
+        with self.lock:
+            if self.archive is not None:
+                self.archive.close()
+                self.archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
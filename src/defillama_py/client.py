@@ -5,7 +5,6 @@ packaged transformations should return only critical data (no metadata).
     for a tvl endpoint, only return tvl
 handle potential rate limiting: 500 requests / min
 handle authentication
-check that function inputs (chains, protocols, coins, etc.) exist
 check is instance and type check matching
 lots of work to do on error handling, type checking, etc.
 make sure the test paths are accessed properly for when anyone new
@@ -21,9 +20,85 @@ comment under each function
 called in the function definition.
 
 """
+import inspect
+import os
+import time
+import warnings
+import numpy as np
 import requests
 import pandas as pd
-from typing import Union, List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Hashable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+    List,
+    Dict,
+    Optional,
+)
+
+from defillama_py.archive import ResponseArchive
+from defillama_py.backends import Backend, get_backend
+from defillama_py.batch import (
+    INVALID_INPUT,
+    NO_DATA,
+    BatchResult,
+    EntityError,
+    check_error_mode,
+    entity_error,
+)
+from defillama_py.breaker import BreakerRegistry, CircuitOpenError, LastGoodCache
+from defillama_py.cassette import Cassette, request_key
+from defillama_py.compact import compact_floats, compact_frame
+from defillama_py.concurrency import ConcurrencyController
+from defillama_py.decoding import Decoder, get_decoder
+from defillama_py.hedging import Hedger, latency_key
+from defillama_py.matrix import TVLMatrix
+from defillama_py.query import Query, SeriesFamily
+from defillama_py.parallel import TransformPool, discard, import_frames
+from defillama_py.ratelimit import RateLimiter
+from defillama_py.records import BridgeTransaction, Chain, Pool, Protocol, Stablecoin
+from defillama_py.store import LocalStore
+from defillama_py.streaming import prefetch, row_chunks
+from defillama_py.snapshots import SnapshotChanges, SnapshotDiffer
+from defillama_py.timeseries import (
+    BREAKDOWN,
+    CHART,
+    SeriesEndpoint,
+    SeriesPair,
+    align_daily,
+    assemble,
+    assemble_both,
+    assemble_columns,
+    both_params,
+    chain_alias_table,
+    daily_series,
+    data_type,
+    dataset_name,
+    has_data,
+    normalize_chain_column,
+    series_mode,
+)
+from defillama_py.validation import (
+    BRIDGE,
+    CHAIN,
+    POOL,
+    PROTOCOL,
+    KnownNames,
+    Validator,
+)
+from defillama_py.tvl import (
+    TokenBreakdown,
+    TvlHistory,
+    extract_token_columns,
+    extract_tokens,
+    extract_tvl,
+    is_chain_key,
+)
 
 TVL_URL = VOLUMES_URL = FEES_URL = "https://api.llama.fi"
 COINS_URL = "https://coins.llama.fi"
@@ -32,16 +107,336 @@ YIELDS_URL = "https://yields.llama.fi"
 ABI_URL = "https://abi-decoder.llama.fi"
 BRIDGES_URL = "https://bridges.llama.fi"
 
+# Endpoint descriptors for the volume and fees methods
+OVERVIEW_DIMS = ("protocol",)
+SUMMARY_DIMS = ("chain", "protocol_version")
+
+DEX_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/dexs",
+    None,
+    OVERVIEW_DIMS,
+    "dailyVolume",
+    "volume",
+    name="dex_volume",
+)
+CHAIN_DEX_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/dexs",
+    "chain",
+    OVERVIEW_DIMS,
+    "dailyVolume",
+    "volume",
+    "chain",
+    name="chain_dex_volume",
+)
+PROTOCOL_DEX_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/summary/dexs",
+    "protocol",
+    SUMMARY_DIMS,
+    "dailyVolume",
+    "volume",
+    "dex protocol",
+    name="protocol_dex_volume",
+)
+PERPS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/derivatives",
+    None,
+    OVERVIEW_DIMS,
+    "dailyVolume",
+    "volume",
+    name="perps_volume",
+)
+CHAIN_PERPS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/derivatives",
+    "chain",
+    OVERVIEW_DIMS,
+    "dailyVolume",
+    "volume",
+    "chain",
+    name="chain_perps_volume",
+)
+PROTOCOL_PERPS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/summary/derivatives",
+    "protocol",
+    SUMMARY_DIMS,
+    "dailyVolume",
+    "volume",
+    "perps protocol",
+    name="protocol_perps_volume",
+)
+OPTIONS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/options",
+    None,
+    OVERVIEW_DIMS,
+    "dailyNotionalVolume",
+    "volume",
+    name="options_volume",
+)
+CHAIN_OPTIONS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/overview/options",
+    "chain",
+    OVERVIEW_DIMS,
+    "dailyNotionalVolume",
+    "volume",
+    "chain",
+    name="chain_options_volume",
+)
+PROTOCOL_OPTIONS_VOLUME = SeriesEndpoint(
+    "VOLUMES",
+    "/summary/options",
+    "protocol",
+    SUMMARY_DIMS,
+    "dailyNotionalVolume",
+    "volume",
+    "options protocol",
+    name="protocol_options_volume",
+)
+FEES_REVENUE = SeriesEndpoint(
+    "FEES", "/overview/fees", None, OVERVIEW_DIMS, "dailyFees", name="fees_revenue"
+)
+CHAIN_FEES_REVENUE = SeriesEndpoint(
+    "FEES",
+    "/overview/fees",
+    "chain",
+    OVERVIEW_DIMS,
+    "dailyFees",
+    label="chain",
+    name="chain_fees_revenue",
+)
+PROTOCOL_FEES_REVENUE = SeriesEndpoint(
+    "FEES",
+    "/summary/fees",
+    "protocol",
+    SUMMARY_DIMS,
+    "dailyFees",
+    label="protocol",
+    name="protocol_fees_revenue",
+)
+
+# Datasets of Llama.query()
+QUERY_DATASETS = {
+    "dex_volume": SeriesFamily(DEX_VOLUME, CHAIN_DEX_VOLUME, PROTOCOL_DEX_VOLUME),
+    "perps_volume": SeriesFamily(
+        PERPS_VOLUME, CHAIN_PERPS_VOLUME, PROTOCOL_PERPS_VOLUME
+    ),
+    "options_volume": SeriesFamily(
+        OPTIONS_VOLUME, CHAIN_OPTIONS_VOLUME, PROTOCOL_OPTIONS_VOLUME
+    ),
+    "fees": SeriesFamily(FEES_REVENUE, CHAIN_FEES_REVENUE, PROTOCOL_FEES_REVENUE),
+}
+
+
+class RawResponse(NamedTuple):
+    """An undecoded API response.
+
+    - url: Final URL of the request, including the query string.
+    - status_code: HTTP status code.
+    - headers: Response headers.
+    - content: Undecoded response body.
+    - elapsed: Seconds between sending the request and receiving the headers.
+    """
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    elapsed: float
+
+
+class MetricEndpoint(NamedTuple):
+    """Where a per-protocol daily metric comes from.
+
+    - api_tag: Base URL tag passed to `Llama._get`.
+    - path: Endpoint path, the protocol slug is appended as "/{protocol}".
+    - params: Fixed API parameters for the request.
+    - field: Key of the points array in the response.
+    - value_field: Key of the value inside each point for dict points, or None for
+    [timestamp, value] pairs.
+    """
+
+    api_tag: str
+    path: str
+    params: Optional[Dict]
+    field: str
+    value_field: Optional[str] = None
+
+
+CHART_ONLY = {"excludeTotalDataChartBreakdown": True}
+
+PROTOCOL_METRICS = {
+    "tvl": MetricEndpoint("TVL", "/protocol", None, "tvl", "totalLiquidityUSD"),
+    "dex_volume": MetricEndpoint(
+        "VOLUMES", "/summary/dexs", CHART_ONLY, "totalDataChart"
+    ),
+    "perps_volume": MetricEndpoint(
+        "VOLUMES", "/summary/derivatives", CHART_ONLY, "totalDataChart"
+    ),
+    "options_volume": MetricEndpoint(
+        "VOLUMES", "/summary/options", CHART_ONLY, "totalDataChart"
+    ),
+    "fees": MetricEndpoint(
+        "FEES",
+        "/summary/fees",
+        {**CHART_ONLY, "dataType": "dailyFees"},
+        "totalDataChart",
+    ),
+    "revenue": MetricEndpoint(
+        "FEES",
+        "/summary/fees",
+        {**CHART_ONLY, "dataType": "dailyRevenue"},
+        "totalDataChart",
+    ),
+}
+
+# Current-state snapshots that can be polled for changes: method and key columns
+SNAPSHOT_SOURCES = {
+    "protocols_tvl": ("get_all_protocols_current_tvl", ["chain", "protocol"]),
+    "chains_tvl": ("get_all_chains_current_tvl", ["chain"]),
+    "bridges": ("get_all_bridge_volume", ["id"]),
+}
+
 
 class Llama:
     # --- Initialization and Helpers --- #
 
-    def __init__(self):
-        """Initialize the Llama object with a new session for making HTTP requests."""
-        self.session = requests.Session()
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate_limit: Optional[float] = None,
+        transform_processes: Optional[int] = None,
+        json_decoder: Union[str, Decoder] = "auto",
+        cassette: Optional[Cassette] = None,
+        archive: Optional[ResponseArchive] = None,
+        validate: bool = False,
+        chain_aliases: bool = False,
+        bulk_threshold: Optional[int] = 20,
+        bulk_max_age: float = 300,
+        adaptive_concurrency: bool = False,
+        circuit_breaker: bool = False,
+        hedging: bool = False,
+        store: Optional[LocalStore] = None,
+        backend: Union[str, Backend] = "pandas",
+        compact: bool = False,
+        compact_atol: Optional[float] = None,
+    ):
+        """Initialize the Llama object with a new session for making HTTP requests.
 
-    def _get(self, api_tag: str, endpoint: str, params: Dict = None):
-        """Internal helper to make GET requests."""
+        Parameters:
+        - max_workers (int, optional): Maximum number of requests in flight for
+        methods that fetch several endpoints concurrently. Defaults to 8.
+        - rate_limit (float, optional): Maximum number of requests per minute across
+        all threads using this client (DefiLlama allows 500). Defaults to no limit.
+        - transform_processes (int, optional): Number of worker processes used to
+        decode and flatten per-chain/per-protocol volume and fees responses when
+        several entities are requested with raw=False. Columns are handed back
+        through shared memory. The worker processes run until `close()`, or the end
+        of a `with Llama(...)` block. Defaults to transforming in this process.
+        - json_decoder (str or Callable, optional): JSON parser for response bodies:
+        "orjson", "json" (standard library), "auto" (orjson when installed, else the
+        standard library) or a function taking bytes. Defaults to "auto".
+        - cassette (Cassette, optional): Records every API exchange to, or replays
+        them from, an archive instead of the network. Defaults to no cassette.
+        - archive (ResponseArchive, optional): Keeps a compressed copy of every
+        successful response body fetched from the API. Defaults to no archive.
+        - validate (bool, optional): If True, chain, protocol and bridge inputs are
+        checked against cached copies of the mapping endpoints before any request is
+        made, and unknown ones are rejected with suggestions. Defaults to False.
+        - chain_aliases (bool, optional): If True, chain names in transformed
+        DataFrames are reconciled with the names listed by /v2/chains (fetched once),
+        so spellings that differ across endpoints end up identical. Defaults to False.
+        - bulk_threshold (int, optional): Number of entities from which methods that
+        have a bulk equivalent (e.g. /protocols for /tvl/{protocol}) make the single
+        bulk request and select the entities locally. None always requests per
+        entity. Defaults to 20.
+        - bulk_max_age (float, optional): Seconds a bulk response is reused by later
+        calls. Defaults to 300.
+        - adaptive_concurrency (bool, optional): If True, the number of requests in
+        flight to each API host starts at max_workers and is adjusted from observed
+        latency and 429/5xx responses (AIMD), up to 64. Current limits are returned
+        by `concurrency_limits()`. Defaults to False.
+        - circuit_breaker (bool, optional): If True, an API host stops receiving
+        requests for 30s once at least half of its recent requests failed (timeouts,
+        connection errors, 5xx), then gets probed with a single request. Requests to
+        a host whose circuit is open are answered from the last successful response
+        to the same request (bodies are kept in memory up to 64 MiB in total, then
+        looked up in the archive) if there is one, and fail immediately
+        with a ConnectionError otherwise. States are returned by `circuit_states()`.
+        Defaults to False.
+        - hedging (bool, optional): If True, a request that hasn't answered within
+        the p95 latency of its endpoint is sent a second time and the first response
+        is used. Hedges are capped at 10% of requests. Counts and latency
+        percentiles are returned by `hedging_stats()`. Defaults to False.
+        - store (LocalStore, optional): Local SQLite store into which DataFrames
+        returned by the historical TVL, volume, fees and bridge volume methods are
+        upserted, to be queried later with `store.query()`. Defaults to no store.
+        - backend (str or Backend, optional): Library of the frames returned with
+        raw=False: "pandas", "arrow" (pyarrow Tables, requires pyarrow) or "polars"
+        (requires polars). The volume and fees methods build Arrow/Polars columns
+        straight from the parsed responses. Defaults to "pandas".
+        - compact (bool, optional): If True, frames returned with raw=False use
+        compact dtypes: datetime64[s] dates, categoricals for repeated strings,
+        float32 for float columns and nullable integers for transaction counts. See
+        `compact_frame`. float32 keeps about 7 significant digits, e.g. a TVL of
+        1e10 USD is rounded by up to 512 USD. Defaults to False.
+        - compact_atol (float, optional): With compact=True, float columns that
+        float32 would change by more than this absolute amount stay float64.
+        Defaults to None (every float column is narrowed).
+        """
+        self.session = requests.Session()
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.json_decode = get_decoder(json_decoder)
+        self.cassette = cassette
+        self.archive = archive
+        self.validator = (
+            Validator(
+                {
+                    CHAIN: self._chain_names,
+                    PROTOCOL: self._protocol_names,
+                    BRIDGE: self._bridge_ids,
+                    POOL: self._pool_ids,
+                }
+            )
+            if validate
+            else None
+        )
+        self.transform_pool = (
+            TransformPool(transform_processes) if transform_processes else None
+        )
+        self._snapshots: Dict[str, SnapshotDiffer] = {}
+        self._chain_aliases: Optional[Dict[str, str]] = None if chain_aliases else {}
+        self.bulk_threshold = bulk_threshold
+        self.bulk_max_age = bulk_max_age
+        self._bulk_cache: Dict[Tuple, Tuple[float, object]] = {}
+        self.concurrency = (
+            ConcurrencyController(initial=self.max_workers)
+            if adaptive_concurrency
+            else None
+        )
+        self.breakers = BreakerRegistry() if circuit_breaker else None
+        self._last_good = LastGoodCache() if circuit_breaker else None
+        self.hedger = Hedger() if hedging else None
+        self.store = store
+        self.backend = get_backend(backend)
+        self.compact = compact
+        self.compact_atol = compact_atol
+        connections = self.max_workers
+        if self.concurrency is not None:
+            connections = max(connections, self.concurrency.max_limit)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, connections))
+        self.session.mount("https://", adapter)
+
+    def _request(
+        self, api_tag: str, endpoint: str, params: Dict = None
+    ) -> requests.Response:
+        """Internal helper to make GET requests, returning the undecoded response."""
         BASE_URLS = {
             "TVL": TVL_URL,
             "COINS": COINS_URL,
@@ -58,35 +453,636 @@ class Llama:
             raise ValueError(f"'{api_tag}' is not a valid API tag.")
 
         url = base_url + endpoint
+        cassette = self.cassette
+        replay = cassette is not None and not cassette.recording
+
+        if self.rate_limiter is not None and not replay:
+            self.rate_limiter.acquire()
 
         try:
-            response = self.session.request("GET", url, timeout=30, params=params)
-            print(f"Calling API endpoint: {response.url}")
+            if replay:
+                response = cassette.play(api_tag, endpoint, params)
+            else:
+                response = self._send(base_url, url, params)
+                print(f"Calling API endpoint: {response.url}")
+                if cassette is not None:
+                    cassette.record(api_tag, endpoint, params, response)
             response.raise_for_status()
+        except CircuitOpenError:
+            cached = self._cached_response(api_tag, endpoint, params)
+            if cached is None:
+                raise CircuitOpenError(
+                    f"Circuit for '{base_url}' is open, not requesting '{url}'."
+                )
+            warnings.warn(
+                f"Circuit for '{base_url}' is open, serving the last successful "
+                f"response to '{cached.url}'.",
+                RuntimeWarning,
+            )
+            return cached
         except requests.Timeout:
-            raise TimeoutError(f"Request to '{response.url}' timed out.")
+            raise TimeoutError(f"Request to '{url}' timed out.")
         except requests.RequestException as e:
             raise ConnectionError(
-                f"An error occurred while trying "
-                f"to connect to '{response.url}'. {str(e)}"
+                f"An error occurred while trying to connect to '{url}'. {str(e)}"
             )
 
+        if self.archive is not None and not replay:
+            self.archive.add(api_tag, endpoint, params, response.content)
+        if self._last_good is not None and not replay:
+            self._last_good.put(request_key(api_tag, endpoint, params), response)
+
+        return response
+
+    def _cached_response(
+        self, api_tag: str, endpoint: str, params: Optional[Dict]
+    ) -> Optional[requests.Response]:
+        """Internal helper returning the last successful response to a request, from
+        memory or from the archive."""
+        response = self._last_good.get(request_key(api_tag, endpoint, params))
+        if response is not None or self.archive is None:
+            return response
+
+        content = self.archive.latest(endpoint, params, api_tag=api_tag)
+        if content is None:
+            return None
+        response = requests.Response()
+        response._content = content
+        response.status_code = 200
+        response.url = endpoint
+        return response
+
+    def _send(
+        self, base_url: str, url: str, params: Optional[Dict]
+    ) -> requests.Response:
+        """Internal helper sending a single request, through the host's circuit
+        breaker, hedged and within its adaptive concurrency limit when enabled."""
+        breaker = None
+        if self.breakers is not None:
+            breaker = self.breakers.breaker(base_url)
+            breaker.before()
+
+        family = latency_key(url[len(base_url) :])
+
+        def attempt():
+            if self.concurrency is None:
+                return self.session.request("GET", url, timeout=30, params=params)
+            with self.concurrency.limiter(base_url).slot(family) as slot:
+                response = self.session.request("GET", url, timeout=30, params=params)
+                slot.status = response.status_code
+            return response
+
         try:
-            return response.json()
+            if self.hedger is None:
+                response = attempt()
+            else:
+                response = self.hedger.run(base_url + family, attempt)
+        except Exception:
+            if breaker is not None:
+                breaker.record(False)
+            raise
+
+        if breaker is not None:
+            breaker.record(response.status_code < 500)
+        return response
+
+    def close(self):
+        """Shut down the worker processes and threads started by this client and
+        close its HTTP session. Cassettes, archives and stores passed in are left
+        open."""
+        if self.transform_pool is not None:
+            self.transform_pool.shutdown()
+        if self.hedger is not None:
+            self.hedger.shutdown()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def concurrency_limits(self) -> Dict[str, float]:
+        """Current in-flight request limit per API host when adaptive_concurrency is
+        enabled (empty otherwise)."""
+        if self.concurrency is None:
+            return {}
+        return self.concurrency.limits()
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Circuit state ("closed", "open" or "half_open") per API host when
+        circuit_breaker is enabled (empty otherwise)."""
+        if self.breakers is None:
+            return {}
+        return self.breakers.states()
+
+    def hedging_stats(self) -> Dict:
+        """Request and hedge counts plus latency percentiles per endpoint family when
+        hedging is enabled (empty otherwise)."""
+        if self.hedger is None:
+            return {}
+        return self.hedger.stats()
+
+    def _get(self, api_tag: str, endpoint: str, params: Dict = None):
+        """Internal helper to make GET requests."""
+        response = self._request(api_tag, endpoint, params=params)
+
+        try:
+            return self.json_decode(response.content)
         except ValueError:
             raise ValueError(f"Invalid JSON response received from '{response.url}'.")
 
+    def _fetch_many(
+        self,
+        calls: Dict[Hashable, Tuple[str, str, Optional[Dict]]],
+        fetch_one: Optional[Callable] = None,
+    ) -> Tuple[Dict[Hashable, object], Dict[Hashable, Exception]]:
+        """Internal helper to run several `_get` calls concurrently.
+
+        `calls` maps a key to the (api_tag, endpoint, params) arguments of `_get`.
+        `fetch_one` replaces `_get` when given (e.g. to fetch undecoded bodies).
+        Returns a (results, errors) pair of dicts keyed like `calls`; results keep
+        the input order.
+        """
+        results, errors = {}, {}
+        fetch_one = fetch_one or self._get
+
+        def fetch(key):
+            try:
+                results[key] = fetch_one(*calls[key])
+            except (ConnectionError, TimeoutError, ValueError) as e:
+                errors[key] = e
+
+        # With adaptive concurrency the per-host limits gate requests, so the pool
+        # only needs to be large enough for the highest limit
+        workers = self.max_workers
+        if self.concurrency is not None:
+            workers = max(workers, self.concurrency.max_limit)
+
+        if workers == 1 or len(calls) <= 1:
+            for key in calls:
+                fetch(key)
+        else:
+            with ThreadPoolExecutor(min(workers, len(calls))) as pool:
+                list(pool.map(fetch, calls))
+
+        return {key: results[key] for key in calls if key in results}, errors
+
+    def _fetch_all(
+        self,
+        calls: Dict[Hashable, Tuple[str, str, Optional[Dict]]],
+        fetch_one: Optional[Callable] = None,
+    ) -> Dict[Hashable, object]:
+        """Like `_fetch_many`, but raises the first failure in input order."""
+        results, errors = self._fetch_many(calls, fetch_one)
+        for key in calls:
+            if key in errors:
+                raise errors[key]
+        return results
+
+    def _get_bulk(self, api_tag: str, endpoint: str, params: Dict = None):
+        """Internal helper like `_get`, for bulk endpoints whose response is reused
+        for `bulk_max_age` seconds."""
+        key = (api_tag, endpoint, tuple(sorted((params or {}).items())))
+        cached = self._bulk_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] <= self.bulk_max_age:
+            return cached[1]
+        response = self._get(api_tag, endpoint, params=params)
+        self._bulk_cache[key] = (time.monotonic(), response)
+        return response
+
+    def _use_bulk(self, count: int) -> bool:
+        return self.bulk_threshold is not None and count >= self.bulk_threshold
+
+    def _chain_names(self) -> List[str]:
+        return [chain["name"] for chain in self._get("TVL", "/v2/chains")]
+
+    def _protocol_names(self) -> KnownNames:
+        """Slugs and parent protocol slugs (e.g. "uniswap" for the volume
+        endpoints), with display names as hints for the suggestions."""
+        names, hints = [], {}
+        for protocol in self._get_bulk("TVL", "/protocols"):
+            slug = protocol.get("slug")
+            names.append(slug)
+            if protocol.get("name") and slug:
+                hints[protocol["name"]] = slug
+            parent = protocol.get("parentProtocol")
+            if parent:
+                names.append(parent.split("#")[-1])
+        return KnownNames(names, hints)
+
+    def _bridge_ids(self) -> List[str]:
+        bridges = self._get("BRIDGES", "/bridges")["bridges"]
+        return [str(bridge["id"]) for bridge in bridges]
+
+    def _pool_ids(self) -> List[str]:
+        return [pool["pool"] for pool in self._get("YIELDS", "/pools")["data"]]
+
+    def _validate(
+        self, kind: str, values: Sequence, errors: str = "raise"
+    ) -> Dict[Hashable, EntityError]:
+        """Internal helper to check inputs before any request is made.
+
+        Does nothing unless the client was created with validate=True. Raises a
+        ValueError naming every unknown input with errors="raise"; otherwise returns
+        an EntityError per unknown input so that it can be skipped.
+        """
+        if self.validator is None:
+            return {}
+        unknown = self.validator.unknown(kind, values)
+        if unknown and errors == "raise":
+            raise ValueError(" ".join(unknown.values()))
+        return {
+            value: EntityError(INVALID_INPUT, message)
+            for value, message in unknown.items()
+        }
+
+    def _chain_alias_table(self) -> Dict[str, str]:
+        """Internal helper returning the cached chain alias table.
+
+        Built from /v2/chains on first use (reusing the validation mapping when it
+        is loaded). If it can't be fetched, names are only normalized and the fetch
+        is retried on the next call.
+        """
+        if self._chain_aliases is None:
+            try:
+                if self.validator is not None:
+                    names = self.validator.index(CHAIN).names.values()
+                else:
+                    names = self._chain_names()
+            except (ConnectionError, TimeoutError, ValueError):
+                return {}
+            self._chain_aliases = chain_alias_table(names)
+        return self._chain_aliases
+
     def _clean_chain_name(self, df: pd.DataFrame) -> pd.DataFrame:
         """Takes a DataFrame, and for the "chain" column:
 
         - Converts the names to lowercase
         - Replaces spaces, hyphens, and dashes with underscores
+        - Maps spelling variants to the name used by /v2/chains
+
+        Only the distinct names are processed, see `normalize_chain_column`.
         """
         if "chain" in df.columns:
-            df["chain"] = df["chain"].str.lower().str.replace(r"[-\s]", "_", regex=True)
+            df["chain"] = normalize_chain_column(df["chain"], self._chain_alias_table())
 
         return df
 
+    def _output(self, data):
+        """Internal helper converting a transformed result to the compact schema
+        and the output backend. DataFrames inside result tuples (e.g. SeriesPair,
+        BatchResult) are converted too."""
+        if isinstance(data, pd.DataFrame):
+            if self.compact:
+                data = compact_frame(data, atol=self.compact_atol)
+            return self.backend.from_pandas(data)
+        if isinstance(data, tuple) and hasattr(data, "_fields"):
+            return type(data)(*(self._output(value) for value in data))
+        return data
+
+    def _from_columns(self, columns: Dict[str, Union[np.ndarray, pd.Categorical]]):
+        """Internal helper building an output frame from assembled columns, which
+        are already date, categorical and float64 columns; with compact=True only
+        the floats are narrowed."""
+        if self.compact:
+            columns = {
+                name: compact_floats(values, self.compact_atol)
+                if name != "date"
+                else values
+                for name, values in columns.items()
+            }
+        return self.backend.from_columns(columns)
+
+    def _build(
+        self,
+        endpoint: SeriesEndpoint,
+        responses: Dict[Optional[str], Dict],
+        params: Optional[Dict],
+        both: bool,
+    ):
+        """Internal helper assembling volume/fees responses in the output backend.
+
+        Other backends get their frame straight from the assembled columns, unless
+        a pandas frame is needed anyway for the store or the reconciliation of
+        both=True."""
+        if both:
+            data = assemble_both(
+                endpoint, responses, params, aliases=self._chain_alias_table()
+            )
+        elif self.backend.name != "pandas" and self.store is None:
+            columns = assemble_columns(
+                endpoint, responses, params, aliases=self._chain_alias_table()
+            )
+            return self._from_columns(columns)
+        else:
+            data = assemble(
+                endpoint, responses, params, aliases=self._chain_alias_table()
+            )
+        self._save_series(endpoint, params, data)
+        return self._output(data)
+
+    def _save(self, table: str, df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """Internal helper upserting a transformed result into the local store."""
+        if self.store is not None and len(df):
+            self.store.upsert(table, df, keys)
+        return df
+
+    def _save_series(
+        self,
+        endpoint: SeriesEndpoint,
+        params: Optional[Dict],
+        data: Union[pd.DataFrame, SeriesPair],
+    ):
+        """Internal helper storing assembled volume/fees frames, keyed by their
+        categorical dimensions and date."""
+        if self.store is None:
+            return
+        if isinstance(data, SeriesPair):
+            frames = [(data.total, CHART), (data.breakdown, BREAKDOWN)]
+        else:
+            frames = [(data, series_mode(params))]
+        for df, mode in frames:
+            keys = [
+                column
+                for column in df.columns
+                if isinstance(df[column].dtype, pd.CategoricalDtype)
+            ]
+            self._save(dataset_name(endpoint, params, mode), df, keys + ["date"])
+
+    def _get_series(
+        self,
+        endpoint: SeriesEndpoint,
+        entities: Optional[Union[str, List[str]]] = None,
+        params: Optional[Dict] = None,
+        raw: bool = True,
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
+        """Internal helper shared by the volume and fees methods.
+
+        Fetches `endpoint` once, or once per entity (concurrently) for chain/protocol
+        endpoints, and either returns the raw response(s) or assembles them into a
+        long-format DataFrame with columns: date (datetime64), the entity column
+        ("chain" or "protocol", categorical), the breakdown columns when only the
+        breakdown is requested (categorical), and the value column (float64).
+
+        With both=True (and raw=False) the chart and the breakdown are requested in
+        the same call and returned together as a SeriesPair.
+
+        With errors="collect", entities that fail or have no data don't abort the
+        batch; a BatchResult of the successful data and a per-entity error map is
+        returned instead.
+        """
+        check_error_mode(errors)
+
+        if both and not raw:
+            params = both_params(params)
+
+        if endpoint.entity_dim is None:
+            response = self._get(endpoint.api_tag, endpoint.path, params=params)
+            if raw:
+                return response
+            return self._build(endpoint, {None: response}, params, both)
+
+        if isinstance(entities, str):
+            entities = [entities]
+
+        invalid = self._validate(endpoint.entity_dim, entities, errors)
+        entities = [entity for entity in entities if entity not in invalid]
+
+        if (
+            self.transform_pool is not None
+            and not raw
+            and not both
+            and len(entities) > 1
+        ):
+            return self._get_series_parallel(
+                endpoint, entities, params, errors, invalid
+            )
+
+        responses, failures = self._fetch_many(
+            {
+                entity: (endpoint.api_tag, f"{endpoint.path}/{entity}", params)
+                for entity in entities
+            }
+        )
+
+        results = {}
+        batch_errors = dict(invalid)
+        for entity in entities:
+            if entity in failures:
+                if errors == "raise":
+                    raise failures[entity]
+                batch_errors[entity] = entity_error(failures[entity])
+            elif not has_data(responses[entity]):
+                message = (
+                    f"No data available for {endpoint.label}: {entity} "
+                    f"with dataType: {data_type(endpoint, params)}"
+                )
+                if errors == "raise":
+                    raise ValueError(message)
+                batch_errors[entity] = EntityError(NO_DATA, message)
+            else:
+                results[entity] = responses[entity]
+
+        data = results if raw else self._build(endpoint, results, params, both)
+        if errors == "collect":
+            return BatchResult(data, batch_errors)
+        return data
+
+    def _get_series_parallel(
+        self,
+        endpoint: SeriesEndpoint,
+        entities: List[str],
+        params: Optional[Dict],
+        errors: str,
+        invalid: Dict[Hashable, EntityError],
+    ) -> Union[pd.DataFrame, BatchResult]:
+        """Variant of `_get_series` that transforms in the process pool.
+
+        Each entity's body is submitted to a worker as soon as it has been
+        downloaded, so decoding and flattening overlap with the remaining requests.
+        """
+        pool = self.transform_pool
+        aliases = self._chain_alias_table()
+        paths = {f"{endpoint.path}/{entity}": entity for entity in entities}
+        futures = {}
+
+        def fetch_and_submit(api_tag, path, call_params):
+            body = self._request(api_tag, path, params=call_params).content
+            entity = paths[path]
+            futures[entity] = pool.submit(
+                endpoint, entity, body, params, self.json_decode, aliases
+            )
+
+        parts = {}
+        batch_errors = dict(invalid)
+        try:
+            _, failures = self._fetch_many(
+                {
+                    entity: (endpoint.api_tag, path, params)
+                    for path, entity in paths.items()
+                },
+                fetch_one=fetch_and_submit,
+            )
+
+            for entity in entities:
+                if entity in failures:
+                    batch_errors[entity] = entity_error(failures[entity])
+                    continue
+                try:
+                    found, blocks = futures[entity].result()
+                except ValueError:
+                    error = ValueError(f"Invalid JSON response received for {entity}.")
+                    batch_errors[entity] = entity_error(error)
+                    continue
+                if found:
+                    parts[entity] = blocks
+                else:
+                    message = (
+                        f"No data available for {endpoint.label}: {entity} "
+                        f"with dataType: {data_type(endpoint, params)}"
+                    )
+                    batch_errors[entity] = EntityError(NO_DATA, message)
+
+            if errors == "raise" and batch_errors:
+                first = batch_errors[next(e for e in entities if e in batch_errors)]
+                raise first.exception or ValueError(first.message)
+
+            if parts:
+                data = import_frames(list(parts.values()))
+            else:
+                data = assemble(endpoint, {}, params)
+        except BaseException:
+            # Unlink every block that won't be read, including those of jobs
+            # still running
+            for future in futures.values():
+                discard(future)
+            raise
+        self._save_series(endpoint, params, data)
+        data = self._output(data)
+        if errors == "collect":
+            return BatchResult(data, batch_errors)
+        return data
+
+    # --- Queries --- #
+
+    def query(self, dataset: str) -> Query:
+        """Start a lazy query over a volume or fees dataset.
+
+        Filters and columns are added with chained calls, and only `collect()`
+        sends requests, after choosing the endpoint and response parts the filters
+        need. See `Query`.
+
+        Parameters:
+        - dataset (str, required): One of "dex_volume", "perps_volume",
+        "options_volume" or "fees".
+
+        Returns:
+        - Query: An empty query over the dataset.
+
+        Example:
+            llama.query("dex_volume").chains(["ethereum"]).since("2024-01-01")
+                .collect()
+        """
+        if dataset not in QUERY_DATASETS:
+            raise ValueError(
+                f"Unknown dataset '{dataset}'. "
+                f"Available datasets: {', '.join(QUERY_DATASETS)}"
+            )
+        return Query(self, QUERY_DATASETS[dataset])
+
+    def iter_batches(
+        self,
+        method: str,
+        entities: Optional[Union[str, int, List]] = None,
+        batch_size: Optional[int] = None,
+        prefetch_depth: int = 2,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """Iterate over the transformed result of a method entity by entity, instead
+        of building one DataFrame for all of them.
+
+        Each entity is fetched and transformed with `raw=False` in a background
+        thread while the previous batches are consumed; at most `prefetch_depth`
+        results are held ahead, so memory stays bounded however many entities are
+        requested.
+
+        Parameters:
+        - method (str, required): Name of a method taking `raw`, e.g.
+        "get_chain_dex_volume" or "get_protocol_historical_tvl".
+        - entities (str, int or List, optional): Chains, protocols or bridge IDs, as
+        passed to the method one at a time. Defaults to a single call without an
+        entity, for methods that take none (e.g. "get_dex_volume").
+        - batch_size (int, optional): Split each entity's frame into chunks of at
+        most this many rows. Defaults to one frame per entity.
+        - prefetch_depth (int, optional): Entities fetched ahead. Defaults to 2.
+        - **kwargs: Other arguments of the method, e.g. params.
+
+        Returns:
+        - Iterator of frames, in the output backend.
+
+        Example:
+            for df in llama.iter_batches("get_protocol_dex_volume", protocols,
+                                         params={"excludeTotalDataChart": True}):
+                process(df)
+        """
+        func = getattr(self, method, None)
+        if not callable(func) or "raw" not in inspect.signature(func).parameters:
+            raise ValueError(f"'{method}' is not a method with a raw=False variant.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        if entities is None:
+            calls = [()]
+        elif isinstance(entities, (str, int)):
+            calls = [(entities,)]
+        else:
+            calls = [(entity,) for entity in entities]
+
+        def run(args):
+            result = func(*args, raw=False, **kwargs)
+            if isinstance(result, BatchResult):
+                result = result.data
+            if isinstance(result, (dict, list, tuple)):
+                raise ValueError(f"'{method}' does not return a single frame.")
+            return result
+
+        for df in prefetch(run, calls, prefetch_depth):
+            if batch_size is None:
+                yield df
+            else:
+                yield from row_chunks(df, batch_size)
+
+    # --- Raw Access --- #
+
+    def get_raw(
+        self, api_tag: str, endpoint: str, params: Optional[Dict] = None
+    ) -> RawResponse:
+        """Fetch an endpoint without decoding the response body.
+
+        Useful to archive responses as-is, or to parse them later with a decoder of
+        your choice.
+
+        Parameters:
+        - api_tag (str, required): API the endpoint belongs to: "TVL", "COINS",
+        "STABLECOINS", "YIELDS", "ABI", "BRIDGES", "VOLUMES" or "FEES".
+        - endpoint (str, required): Endpoint path, e.g. "/protocols".
+        - params (Dict, optional): Query parameters.
+
+        Returns:
+        - RawResponse with the URL, status code, headers and undecoded body.
+        """
+        response = self._request(api_tag, endpoint, params=params)
+        return RawResponse(
+            response.url,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            response.elapsed.total_seconds(),
+        )
+
     # --- Mappings --- #
     """Helper functions to get full lists of all chains, protocols, stablecoins, and 
     pools tracked by DefiLlama.
@@ -100,23 +1096,35 @@ class Llama:
     # should helper functions include all static info rather than only bare minimum??
     #   leaning towards yes.
 
-    def get_chains(self):
-        """Retrieve a list of all chains with their chain ID and name."""
+    def get_chains(self, typed: bool = False) -> Union[List[Dict], List[Chain]]:
+        """Retrieve a list of all chains with their chain ID and name.
+
+        If typed is True, returns compact `Chain` records instead of dicts.
+        """
         results = []
 
         response = self._get("TVL", endpoint="/v2/chains")
 
+        if typed:
+            return Chain.from_api_list(response)
+
         for asset in response:
             results.append({"chain_id": asset["chainId"], "name": asset["name"]})
 
         return results
 
-    def get_protocols(self):
-        """Retrieve a list of all protocols with their ID, name, and slug."""
+    def get_protocols(self, typed: bool = False) -> Union[List[Dict], List[Protocol]]:
+        """Retrieve a list of all protocols with their ID, name, and slug.
+
+        If typed is True, returns compact `Protocol` records instead of dicts.
+        """
         results = []
 
         response = self._get("TVL", endpoint="/protocols")
 
+        if typed:
+            return Protocol.from_api_list(response)
+
         for asset in response:
             results.append(
                 {"id": asset["id"], "name": asset["name"], "slug": asset["slug"]}
@@ -124,12 +1132,20 @@ class Llama:
 
         return results
 
-    def get_stablecoins(self):
-        """Retrieve a list of all stablecoins with their id, name, and symbol."""
+    def get_stablecoins(
+        self, typed: bool = False
+    ) -> Union[List[Dict], List[Stablecoin]]:
+        """Retrieve a list of all stablecoins with their id, name, and symbol.
+
+        If typed is True, returns compact `Stablecoin` records instead of dicts.
+        """
         results = []
 
         response = self._get("STABLECOINS", endpoint="/stablecoins")
 
+        if typed:
+            return Stablecoin.from_api_list(response["peggedAssets"])
+
         for asset in response["peggedAssets"]:
             results.append(
                 {"id": asset["id"], "name": asset["name"], "symbol": asset["symbol"]}
@@ -137,13 +1153,19 @@ class Llama:
 
         return results
 
-    def get_pools(self):
+    def get_pools(self, typed: bool = False) -> Union[List[Dict], List[Pool]]:
         """Retrieve a list of all pools with their chain, project, symbol, and pool
-        id."""
+        id.
+
+        If typed is True, returns compact `Pool` records instead of dicts.
+        """
         results = []
 
         response = self._get("YIELDS", endpoint="/pools")
 
+        if typed:
+            return Pool.from_api_list(response["data"])
+
         for asset in response["data"]:
             results.append(
                 {
@@ -187,11 +1209,11 @@ class Llama:
                     results.append({"chain": chain, "protocol": protocol, "tvl": tvl})
 
             df = pd.DataFrame(results)
-            return self._clean_chain_name(df)
+            return self._output(self._clean_chain_name(df))
 
     def get_protocol_historical_tvl(
-        self, protocols: List[str], raw: bool = True
-    ) -> Union[Dict[str, Dict], pd.DataFrame]:
+        self, protocols: List[str], raw: bool = True, include_tokens: bool = False
+    ) -> Union[Dict[str, Dict], pd.DataFrame, TvlHistory]:
         """Get historical TVL of protocol(s) and breakdowns by token and chain.
 
         Endpoint: /protocol/{protocol}
@@ -201,6 +1223,9 @@ class Llama:
             these from get_protocols().
             - raw (bool, optional): If True, returns raw data. If False, returns a
             transformed DataFrame. Defaults to True.
+            - include_tokens (bool, optional): Only used when raw=False. If True,
+            also expands the tokens/tokensInUsd breakdown into a long table and
+            returns a TvlHistory(tvl, tokens). Defaults to False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
@@ -208,37 +1233,73 @@ class Llama:
         if isinstance(protocols, str):
             protocols = [protocols]
 
+        self._validate(PROTOCOL, protocols)
+
         if raw:
             if len(protocols) == 1:
                 return self._get("TVL", endpoint=f"/protocol/{protocols[0]}")
 
-            results = {}
-            for protocol in protocols:
-                results[protocol] = self._get("TVL", endpoint=f"/protocol/{protocol}")
-            return results
+            return self._fetch_all(
+                {
+                    protocol: ("TVL", f"/protocol/{protocol}", None)
+                    for protocol in protocols
+                }
+            )
 
         else:
-            results = []
+            responses = self._fetch_all(
+                {
+                    protocol: ("TVL", f"/protocol/{protocol}", None)
+                    for protocol in protocols
+                }
+            )
 
-            for protocol in protocols:
-                data = self._get("TVL", endpoint=f"/protocol/{protocol}")
-                chain_tvls = data.get("chainTvls", {})
-
-                for chain, chain_data in chain_tvls.items():
-                    tvl_data = chain_data.get("tvl", [])
-
-                    for entry in tvl_data:
-                        results.append(
-                            {
-                                "date": entry.get("date"),
-                                "chain": chain,
-                                "protocol": protocol,
-                                "tvl": entry.get("totalLiquidityUSD"),
-                            }
-                        )
+            aliases = self._chain_alias_table()
+            df = self._save(
+                "protocol_tvl",
+                extract_tvl(responses, aliases),
+                ["protocol", "chain", "date"],
+            )
+            if include_tokens:
+                tokens = extract_tokens(responses, aliases)
+                return self._output(TvlHistory(df, tokens))
+            return self._output(df)
 
-            df = pd.DataFrame(results)
-            return self._clean_chain_name(df)
+    def get_protocol_token_tvl(
+        self,
+        protocols: Union[str, List[str]],
+        usd: bool = True,
+        chains: Optional[List[str]] = None,
+    ) -> TokenBreakdown:
+        """Get the per-token TVL history of protocol(s) in a compact coded form.
+
+        Endpoint: /protocol/{protocol}
+
+        Parameters:
+        - protocols (str or List[str], required): protocol slug(s) — you can get these
+        from get_protocols().
+        - usd (bool, optional): If True, values are USD amounts from tokensInUsd. If
+        False, values are raw token amounts from tokens. Defaults to True.
+        - chains (List[str], optional): chainTvls keys to include, as returned by the
+        API (e.g. "Ethereum", "Ethereum-borrowed"). Defaults to every plain chain,
+        excluding extra categories such as borrowed, staking and pool2.
+
+        Returns:
+        - TokenBreakdown: Token dictionary plus integer codes and values. Use
+        to_long(), to_sparse() or aggregate() to convert it.
+        """
+        if isinstance(protocols, str):
+            protocols = [protocols]
+
+        self._validate(PROTOCOL, protocols)
+
+        responses = self._fetch_all(
+            {protocol: ("TVL", f"/protocol/{protocol}", None) for protocol in protocols}
+        )
+
+        include_chain = is_chain_key if chains is None else set(chains).__contains__
+        columns = extract_token_columns(responses, include_chain)
+        return TokenBreakdown(columns, usd=usd, aliases=self._chain_alias_table())
 
     def get_all_chains_historical_tvl(
         self, raw: bool = True
@@ -259,7 +1320,8 @@ class Llama:
             return self._get("TVL", endpoint="/v2/historicalChainTvl")
 
         else:
-            return pd.DataFrame(self._get("TVL", endpoint="/v2/historicalChainTvl"))
+            df = pd.DataFrame(self._get("TVL", endpoint="/v2/historicalChainTvl"))
+            return self._output(df)
 
     def get_chain_historical_tvl(self, chains: Union[str, List[str]], raw: bool = True):
         """Get historical TVL (excludes liquid staking and double counted tvl) of a
@@ -280,6 +1342,8 @@ class Llama:
         if isinstance(chains, str):
             chains = [chains]
 
+        self._validate(CHAIN, chains)
+
         if raw:
             if len(chains) == 1:
                 return self._get("TVL", endpoint=f"/v2/historicalChainTvl/{chains[0]}")
@@ -302,8 +1366,8 @@ class Llama:
                     entry["chain"] = chain
                     results.append(entry)
 
-            df = pd.DataFrame(results)
-            return self._clean_chain_name(df)
+            df = self._clean_chain_name(pd.DataFrame(results))
+            return self._output(self._save("chain_tvl", df, ["chain", "date"]))
 
     def get_protocol_current_tvl(
         self, protocols: Union[str, List[str]], raw: bool = True
@@ -330,25 +1394,39 @@ class Llama:
         if isinstance(protocols, str):
             protocols = [protocols]
 
-        if raw:
-            if len(protocols) == 1:
-                return float(self._get("TVL", endpoint=f"/tvl/{protocols[0]}"))
+        self._validate(PROTOCOL, protocols)
 
-            results = {}
+        if raw and len(protocols) == 1:
+            return float(self._get("TVL", endpoint=f"/tvl/{protocols[0]}"))
+
+        tvls = {}
+        if self._use_bulk(len(protocols)):
+            # One /protocols request instead of one /tvl/{protocol} per protocol.
+            # Slugs it doesn't list (if any) are still requested individually.
+            current = {
+                entry.get("slug"): entry.get("tvl")
+                for entry in self._get_bulk("TVL", "/protocols")
+            }
             for protocol in protocols:
-                data = self._get("TVL", endpoint=f"/tvl/{protocol}")
-                results[protocol] = float(data)
+                if current.get(protocol) is not None:
+                    tvls[protocol] = float(current[protocol])
 
-            return results
+        missing = [p for p in dict.fromkeys(protocols) if p not in tvls]
+        responses = self._fetch_all(
+            {protocol: ("TVL", f"/tvl/{protocol}", None) for protocol in missing}
+        )
+        tvls.update({protocol: float(tvl) for protocol, tvl in responses.items()})
+
+        if raw:
+            return {protocol: tvls[protocol] for protocol in protocols}
 
         else:
             results = []
             for protocol in protocols:
-                tvl = float(self._get("TVL", endpoint=f"/tvl/{protocol}"))
-                results.append({"protocol": protocol, "tvl": tvl})
+                results.append({"protocol": protocol, "tvl": tvls[protocol]})
 
             df = pd.DataFrame(results)
-            return self._clean_chain_name(df)
+            return self._output(self._clean_chain_name(df))
 
     def get_all_chains_current_tvl(
         self, raw: bool = True
@@ -374,7 +1452,78 @@ class Llama:
                 results.append({"chain": entry.get("name"), "tvl": entry.get("tvl")})
 
             df = pd.DataFrame(results)
-            return self._clean_chain_name(df)
+            return self._output(self._clean_chain_name(df))
+
+    def get_chain_tvl_matrix(
+        self,
+        path: str,
+        chains: Optional[List[str]] = None,
+        start: Union[int, str] = "2017-01-01",
+    ) -> TVLMatrix:
+        """Build or update a memory-mapped matrix of daily TVL, one row per day and
+        one column per chain.
+
+        Endpoints: /v2/historicalChainTvl/{chain}, /v2/chains
+
+        Chains not yet in the matrix are filled from their full history, fetched
+        concurrently with each response written straight into its column. Today's
+        row holds the intraday TVL from /v2/chains and is provisional: updates later
+        the same day only overwrite it with a single /v2/chains request. Once the
+        day is over, the next update fetches the history of the existing chains
+        again, which replaces that row with the daily close and fills any days
+        missed since.
+
+        Other processes can open the same file read-only with `TVLMatrix(path)` and
+        share it through the OS page cache.
+
+        Parameters:
+        - path (str, required): Data file of the matrix; created if missing.
+        - chains (List[str], optional): Chain names, as returned by get_chains().
+        Defaults to every chain.
+        - start (int or str, optional): First day of a new matrix; earlier data is
+        dropped. Defaults to "2017-01-01".
+
+        Returns:
+        - TVLMatrix: The updated matrix, opened for writing.
+        """
+        current = self._get("TVL", endpoint="/v2/chains")
+        if chains is None:
+            chains = [entry["name"] for entry in current]
+        else:
+            self._validate(CHAIN, chains)
+
+        if os.path.exists(f"{path}.json"):
+            matrix = TVLMatrix(path, writable=True)
+        else:
+            matrix = TVLMatrix.create(path, start)
+
+        today = int(time.time())
+        last = matrix.last_date()
+        # The last row was written from the intraday /v2/chains value
+        stale = last is None or matrix.row(last) < matrix.row(today)
+        backfill = [c for c in chains if c not in matrix.columns]
+        if stale:
+            backfill = list(dict.fromkeys(matrix.chains + backfill))
+        matrix.add_chains(chains)
+        matrix.extend(today)
+
+        def fill(api_tag, endpoint, params):
+            data = self._get(api_tag, endpoint, params)
+            chain = endpoint.rsplit("/", 1)[1]
+            matrix.set_series(
+                chain, [e["date"] for e in data], [e["tvl"] for e in data]
+            )
+
+        self._fetch_all(
+            {
+                chain: ("TVL", f"/v2/historicalChainTvl/{chain}", None)
+                for chain in backfill
+            },
+            fetch_one=fill,
+        )
+        matrix.set_day(today, {entry["name"]: entry.get("tvl") for entry in current})
+        matrix.flush()
+        return matrix
 
     # --- Coins --- #
 
@@ -511,7 +1660,7 @@ class Llama:
         if raw:
             return response
         else:
-            return pd.DataFrame(response["bridges"])
+            return self._output(pd.DataFrame(response["bridges"]))
 
     def get_bridge_volume(
         self, ids: List[str], raw: bool = True
@@ -533,6 +1682,8 @@ class Llama:
         if isinstance(ids, str):
             ids = [ids]
 
+        self._validate(BRIDGE, ids)
+
         results = {}
         dfs = []
 
@@ -594,7 +1745,8 @@ class Llama:
         if raw:
             return results
         else:
-            return pd.concat(dfs, ignore_index=True)
+            df = pd.concat(dfs, ignore_index=True)
+            return self._output(self._save("bridge_volume", df, ["bridge_id", "chain"]))
 
     def get_chain_bridge_volume(
         self, chains: List[str], params: Optional[Dict] = None, raw: bool = True
@@ -618,6 +1770,8 @@ class Llama:
         if isinstance(chains, str):
             chains = [chains]
 
+        self._validate(CHAIN, chains)
+
         if raw:
             if len(chains) == 1:
                 return self._get(
@@ -653,7 +1807,15 @@ class Llama:
                     "withdrawTxs",
                 ]
             ]
-            return self._clean_chain_name(df)
+            df = self._clean_chain_name(df)
+            if self.store is not None:
+                bridge = str((params or {}).get("id", "all"))
+                self._save(
+                    "chain_bridge_volume",
+                    df.assign(bridge_id=bridge),
+                    ["bridge_id", "chain", "date"],
+                )
+            return self._output(df)
 
     def get_bridge_day_stats(
         self,
@@ -681,6 +1843,8 @@ class Llama:
         if isinstance(chains, str):
             chains = [chains]
 
+        self._validate(CHAIN, chains)
+
         if raw:
             results = {}
             for chain in chains:
@@ -726,10 +1890,14 @@ class Llama:
                     results.append(details)
 
             df = pd.DataFrame(results)
-            return df
+            return self._output(df)
 
     def get_bridge_transactions(
-        self, id: int, params: Optional[Dict] = None, raw: bool = True
+        self,
+        id: int,
+        params: Optional[Dict] = None,
+        raw: bool = True,
+        typed: bool = False,
     ):
         """Get all transactions for a bridge within a date range.
 
@@ -749,6 +1917,9 @@ class Llama:
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame.
                                 Defaults to True.
+        - typed (bool, optional): Only used when raw=True. If True, transactions are
+        returned as compact `BridgeTransaction` records instead of dicts. Defaults to
+        False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
@@ -756,17 +1927,23 @@ class Llama:
         if isinstance(id, int):
             id = [id]
 
+        self._validate(BRIDGE, id)
+
         if raw:
             if len(id) == 1:
-                return self._get(
+                response = self._get(
                     "BRIDGES", endpoint=f"/transactions/{id[0]}", params=params
                 )
+                return BridgeTransaction.from_api_list(response) if typed else response
 
             results = {}
             for bridge_id in id:
-                results[bridge_id] = self._get(
+                response = self._get(
                     "BRIDGES", endpoint=f"/transactions/{bridge_id}", params=params
                 )
+                results[bridge_id] = (
+                    BridgeTransaction.from_api_list(response) if typed else response
+                )
             return results
 
         else:
@@ -795,11 +1972,13 @@ class Llama:
                     )
 
             df = pd.DataFrame(results)
-            return df
+            return self._output(df)
 
     # --- Volumes --- #
 
-    def get_dex_volume(self, params: Optional[Dict] = None, raw: bool = True):
+    def get_dex_volume(
+        self, params: Optional[Dict] = None, raw: bool = True, both: bool = False
+    ):
         """Get all dexs along wtih summaries of their volumes and dataType history data.
 
         Endpoint: /overview/dexs
@@ -814,50 +1993,22 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        response = self._get("VOLUMES", "/overview/dexs", params=params)
-
-        if raw:
-            return response
-        else:
-            exclude_chart = (
-                params.get("excludeTotalDataChart", False) if params else False
-            )
-            exclude_chart_breakdown = (
-                params.get("excludeTotalDataChartBreakdown", False) if params else False
-            )
-
-            if not exclude_chart and exclude_chart_breakdown:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
-
-            elif exclude_chart and not exclude_chart_breakdown:
-                records = []
-                for item in response["totalDataChartBreakdown"]:
-                    timestamp, protocols = item
-                    for protocol, volume in protocols.items():
-                        records.append(
-                            {"date": timestamp, "protocol": protocol, "volume": volume}
-                        )
-
-                return pd.DataFrame(records)
-
-            # Default return 'totalDataChart' if raw = False and
-            # params.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-            else:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
+        return self._get_series(DEX_VOLUME, params=params, raw=raw, both=both)
 
     def get_chain_dex_volume(
         self,
         chains: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
+        both: bool = False,
+        errors: str = "raise",
     ):
         """Get all dexs along with summaries of their volumes and dataType history data
         filtering by chain.
@@ -875,78 +2026,28 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(chains, str):
-            chains = [chains]
-
-        results = {}
-        dfs = []
-
-        for chain in chains:
-            response = self._get("VOLUMES", f"/overview/dexs/{chain}", params=params)
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for hain: {chain} "
-                    f"with dataType: {params.get('dataType', 'dailyVolume')}"
-                )
-
-            if raw:
-                results[chain] = response
-            else:
-                if not params or (
-                    not params.get("excludeTotalDataChart", False)
-                    and params.get("excludeTotalDataChartBreakdown", False)
-                ):
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-                elif params.get("excludeTotalDataChart", False) and not params.get(
-                    "excludeTotalDataChartBreakdown", False
-                ):
-                    records = []
-                    for item in response["totalDataChartBreakdown"]:
-                        timestamp, protocols = item
-                        for protocol, volume in protocols.items():
-                            records.append(
-                                {
-                                    "date": timestamp,
-                                    "chain": chain,
-                                    "protocol": protocol,
-                                    "volume": volume,
-                                }
-                            )
-                    df = pd.DataFrame(records)
-                    dfs.append(self._clean_chain_name(df))
-
-                else:
-                    # Default return 'totalDataChart' if raw = False and
-                    # prms.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-        if raw:
-            return results
-        else:
-            return pd.concat(dfs, ignore_index=True)
+        return self._get_series(
+            CHAIN_DEX_VOLUME, chains, params=params, raw=raw, both=both, errors=errors
+        )
 
     def get_protocol_dex_volume(
         self,
         protocols: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
-    ) -> Union[List[Dict], pd.DataFrame]:
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
         """Get summary of protocol dex volume with historical data.
 
         Endpoint: /summary/dexs/{protocol}
@@ -963,76 +2064,28 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(protocols, str):
-            protocols = [protocols]
-
-        results = {}
-
-        for protocol in protocols:
-            response = self._get("VOLUMES", f"/summary/dexs/{protocol}", params=params)
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for dex protocol: {protocol} "
-                    f"with dataType: {params.get('dataType', 'dailyVolume')}"
-                )
-            results[protocol] = response
-
-        if raw:
-            return results
-        else:
-            exclude_chart = params.get("excludeTotalDataChart", False)
-            exclude_chart_breakdown = params.get(
-                "excludeTotalDataChartBreakdown", False
-            )
+        return self._get_series(
+            PROTOCOL_DEX_VOLUME,
+            protocols,
+            params=params,
+            raw=raw,
+            both=both,
+            errors=errors,
+        )
 
-            all_data = []
-
-            for protocol, data in results.items():
-                # Handle case for totalDataChart
-                if not exclude_chart and exclude_chart_breakdown:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-                # Handle case for totalDataChartBreakdown
-                elif not exclude_chart_breakdown and exclude_chart:
-                    for timestamp, chains in data["totalDataChartBreakdown"]:
-                        for chain, protocols_data in chains.items():
-                            for protocol_version, volume in protocols_data.items():
-                                all_data.append(
-                                    {
-                                        "timestamp": timestamp,
-                                        "chain": chain,
-                                        "protocol": protocol,
-                                        "protocol_version": protocol_version,
-                                        "volume": volume,
-                                    }
-                                )
-                else:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-            return pd.DataFrame(all_data)
-
-    def get_perps_volume(self, params: Optional[Dict] = None, raw: bool = True):
+    def get_perps_volume(
+        self, params: Optional[Dict] = None, raw: bool = True, both: bool = False
+    ):
         """Get all perps dexs along wtih summaries of their volumes and dataType history
         data.
 
@@ -1048,50 +2101,22 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        response = self._get("VOLUMES", "/overview/derivatives", params=params)
-
-        if raw:
-            return response
-        else:
-            exclude_chart = (
-                params.get("excludeTotalDataChart", False) if params else False
-            )
-            exclude_chart_breakdown = (
-                params.get("excludeTotalDataChartBreakdown", False) if params else False
-            )
-
-            if not exclude_chart and exclude_chart_breakdown:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
-
-            elif exclude_chart and not exclude_chart_breakdown:
-                records = []
-                for item in response["totalDataChartBreakdown"]:
-                    timestamp, protocols = item
-                    for protocol, volume in protocols.items():
-                        records.append(
-                            {"date": timestamp, "protocol": protocol, "volume": volume}
-                        )
-
-                return pd.DataFrame(records)
-
-            # Default return 'totalDataChart' if raw = False and
-            # params.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-            else:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
+        return self._get_series(PERPS_VOLUME, params=params, raw=raw, both=both)
 
     def get_chain_perps_volume(
         self,
         chains: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
+        both: bool = False,
+        errors: str = "raise",
     ):
         """Get all perps dexs along with summaries of their volumes and dataType history
         data filtering by chain.
@@ -1109,80 +2134,28 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(chains, str):
-            chains = [chains]
-
-        results = {}
-        dfs = []
-
-        for chain in chains:
-            response = self._get(
-                "VOLUMES", f"/overview/derivatives/{chain}", params=params
-            )
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for chain: {chain} "
-                    f"with dataType: {params.get('dataType', 'dailyVolume')}"
-                )
-
-            if raw:
-                results[chain] = response
-            else:
-                if not params or (
-                    not params.get("excludeTotalDataChart", False)
-                    and params.get("excludeTotalDataChartBreakdown", False)
-                ):
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-                elif params.get("excludeTotalDataChart", False) and not params.get(
-                    "excludeTotalDataChartBreakdown", False
-                ):
-                    records = []
-                    for item in response["totalDataChartBreakdown"]:
-                        timestamp, protocols = item
-                        for protocol, volume in protocols.items():
-                            records.append(
-                                {
-                                    "date": timestamp,
-                                    "chain": chain,
-                                    "protocol": protocol,
-                                    "volume": volume,
-                                }
-                            )
-                    df = pd.DataFrame(records)
-                    dfs.append(self._clean_chain_name(df))
-
-                else:
-                    # Default return 'totalDataChart' if raw = False and
-                    # prms.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-        if raw:
-            return results
-        else:
-            return pd.concat(dfs, ignore_index=True)
+        return self._get_series(
+            CHAIN_PERPS_VOLUME, chains, params=params, raw=raw, both=both, errors=errors
+        )
 
     def get_protocol_perps_volume(
         self,
         protocols: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
-    ) -> Union[List[Dict], pd.DataFrame]:
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
         """Get summary of protocol perps dex volume with historical data.
 
         Endpoint: /summary/derivatives/{protocol}
@@ -1199,78 +2172,28 @@ class Llama:
             dailyVolume, totalVolume. Defaults to dailyVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(protocols, str):
-            protocols = [protocols]
-
-        results = {}
-
-        for protocol in protocols:
-            response = self._get(
-                "VOLUMES", f"/summary/derivatives/{protocol}", params=params
-            )
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for perps protocol: {protocol} "
-                    f"with dataType: {params.get('dataType', 'dailyVolume')}"
-                )
-            results[protocol] = response
-
-        if raw:
-            return results
-        else:
-            exclude_chart = params.get("excludeTotalDataChart", False)
-            exclude_chart_breakdown = params.get(
-                "excludeTotalDataChartBreakdown", False
-            )
+        return self._get_series(
+            PROTOCOL_PERPS_VOLUME,
+            protocols,
+            params=params,
+            raw=raw,
+            both=both,
+            errors=errors,
+        )
 
-            all_data = []
-
-            for protocol, data in results.items():
-                # Handle case for totalDataChart
-                if not exclude_chart and exclude_chart_breakdown:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-                # Handle case for totalDataChartBreakdown
-                elif not exclude_chart_breakdown and exclude_chart:
-                    for timestamp, chains in data["totalDataChartBreakdown"]:
-                        for chain, protocols_data in chains.items():
-                            for protocol_version, volume in protocols_data.items():
-                                all_data.append(
-                                    {
-                                        "timestamp": timestamp,
-                                        "chain": chain,
-                                        "protocol": protocol,
-                                        "protocol_version": protocol_version,
-                                        "volume": volume,
-                                    }
-                                )
-                else:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-            return pd.DataFrame(all_data)
-
-    def get_options_volume(self, params: Optional[Dict] = None, raw: bool = True):
+    def get_options_volume(
+        self, params: Optional[Dict] = None, raw: bool = True, both: bool = False
+    ):
         """Get all options dexs along wtih summaries of their volumes and dataType
         history data.
 
@@ -1287,50 +2210,22 @@ class Llama:
             totalNotionalVolume. Defaults to dailyNotionalVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        response = self._get("VOLUMES", "/overview/options", params=params)
-
-        if raw:
-            return response
-        else:
-            exclude_chart = (
-                params.get("excludeTotalDataChart", False) if params else False
-            )
-            exclude_chart_breakdown = (
-                params.get("excludeTotalDataChartBreakdown", False) if params else False
-            )
-
-            if not exclude_chart and exclude_chart_breakdown:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
-
-            elif exclude_chart and not exclude_chart_breakdown:
-                records = []
-                for item in response["totalDataChartBreakdown"]:
-                    timestamp, protocols = item
-                    for protocol, volume in protocols.items():
-                        records.append(
-                            {"date": timestamp, "protocol": protocol, "volume": volume}
-                        )
-
-                return pd.DataFrame(records)
-
-            # Default return 'totalDataChart' if raw = False and
-            # params.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-            else:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", "volume"]
-                )
+        return self._get_series(OPTIONS_VOLUME, params=params, raw=raw, both=both)
 
     def get_chain_options_volume(
         self,
         chains: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
+        both: bool = False,
+        errors: str = "raise",
     ):
         """Get all options dexs along with summaries of their volumes and dataType
         history data filtering by chain.
@@ -1349,78 +2244,33 @@ class Llama:
             totalNotionalVolume. Defaults to dailyNotionalVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(chains, str):
-            chains = [chains]
-
-        results = {}
-        dfs = []
-
-        for chain in chains:
-            response = self._get("VOLUMES", f"/overview/options/{chain}", params=params)
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for chain: {chain} "
-                    f"with dataType: {params.get('dataType', 'dailyNotionalVolume')}"
-                )
-
-            if raw:
-                results[chain] = response
-            else:
-                if not params or (
-                    not params.get("excludeTotalDataChart", False)
-                    and params.get("excludeTotalDataChartBreakdown", False)
-                ):
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-                elif params.get("excludeTotalDataChart", False) and not params.get(
-                    "excludeTotalDataChartBreakdown", False
-                ):
-                    records = []
-                    for item in response["totalDataChartBreakdown"]:
-                        timestamp, protocols = item
-                        for protocol, volume in protocols.items():
-                            records.append(
-                                {
-                                    "date": timestamp,
-                                    "chain": chain,
-                                    "protocol": protocol,
-                                    "volume": volume,
-                                }
-                            )
-                    df = pd.DataFrame(records)
-                    dfs.append(self._clean_chain_name(df))
-
-                else:
-                    # Default return 'totalDataChart' if raw = False and
-                    # prms.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", "volume"]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-        if raw:
-            return results
-        else:
-            return pd.concat(dfs, ignore_index=True)
+        return self._get_series(
+            CHAIN_OPTIONS_VOLUME,
+            chains,
+            params=params,
+            raw=raw,
+            both=both,
+            errors=errors,
+        )
 
     def get_protocol_options_volume(
         self,
         protocols: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
-    ) -> Union[List[Dict], pd.DataFrame]:
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
         """Get summary of protocol options dex volume with historical data.
 
         Endpoint: /summary/options/{protocol}
@@ -1430,84 +2280,33 @@ class Llama:
         from get_protocols().
         - params (Dict, optional): Dictionary containing optional API parameters.
             - dataType (string, optional): Desired data type. Available values are
-            totalFees, dailyFees, totalRevenue, dailyRevenue. Defaults to dailyFees.
+            dailyPremiumVolume, dailyNotionalVolume, totalPremiumVolume, or
+            totalNotionalVolume. Defaults to dailyNotionalVolume.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(protocols, str):
-            protocols = [protocols]
-
-        results = {}
-
-        for protocol in protocols:
-            response = self._get(
-                "VOLUMES", f"/summary/options/{protocol}", params=params
-            )
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for options protocol: {protocol} "
-                    f"with dataType: {params.get('dataType', 'dailyFees')}"
-                )
-            results[protocol] = response
-
-        if raw:
-            return results
-        else:
-            exclude_chart = params.get("excludeTotalDataChart", False)
-            exclude_chart_breakdown = params.get(
-                "excludeTotalDataChartBreakdown", False
-            )
-
-            all_data = []
-
-            for protocol, data in results.items():
-                # Handle case for totalDataChart
-                if not exclude_chart and exclude_chart_breakdown:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-                # Handle case for totalDataChartBreakdown
-                elif not exclude_chart_breakdown and exclude_chart:
-                    for timestamp, chains in data["totalDataChartBreakdown"]:
-                        for chain, protocols_data in chains.items():
-                            for protocol_version, volume in protocols_data.items():
-                                all_data.append(
-                                    {
-                                        "timestamp": timestamp,
-                                        "chain": chain,
-                                        "protocol": protocol,
-                                        "protocol_version": protocol_version,
-                                        "volume": volume,
-                                    }
-                                )
-                else:
-                    for timestamp, volume in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                "volume": volume,
-                            }
-                        )
-
-            return pd.DataFrame(all_data)
+        return self._get_series(
+            PROTOCOL_OPTIONS_VOLUME,
+            protocols,
+            params=params,
+            raw=raw,
+            both=both,
+            errors=errors,
+        )
 
     # --- Fees --- #
 
     def get_fees_revenue(
-        self, params: Optional[Dict] = None, raw: bool = True
+        self, params: Optional[Dict] = None, raw: bool = True, both: bool = False
     ) -> Union[List[Dict], pd.DataFrame]:
         """Get all protocols along with summaries of their fees and revenue and dataType
         history data.
@@ -1524,60 +2323,23 @@ class Llama:
             totalFees, dailyFees, totalRevenue, dailyRevenue. Defaults to dailyFees.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        response = self._get("FEES", "/overview/fees", params=params)
-
-        if raw:
-            return response
-        else:
-            dataType = params.get("dataType", "dailyFees")
-            fees_rev_col_name = (
-                dataType.replace("daily", "daily_").replace("total", "total_").lower()
-            )  # Transforming the dataType into a column name format
-
-            exclude_chart = (
-                params.get("excludeTotalDataChart", False) if params else False
-            )
-            exclude_chart_breakdown = (
-                params.get("excludeTotalDataChartBreakdown", False) if params else False
-            )
-
-            if not exclude_chart and exclude_chart_breakdown:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", fees_rev_col_name]
-                )
-
-            elif exclude_chart and not exclude_chart_breakdown:
-                records = []
-                for item in response["totalDataChartBreakdown"]:
-                    timestamp, protocols = item
-                    for protocol, value in protocols.items():
-                        records.append(
-                            {
-                                "date": timestamp,
-                                "protocol": protocol,
-                                fees_rev_col_name: value,
-                            }
-                        )
-
-                return pd.DataFrame(records)
-
-            # Default return 'totalDataChart' if raw = False and
-            # params.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-            else:
-                return pd.DataFrame(
-                    response["totalDataChart"], columns=["date", fees_rev_col_name]
-                )
+        return self._get_series(FEES_REVENUE, params=params, raw=raw, both=both)
 
     def get_chain_fees_revenue(
         self,
         chains: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
-    ) -> Union[List[Dict], pd.DataFrame]:
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
         """Get all protocols along with summaries of their fees and revenue and dataType
         history data by chain.
 
@@ -1595,85 +2357,28 @@ class Llama:
             totalFees, dailyFees, totalRevenue, dailyRevenue. Defaults to dailyFees.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
-        if isinstance(chains, str):
-            chains = [chains]
-
-        results = {}
-        dfs = []
-
-        for chain in chains:
-            response = self._get("FEES", f"/overview/fees/{chain}", params=params)
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for chain: {chain} "
-                    f"with dataType: {params.get('dataType', 'dailyNotionalVolume')}"
-                )
-
-            if raw:
-                results[chain] = response
-            else:
-                dataType = params.get("dataType", "dailyFees")
-                fees_rev_col_name = (
-                    dataType.replace("daily", "daily_")
-                    .replace("total", "total_")
-                    .lower()
-                )  # Transforming the dataType into a column name format
-
-                if not params or (
-                    not params.get("excludeTotalDataChart", False)
-                    and params.get("excludeTotalDataChartBreakdown", False)
-                ):
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", fees_rev_col_name]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-                elif params.get("excludeTotalDataChart", False) and not params.get(
-                    "excludeTotalDataChartBreakdown", False
-                ):
-                    records = []
-                    for item in response["totalDataChartBreakdown"]:
-                        timestamp, protocols = item
-                        for protocol, value in protocols.items():
-                            records.append(
-                                {
-                                    "date": timestamp,
-                                    "chain": chain,
-                                    "protocol": protocol,
-                                    fees_rev_col_name: value,
-                                }
-                            )
-                    df = pd.DataFrame(records)
-                    dfs.append(self._clean_chain_name(df))
-
-                else:
-                    # Default return 'totalDataChart' if raw = False and
-                    # prms.excludeTotalDataChart = params.excludeTotalDataChartBreakdown
-                    df = pd.DataFrame(
-                        response["totalDataChart"], columns=["date", fees_rev_col_name]
-                    )
-                    df["chain"] = chain
-                    dfs.append(self._clean_chain_name(df))
-
-        if raw:
-            return results
-        else:
-            return pd.concat(dfs, ignore_index=True)
+        return self._get_series(
+            CHAIN_FEES_REVENUE, chains, params=params, raw=raw, both=both, errors=errors
+        )
 
     def get_protocol_fees_revenue(
         self,
         protocols: Union[str, List[str]],
         params: Optional[Dict] = None,
         raw: bool = True,
-    ) -> Union[List[Dict], pd.DataFrame]:
+        both: bool = False,
+        errors: str = "raise",
+    ) -> Union[Dict, pd.DataFrame, SeriesPair, BatchResult]:
         """Get summary of protocol fees and revenue with historical data.
 
         Endpoint: /summary/fees/{protocol}
@@ -1686,80 +2391,131 @@ class Llama:
             totalFees, dailyFees, totalRevenue, dailyRevenue. Defaults to dailyFees.
         - raw (bool, optional): If True, returns raw data. If False, returns a
         transformed DataFrame. Defaults to True.
+        - both (bool, optional): Only used when raw=False. If True, requests the
+        chart and the breakdown in a single call and returns a SeriesPair of both
+        frames, with the chart checked against the breakdown sums. Defaults to False.
+        - errors (str, optional): "raise" to raise on the first entity that fails or
+        has no data, or "collect" to return a BatchResult with the successful data
+        and a per-entity error map. Defaults to "raise".
 
         Returns:
         - Dict or DataFrame: Raw data from the API or a transformed DataFrame.
         """
+        return self._get_series(
+            PROTOCOL_FEES_REVENUE,
+            protocols,
+            params=params,
+            raw=raw,
+            both=both,
+            errors=errors,
+        )
+
+    # --- Pipelines --- #
+
+    def get_protocol_metrics(
+        self,
+        protocols: Union[str, List[str]],
+        metrics: Sequence[str] = ("tvl", "dex_volume", "fees"),
+        errors: str = "raise",
+    ) -> Union[pd.DataFrame, BatchResult]:
+        """Get daily TVL, volume, fees and revenue for protocol(s) in one wide table.
+
+        All (protocol, metric) endpoints are fetched concurrently and aligned on a
+        daily UTC index. Metrics a protocol has no data for (e.g. dex volume for a
+        lending protocol) are left empty instead of raising. Failed requests are
+        not treated as missing data, see `errors`.
+
+        Endpoints: /protocol/{protocol}, /summary/dexs/{protocol},
+        /summary/derivatives/{protocol}, /summary/options/{protocol},
+        /summary/fees/{protocol}
+
+        Parameters:
+        - protocols (str or List[str], required): protocol slug(s) — you can get these
+        from get_protocols().
+        - metrics (List[str], optional): Any of tvl, dex_volume, perps_volume,
+        options_volume, fees, revenue. Defaults to tvl, dex_volume and fees.
+        - errors (str, optional): "raise" to raise the first failed request, or
+        "collect" to leave failed metrics empty and report them. Defaults to "raise".
+
+        Returns:
+        - DataFrame: One row per (date, protocol) with a float64 column per metric.
+        With errors="collect", a BatchResult of it whose errors are keyed by
+        (protocol, metric).
+        """
+        check_error_mode(errors)
         if isinstance(protocols, str):
             protocols = [protocols]
 
-        results = {}
+        unknown = [metric for metric in metrics if metric not in PROTOCOL_METRICS]
+        if unknown:
+            raise ValueError(
+                f"Unknown metric(s): {', '.join(unknown)}. "
+                f"Available metrics are: {', '.join(PROTOCOL_METRICS)}"
+            )
+        self._validate(PROTOCOL, protocols)
 
+        calls = {}
         for protocol in protocols:
-            response = self._get("FEES", f"/summary/fees/{protocol}", params=params)
-            if (
-                response.get("totalDataChart") is None
-                and response.get("totalDataChartBreakdown") is None
-            ):
-                raise ValueError(
-                    f"No data available for protocol: {protocol} "
-                    f"with dataType: {params.get('dataType', 'dailyFees')}"
+            for metric in metrics:
+                source = PROTOCOL_METRICS[metric]
+                calls[(protocol, metric)] = (
+                    source.api_tag,
+                    f"{source.path}/{protocol}",
+                    source.params,
                 )
-            results[protocol] = response
 
-        if raw:
-            return results
-        else:
-            # the /summary/fees/{protocol} endpoint doesn't actually have a flag for
-            # excludeTotalDataChart or excludeTotalDataChartBreakdown like the volume
-            # endpoints do, but the functionality works the same here even without it.
-
-            dataType = params.get("dataType", "dailyFees")
-            fees_rev_col_name = (
-                dataType.replace("daily", "daily_").replace("total", "total_").lower()
-            )  # Transforming the dataType into a column name format
-
-            exclude_chart = params.get("excludeTotalDataChart", False)
-            exclude_chart_breakdown = params.get(
-                "excludeTotalDataChartBreakdown", False
+        responses, failures = self._fetch_many(calls)
+        if errors == "raise":
+            for key in calls:
+                if key in failures:
+                    raise failures[key]
+
+        series = {protocol: {} for protocol in protocols}
+        for (protocol, metric), response in responses.items():
+            source = PROTOCOL_METRICS[metric]
+            points = response.get(source.field) if isinstance(response, dict) else None
+            if points:
+                series[protocol][metric] = daily_series(points, source.value_field)
+
+        df = self._output(align_daily(series, "protocol", list(metrics)))
+        if errors == "collect":
+            return BatchResult(
+                df, {key: entity_error(error) for key, error in failures.items()}
             )
+        return df
 
-            all_data = []
-
-            for protocol, data in results.items():
-                # Handle case for totalDataChart
-                if not exclude_chart and exclude_chart_breakdown:
-                    for timestamp, value in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                fees_rev_col_name: value,
-                            }
-                        )
-
-                # Handle case for totalDataChartBreakdown
-                elif not exclude_chart_breakdown and exclude_chart:
-                    for timestamp, chains in data["totalDataChartBreakdown"]:
-                        for chain, protocols_data in chains.items():
-                            for protocol_version, value in protocols_data.items():
-                                all_data.append(
-                                    {
-                                        "timestamp": timestamp,
-                                        "chain": chain,
-                                        "protocol": protocol,
-                                        "protocol_version": protocol_version,
-                                        fees_rev_col_name: value,
-                                    }
-                                )
-                else:
-                    for timestamp, value in data["totalDataChart"]:
-                        all_data.append(
-                            {
-                                "timestamp": timestamp,
-                                "protocol": protocol,
-                                fees_rev_col_name: value,
-                            }
-                        )
-
-            return pd.DataFrame(all_data)
+    # --- Snapshots --- #
+
+    def poll_changes(
+        self, source: str, rtol: float = 0.0, atol: float = 0.0
+    ) -> SnapshotChanges:
+        """Fetch a current-state snapshot and return only the rows that changed since
+        the previous poll of the same source.
+
+        The first poll of a source reports every row as inserted. The previous
+        snapshot is kept on this Llama instance.
+
+        Parameters:
+        - source (str, required): One of protocols_tvl (get_all_protocols_current_tvl),
+        chains_tvl (get_all_chains_current_tvl) or bridges (get_all_bridge_volume).
+        - rtol (float, optional): Relative tolerance for numeric changes. Defaults
+        to 0.
+        - atol (float, optional): Absolute tolerance for numeric changes. Defaults
+        to 0.
+
+        Returns:
+        - SnapshotChanges: inserted, removed and changed rows.
+        """
+        if source not in SNAPSHOT_SOURCES:
+            raise ValueError(
+                f"Unknown snapshot source '{source}'. "
+                f"Available sources are: {', '.join(SNAPSHOT_SOURCES)}"
+            )
+
+        method, keys = SNAPSHOT_SOURCES[source]
+        differ = self._snapshots.get(source)
+        if differ is None:
+            differ = self._snapshots[source] = SnapshotDiffer(keys)
+        differ.rtol, differ.atol = rtol, atol
+
+        return differ.update(self.backend.to_pandas(getattr(self, method)(raw=False)))
@@ -0,0 +1,99 @@
+"""Compact dtypes for transformed DataFrames."""
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns holding unix timestamps or dates
+DATE_COLUMNS = ("date", "timestamp")
+# Columns holding counts, stored as nullable integers: transaction counts such as
+# depositTxs or lastHourlyTxs_deposits, and names ending in "count"
+COUNT_COLUMN = re.compile(r"txs|count$", re.IGNORECASE)
+
+FLOAT32_MAX = float(np.finfo("float32").max)
+
+
+def compact_floats(values: np.ndarray, atol: Optional[float] = None) -> np.ndarray:
+    """float32 copy of a float64 array, or the array unchanged when a value is
+    beyond the float32 range.
+
+    float32 keeps about 7 significant digits (a relative error of up to 6e-8), so
+    large values lose absolute precision: 1e10 is rounded by up to 512. With
+    `atol`, the array is also left unchanged when any value would move by more
+    than `atol`.
+    """
+    if values.dtype != np.float64:
+        return values
+    finite = values[np.isfinite(values)]
+    if len(finite) and np.abs(finite).max() > FLOAT32_MAX:
+        return values
+    narrow = values.astype("float32")
+    if atol is not None:
+        error = np.abs(narrow.astype("float64") - values)
+        if np.nanmax(error, initial=0.0) > atol:
+            return values
+    return narrow
+
+
+def _dates(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        if getattr(column.dt, "tz", None) is not None:
+            column = column.dt.tz_convert(None)
+    else:
+        # Unix seconds, possibly as strings (e.g. /bridgevolume), or ISO dates
+        seconds = pd.to_numeric(column, errors="coerce")
+        if seconds.notna().sum() == column.notna().sum():
+            column = pd.to_datetime(seconds, unit="s")
+        else:
+            column = pd.to_datetime(column, utc=True).dt.tz_convert(None)
+    return column.astype("datetime64[s]")
+
+
+def _counts(column: pd.Series) -> pd.Series:
+    values = pd.to_numeric(column)
+    finite = values.dropna()
+    if len(finite) and (finite != finite.round()).any():
+        return column
+    if len(finite) and finite.abs().max() >= 2**31:
+        return values.astype("Int64")
+    return values.astype("Int32")
+
+
+def compact_frame(
+    df: pd.DataFrame, category_ratio: float = 0.5, atol: Optional[float] = None
+) -> pd.DataFrame:
+    """Return `df` with smaller dtypes.
+
+    - "date" and "timestamp" columns become datetime64[s].
+    - Count columns (names containing "txs" or ending in "count") become nullable
+    Int32, or Int64 when their values need it.
+    - String columns whose distinct values are at most `category_ratio` of the rows
+    (e.g. chain, protocol, token) become categoricals.
+    - float64 columns become float32, unless a value is beyond the float32 range
+    or, when `atol` is given, would change by more than `atol` (see
+    `compact_floats`).
+
+    Columns already categorical or of another dtype are left unchanged.
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if name in DATE_COLUMNS:
+            column = _dates(column)
+        elif isinstance(name, str) and COUNT_COLUMN.search(name):
+            column = _counts(column)
+        elif column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            try:
+                distinct = column.nunique(dropna=True)
+            except TypeError:
+                # Unhashable values, e.g. nested dicts
+                distinct = len(column)
+            if distinct <= category_ratio * len(column):
+                column = column.astype("category")
+        elif column.dtype == np.float64:
+            column = pd.Series(
+                compact_floats(column.to_numpy(), atol), index=column.index, name=name
+            )
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
@@ -0,0 +1,153 @@
+"""Adaptive per-host concurrency limits (additive increase, multiplicative decrease)."""
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Iterator, Optional
+
+
+class _Slot:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status: Optional[int] = None
+
+
+class AIMDLimit:
+    """Concurrency limit of one host, adjusted from the outcome of each request.
+
+    While responses are healthy the limit grows by about one request per round of
+    in-flight requests. A 429, a 5xx or a transport error cuts it by `backoff`, and
+    so does a rising latency: when the median of the last `recent` successful
+    latencies exceeds `latency_tolerance` times the baseline. Requests that were
+    already in flight when the limit was cut don't cut it again, so a burst of
+    failures counts as a single congestion signal.
+
+    The baseline is the median latency of the last `window` successful responses of
+    the same endpoint family (the `key` passed to `slot()`), so small and multi-MB
+    endpoints on one host are judged separately. Comparing medians rather than
+    single responses keeps the ordinary spread of healthy latencies from reading as
+    congestion, while a sustained slowdown still does until the baseline adapts.
+
+    Parameters:
+    - initial (int, optional): Starting limit. Defaults to 8.
+    - min_limit (int, optional): Lowest limit. Defaults to 1.
+    - max_limit (int, optional): Highest limit. Defaults to 64.
+    - backoff (float, optional): Factor applied on congestion. Defaults to 0.5.
+    - latency_tolerance (float, optional): Recent median latency, as a multiple of
+    the baseline, treated as congestion. Defaults to 2.
+    - window (int, optional): Successful latencies kept per endpoint family for
+    the baseline. Defaults to 100.
+    - recent (int, optional): Latest latencies whose median is compared with the
+    baseline. Defaults to 20.
+    - clock (Callable, optional): Monotonic time source. Defaults to
+    time.monotonic.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+        recent: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.window = window
+        self.recent = recent
+        self.clock = clock
+        self.latencies: Dict[Hashable, Deque[float]] = {}
+        self.inflight = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns its start time."""
+        with self.condition:
+            while self.inflight >= int(self.limit):
+                self.condition.wait()
+            self.inflight += 1
+        return self.clock()
+
+    def baseline(self, key: Hashable = None) -> Optional[float]:
+        """Baseline latency of an endpoint family, or None before any success."""
+        samples = self.latencies.get(key)
+        if not samples:
+            return None
+        return statistics.median(samples)
+
+    def release(self, started: float, congested: bool, key: Hashable = None):
+        """Record the outcome of a request to the endpoint family `key` started at
+        `started`."""
+        now = self.clock()
+        latency = now - started
+        with self.condition:
+            self.inflight -= 1
+            slow = False
+            if not congested:
+                samples = self.latencies.get(key)
+                if samples is None:
+                    samples = self.latencies[key] = deque(maxlen=self.window)
+                samples.append(latency)
+                if len(samples) >= self.recent:
+                    recent = statistics.median(
+                        samples[i] for i in range(-self.recent, 0)
+                    )
+                    slow = recent > self.latency_tolerance * self.baseline(key)
+            if congested or slow:
+                if started >= self.last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, key: Hashable = None) -> Iterator[_Slot]:
+        """Hold a request slot for the endpoint family `key`. Set `status` on the
+        yielded object to the response status code; an exception or a 429/5xx status
+        counts as congestion."""
+        started = self.acquire()
+        slot = _Slot()
+        congested = True
+        try:
+            yield slot
+            congested = slot.status is not None and (
+                slot.status == 429 or slot.status >= 500
+            )
+        finally:
+            self.release(started, congested, key)
+
+
+class ConcurrencyController:
+    """Keeps one `AIMDLimit` per base URL.
+
+    Parameters:
+    - initial (int, optional): Starting limit of each host. Defaults to 8.
+    - max_limit (int, optional): Highest limit of each host. Defaults to 64.
+    """
+
+    def __init__(self, initial: int = 8, max_limit: int = 64):
+        self.initial = initial
+        self.max_limit = max_limit
+        self.hosts: Dict[str, AIMDLimit] = {}
+        self.lock = threading.Lock()
+
+    def limiter(self, host: str) -> AIMDLimit:
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = AIMDLimit(self.initial, max_limit=self.max_limit)
+            return self.hosts[host]
+
+    def limits(self) -> Dict[str, float]:
+        """Current concurrency limit of every host seen so far."""
+        with self.lock:
+            return {host: limit.limit for host, limit in self.hosts.items()}
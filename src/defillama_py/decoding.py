@@ -0,0 +1,43 @@
+"""Selection of the JSON decoder used for API responses."""
+import json
+from typing import Any, Callable, Union
+
+Decoder = Callable[[bytes], Any]
+
+DECODERS = ("auto", "orjson", "json")
+
+
+def _orjson() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def get_decoder(decoder: Union[str, Decoder] = "auto") -> Decoder:
+    """Return a function decoding a JSON body given as bytes.
+
+    Parameters:
+    - decoder (str or Callable, optional): "orjson", "json" (the standard library)
+    or "auto", which uses orjson when it is installed and falls back to the
+    standard library otherwise. A callable is returned unchanged. Defaults to
+    "auto".
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "json":
+        return json.loads
+    if decoder == "orjson":
+        try:
+            return _orjson()
+        except ImportError:
+            raise ImportError(
+                "The 'orjson' decoder requires orjson: pip install orjson"
+            ) from None
+    if decoder == "auto":
+        try:
+            return _orjson()
+        except ImportError:
+            return json.loads
+    raise ValueError(
+        f"decoder must be a callable or one of {', '.join(DECODERS)}, got '{decoder}'."
+    )
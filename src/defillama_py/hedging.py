@@ -0,0 +1,165 @@
+"""Hedged requests: a duplicate is sent when a response is slower than usual."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+# Routes whose trailing segments are entities (protocol, chain, bridge, ...), as
+# the route prefix ("*" matches any segment) and the number of entity segments
+ENTITY_ROUTES = (
+    (("protocol",), 1),
+    (("tvl",), 1),
+    (("v2", "historicalChainTvl"), 1),
+    (("overview", "*"), 1),
+    (("summary", "*"), 1),
+    (("bridge",), 1),
+    (("bridgevolume",), 1),
+    (("bridgedaystats",), 2),
+    (("transactions",), 1),
+    (("fetch", "contract"), 2),
+)
+
+
+def latency_key(endpoint: str) -> str:
+    """Group endpoints that differ only by their entity, e.g. "/protocol/aave" and
+    "/protocol/lido" both map to "/protocol/*", and "/overview/dexs/ethereum" to
+    "/overview/dexs/*". Other endpoints, e.g. "/v2/chains" or "/overview/dexs", are
+    their own group."""
+    segments = [segment for segment in endpoint.split("?")[0].split("/") if segment]
+    for prefix, entities in ENTITY_ROUTES:
+        if len(segments) == len(prefix) + entities and all(
+            part in ("*", segment) for part, segment in zip(prefix, segments)
+        ):
+            return "/" + "/".join(segments[: len(prefix)]) + "/*"
+    return endpoint
+
+
+class Hedger:
+    """Sends a second copy of a request that hasn't answered within the
+    `percentile` latency of its endpoint, and uses whichever response comes first.
+
+    Latencies are tracked per endpoint family (see `latency_key`) over the last
+    `window` successful requests; no hedge is sent until `min_samples` are known.
+    Hedges are limited to `max_ratio` of all requests by a token bucket, so a slow
+    host never sees more than that much extra load.
+
+    Parameters:
+    - percentile (float, optional): Latency percentile after which to hedge.
+    Defaults to 95.
+    - max_ratio (float, optional): Maximum share of extra requests. Defaults to 0.1.
+    - min_samples (int, optional): Latencies needed before hedging. Defaults to 20.
+    - window (int, optional): Number of latencies kept per family. Defaults to 200.
+    - max_workers (int, optional): Threads available for in-flight attempts.
+    Defaults to 64.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        max_ratio: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 64,
+    ):
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.tokens = 1.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="llama-hedge"
+        )
+
+    def delay(self, key: str) -> Optional[float]:
+        """Latency percentile of `key`, or None while there are too few samples."""
+        with self.lock:
+            samples = self.latencies.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def record(self, key: str, latency: float):
+        with self.lock:
+            samples = self.latencies.get(key)
+            if samples is None:
+                samples = self.latencies[key] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def _timed(self, key: str, attempt: Callable[[], T]) -> T:
+        start = time.monotonic()
+        result = attempt()
+        self.record(key, time.monotonic() - start)
+        return result
+
+    def _take_token(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.hedged += 1
+            return True
+
+    def run(self, key: str, attempt: Callable[[], T]) -> T:
+        """Run `attempt`, hedging it with a second call when it is slow."""
+        with self.lock:
+            self.requests += 1
+            self.tokens = min(10.0, self.tokens + self.max_ratio)
+
+        delay = self.delay(key)
+        if delay is None:
+            return self._timed(key, attempt)
+
+        primary = self.executor.submit(self._timed, key, attempt)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self._take_token():
+            return primary.result()
+
+        hedge = self.executor.submit(self._timed, key, attempt)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self.lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self) -> Dict:
+        """Request and hedge counts, and the p50/p95/p99 latency of each family."""
+        with self.lock:
+            families = {key: sorted(samples) for key, samples in self.latencies.items()}
+            counts = {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            }
+        latency = {
+            key: {
+                f"p{q}": ordered[min(len(ordered) - 1, len(ordered) * q // 100)]
+                for q in (50, 95, 99)
+            }
+            for key, ordered in families.items()
+        }
+        return {**counts, "latency": latency}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,263 @@
+"""Dense date × chain TVL matrix kept in a memory-mapped file."""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+DAY = 86400
+CHAIN_BLOCK = 64
+# The data file starts with a header holding its column capacity
+MAGIC = b"TVLMATRX"
+HEADER = 64
+
+Timestamp = Union[int, float, str, pd.Timestamp]
+
+
+def _day(value: Timestamp) -> int:
+    """Unix seconds of the UTC day containing `value`."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        seconds = int(value)
+    else:
+        seconds = int(pd.Timestamp(value).timestamp())
+    return seconds - seconds % DAY
+
+
+def _write_header(f, capacity: int):
+    f.write(MAGIC + np.int64(capacity).astype("<i8").tobytes())
+
+
+def _read_header(path: str) -> int:
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 8)
+    if len(header) < len(MAGIC) + 8 or not header.startswith(MAGIC):
+        raise ValueError(f"'{path}' is not a TVL matrix data file.")
+    return int(np.frombuffer(header[len(MAGIC) :], dtype="<i8")[0])
+
+
+def _write_json(path: str, data: Dict):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class TVLMatrix:
+    """Daily TVL of many chains as one float64 matrix, one row per day and one
+    column per chain, stored in a memory-mapped file.
+
+    The data file holds the rows back to back after a small header, so new days are
+    appended at the end of the file without moving existing data. Columns are
+    allocated in blocks of 64 chains; adding chains beyond the allocated columns
+    rewrites the file into a new one, which readers that still map the old file are
+    not affected by. The chain and date index are kept next to it in
+    "<path>.json" and written after the data, so a reader never sees an index
+    larger than the data. The column capacity is stored in the data file's header
+    and the layout is taken from there, so a reader that loads the index just
+    before a rewrite still maps the new file with the right row width.
+
+    Opened read-only (the default), the matrix is a view of the OS page cache:
+    any number of processes can map it without a copy per process. Cells without
+    data (e.g. days before a chain launched) are NaN.
+
+    Parameters:
+    - path (str, required): Data file; the index is kept in "<path>.json".
+    - writable (bool, optional): Open for writing. Defaults to False.
+
+    Example:
+        matrix = TVLMatrix("chain_tvl.f64")
+        matrix.to_frame().loc["2024-01-01":, ["Ethereum", "Arbitrum"]]
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        self.lock = threading.Lock()
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls, path: str, start: Timestamp, chains: Sequence[str] = ()
+    ) -> "TVLMatrix":
+        """Create an empty matrix whose first row is the day of `start`, replacing
+        any existing one at `path`."""
+        with open(path, "wb") as f:
+            _write_header(f, 0)
+        _write_json(
+            f"{path}.json",
+            {"start": _day(start), "days": 0, "capacity": 0, "chains": []},
+        )
+        matrix = cls(path, writable=True)
+        matrix.add_chains(chains)
+        return matrix
+
+    def refresh(self):
+        """Re-read the index and remap the data, e.g. after another process
+        extended the matrix."""
+        with open(f"{self.path}.json") as f:
+            meta = json.load(f)
+        self.start: int = meta["start"]
+        self.days: int = meta["days"]
+        self.capacity: int = meta["capacity"]
+        self.chains: List[str] = meta["chains"]
+        self.columns = {chain: i for i, chain in enumerate(self.chains)}
+        self._map()
+
+    def _map(self):
+        capacity = _read_header(self.path)
+        # Capacity only grows and the index is written after the data, so an index
+        # loaded before a rewrite describes a prefix of the new columns
+        if capacity < self.capacity or capacity < len(self.chains):
+            raise ValueError(
+                f"Index of '{self.path}' expects {self.capacity} columns, but the "
+                f"data file holds {capacity}."
+            )
+        self.capacity = capacity
+        size = os.path.getsize(self.path) - HEADER
+        rows = max(size, 0) // (8 * capacity) if capacity else 0
+        if rows == 0:
+            self.data = np.empty((0, capacity))
+            return
+        mode = "r+" if self.writable else "r"
+        self.data = np.memmap(
+            self.path,
+            dtype="float64",
+            mode=mode,
+            offset=HEADER,
+            shape=(rows, capacity),
+        )
+
+    def _check_writable(self):
+        if not self.writable:
+            raise ValueError("Matrix is opened read-only.")
+
+    def _save_meta(self):
+        _write_json(
+            f"{self.path}.json",
+            {
+                "start": self.start,
+                "days": self.days,
+                "capacity": self.capacity,
+                "chains": self.chains,
+            },
+        )
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        days = self.start + DAY * np.arange(self.days, dtype="int64")
+        return pd.DatetimeIndex(days.astype("datetime64[s]"), name="date")
+
+    @property
+    def values(self) -> np.ndarray:
+        """The (days, chains) matrix; a view of the mapped file, not a copy."""
+        return self.data[: self.days, : len(self.chains)]
+
+    def column(self, chain: str) -> pd.Series:
+        """TVL of one chain, indexed by date."""
+        if chain not in self.columns:
+            raise ValueError(f"Chain '{chain}' is not in the matrix.")
+        return pd.Series(
+            self.values[:, self.columns[chain]], index=self.dates, name=chain
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wide DataFrame with a date index and one column per chain."""
+        return pd.DataFrame(
+            self.values, index=self.dates, columns=pd.Index(self.chains, name="chain")
+        )
+
+    def row(self, day: Timestamp) -> int:
+        """Row index of the day containing `day`."""
+        return (_day(day) - self.start) // DAY
+
+    def add_chains(self, chains: Iterable[str]):
+        """Add columns for the chains that aren't in the matrix yet."""
+        self._check_writable()
+        with self.lock:
+            new = [c for c in dict.fromkeys(chains) if c not in self.columns]
+            if not new:
+                return
+            needed = len(self.chains) + len(new)
+            if needed > self.capacity:
+                capacity = -(-needed // CHAIN_BLOCK) * CHAIN_BLOCK
+                self._relayout(capacity)
+            for chain in new:
+                self.columns[chain] = len(self.chains)
+                self.chains.append(chain)
+            self._save_meta()
+
+    def _relayout(self, capacity: int):
+        """Copy the data into a new file with room for `capacity` chains."""
+        mapped = len(self.data)
+        rows = max(mapped, self.days)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            _write_header(f, capacity)
+            f.truncate(HEADER + 8 * rows * capacity)
+        if rows:
+            data = np.memmap(
+                tmp, dtype="float64", mode="r+", offset=HEADER, shape=(rows, capacity)
+            )
+            data[:] = np.nan
+            data[:mapped, : self.capacity] = self.data
+            data.flush()
+            del data
+        os.replace(tmp, self.path)
+        self._map()
+
+    def extend(self, until: Timestamp):
+        """Grow the matrix to include the day of `until`; new rows are NaN."""
+        self._check_writable()
+        days = self.row(until) + 1
+        with self.lock:
+            if days <= self.days:
+                return
+            if days > len(self.data):
+                # Allocate a month ahead, so daily updates rarely resize the file
+                rows = days + 31
+                with open(self.path, "r+b") as f:
+                    f.truncate(HEADER + 8 * rows * self.capacity)
+                previous = len(self.data)
+                self._map()
+                self.data[previous:] = np.nan
+            self.days = days
+            self._save_meta()
+
+    def set_series(
+        self, chain: str, dates: Sequence[Timestamp], values: Sequence[float]
+    ):
+        """Write the TVL of one chain on the given days. Days outside the matrix
+        are ignored; call `extend()` first to include later days.
+
+        Columns are independent, so different chains can be written concurrently.
+        """
+        self._check_writable()
+        if chain not in self.columns:
+            raise ValueError(f"Chain '{chain}' is not in the matrix.")
+        seconds = np.asarray(dates, dtype="int64")
+        rows = (seconds - seconds % DAY - self.start) // DAY
+        keep = (rows >= 0) & (rows < self.days)
+        values = np.asarray(values, dtype="float64")
+        self.data[rows[keep], self.columns[chain]] = values[keep]
+
+    def set_day(self, day: Timestamp, values: Dict[str, float]):
+        """Write the TVL of several chains on one day, extending the matrix to it."""
+        self.extend(day)
+        row = self.row(day)
+        for chain, value in values.items():
+            if chain in self.columns and value is not None:
+                self.data[row, self.columns[chain]] = value
+
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Last day with data for any chain, or None."""
+        filled = ~np.isnan(self.values).all(axis=1)
+        if not filled.any():
+            return None
+        return self.dates[np.flatnonzero(filled)[-1]]
+
+    def flush(self):
+        """Write pending changes of the mapped data to disk."""
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
@@ -0,0 +1,217 @@
+"""Process-pool execution of the per-entity transformation stage.
+
+Workers receive the undecoded response body of one entity, decode and assemble it
+with `timeseries.assemble`, and write every resulting column into a
+`multiprocessing.shared_memory` block. Only small descriptors (block name, dtype,
+length and, for categoricals, the labels) travel back through pickling; the parent
+maps the blocks and concatenates them into the final frame.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from defillama_py.timeseries import SeriesEndpoint, assemble, has_data
+
+
+class ColumnBlock(NamedTuple):
+    """A column written to shared memory by a worker."""
+
+    name: str
+    shm_name: Optional[str]
+    dtype: str
+    length: int
+    categories: Optional[List[str]] = None
+    datetime: Optional[str] = None
+
+
+def _export_array(array: np.ndarray) -> Optional[str]:
+    if array.nbytes == 0:
+        return None
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    if os.name == "posix":
+        # The parent owns the block from here on and unlinks it once read, so the
+        # worker's tracker must not remove it. POSIX blocks are tracked under their
+        # "/"-prefixed name, which SharedMemory.name leaves out.
+        resource_tracker.unregister(f"/{block.name}", "shared_memory")
+    return block.name
+
+
+def export_frame(df: pd.DataFrame) -> List[ColumnBlock]:
+    """Write the columns of `df` to shared memory blocks. Blocks already written
+    are unlinked if a column fails."""
+    blocks: List[ColumnBlock] = []
+    try:
+        _export_columns(df, blocks)
+    except BaseException:
+        release(blocks)
+        raise
+    return blocks
+
+
+def _export_columns(df: pd.DataFrame, blocks: List[ColumnBlock]):
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            categories = column.cat.categories.tolist()
+            blocks.append(
+                ColumnBlock(
+                    name, _export_array(codes), codes.dtype.str, len(codes), categories
+                )
+            )
+        elif np.issubdtype(column.dtype, np.datetime64):
+            values = column.to_numpy()
+            unit = np.datetime_data(values.dtype)[0]
+            ints = values.view("int64")
+            blocks.append(
+                ColumnBlock(
+                    name, _export_array(ints), ints.dtype.str, len(ints), None, unit
+                )
+            )
+        else:
+            values = column.to_numpy()
+            blocks.append(
+                ColumnBlock(name, _export_array(values), values.dtype.str, len(values))
+            )
+
+
+def _read_block(block: ColumnBlock) -> np.ndarray:
+    if block.shm_name is None:
+        return np.empty(0, dtype=block.dtype)
+    shm = shared_memory.SharedMemory(name=block.shm_name)
+    try:
+        view = np.ndarray((block.length,), dtype=block.dtype, buffer=shm.buf)
+        return view.copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def release(blocks: List[ColumnBlock]):
+    """Unlink blocks that won't be read (e.g. after an error)."""
+    for block in blocks:
+        if block.shm_name is not None:
+            try:
+                shm = shared_memory.SharedMemory(name=block.shm_name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+
+
+def discard(future: Future):
+    """Unlink the blocks of a `transform_worker` job whose result won't be read,
+    once it finishes (or right away if it already has)."""
+
+    def release_result(done: Future):
+        if not done.cancelled() and done.exception() is None:
+            release(done.result()[1])
+
+    future.add_done_callback(release_result)
+
+
+def import_frames(parts: List[List[ColumnBlock]]) -> pd.DataFrame:
+    """Concatenate worker outputs into one DataFrame.
+
+    Categorical columns are merged on a shared category table by remapping each
+    part's codes, so labels are never expanded to strings.
+    """
+    if not parts:
+        return pd.DataFrame()
+
+    columns = {}
+    for position, first in enumerate(parts[0]):
+        blocks = [part[position] for part in parts]
+        arrays = [_read_block(block) for block in blocks]
+
+        if first.categories is not None:
+            table: Dict[str, int] = {}
+            remapped = []
+            for block, codes in zip(blocks, arrays):
+                mapping = np.asarray(
+                    [table.setdefault(label, len(table)) for label in block.categories],
+                    dtype="int32",
+                )
+                remapped.append(mapping[codes] if len(codes) else codes)
+            codes = np.concatenate(remapped).astype("int32")
+            columns[first.name] = pd.Categorical.from_codes(
+                codes, categories=pd.Index(list(table))
+            )
+        else:
+            values = np.concatenate(arrays)
+            if first.datetime is not None:
+                values = values.view(f"datetime64[{first.datetime}]")
+            columns[first.name] = values
+
+    return pd.DataFrame(columns)
+
+
+def transform_worker(
+    endpoint: SeriesEndpoint,
+    entity: str,
+    body: bytes,
+    params: Optional[Dict],
+    decode: Callable[[bytes], Dict],
+    aliases: Optional[Dict[str, str]] = None,
+) -> Tuple[bool, List[ColumnBlock]]:
+    """Decode and assemble one entity's response in a worker process.
+
+    `decode` must be picklable (a module-level function such as `json.loads`).
+    `aliases` is the chain alias table passed on to `assemble`.
+    Returns (has_data, blocks); blocks is empty when the response has no data.
+    """
+    response = decode(body)
+    if not has_data(response):
+        return False, []
+    frame = assemble(endpoint, {entity: response}, params, aliases=aliases)
+    return True, export_frame(frame)
+
+
+def _context():
+    # Forking a process that runs request threads can deadlock the child on a lock
+    # held by another thread, so workers are started from a clean process
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+class TransformPool:
+    """Lazily started process pool for `transform_worker` jobs.
+
+    Jobs are submitted from the request threads, so the pool is started under a
+    lock. Workers use the forkserver start method where available, spawn
+    otherwise.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    def submit(self, *args):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    self.processes, mp_context=_context()
+                )
+            executor = self.executor
+        return executor.submit(transform_worker, *args)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,233 @@
+"""Lazy queries over the volume and fees endpoints."""
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from defillama_py.batch import BatchResult, check_error_mode
+from defillama_py.timeseries import (
+    BREAKDOWN,
+    CHART,
+    SeriesEndpoint,
+    assemble_columns,
+    value_column,
+)
+
+if TYPE_CHECKING:
+    from defillama_py.client import Llama
+
+Timestamp = Union[int, str, pd.Timestamp]
+
+
+class SeriesFamily(NamedTuple):
+    """The three endpoints of a dataset: all of it, per chain and per protocol."""
+
+    overview: SeriesEndpoint
+    chain: SeriesEndpoint
+    protocol: SeriesEndpoint
+
+
+class QueryPlan(NamedTuple):
+    """What `Query.collect()` will request and how it flattens the responses.
+
+    - endpoint: Endpoint to call.
+    - entities: Chains or protocols to request, or None for the overview endpoint.
+    - params: API parameters, excluding the unused part of each response.
+    - mode: CHART or BREAKDOWN.
+    - keep: Breakdown labels kept while flattening, per dimension.
+    - columns: Columns of the result.
+    """
+
+    endpoint: SeriesEndpoint
+    entities: Optional[List[str]]
+    params: Dict
+    mode: str
+    keep: Dict[str, List[str]]
+    columns: List[str]
+
+
+def _seconds(value: Optional[Timestamp]) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    return int(pd.Timestamp(value).timestamp())
+
+
+Columns = Dict[str, Union[np.ndarray, pd.Categorical]]
+
+
+def _sum_by(columns: Columns, keys: List[str], value: str) -> Columns:
+    """Sum `value` over the rows sharing the same `keys`, keeping groups in the
+    order they first appear. Works on the codes of categorical columns. Without
+    keys, the result is a single row holding the total."""
+    if not keys:
+        return {value: np.array([np.nan_to_num(columns[value]).sum()])}
+    codes = []
+    for key in keys:
+        column = columns[key]
+        if isinstance(column, pd.Categorical):
+            codes.append(column.codes.astype("int64"))
+        else:
+            codes.append(np.unique(column, return_inverse=True)[1].ravel())
+    _, first, inverse = np.unique(
+        np.stack(codes), axis=1, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+
+    result = {key: columns[key][first[order]] for key in keys}
+    result[value] = np.bincount(
+        rank[inverse.ravel()],
+        weights=np.nan_to_num(columns[value]),
+        minlength=len(order),
+    )
+    return result
+
+
+class Query:
+    """Lazily built query over one volume/fees dataset, created by `Llama.query()`.
+
+    Each method returns a new Query; nothing is requested until `collect()`. The
+    filters decide which endpoint is called and which part of its responses is
+    requested, and date and breakdown filters are applied while the responses are
+    flattened, so filtered-out rows are never materialized:
+
+    - protocols: one /summary request per protocol; a chain filter then selects the
+    chains of its breakdown.
+    - chains only: one /overview/{chain} request per chain.
+    - neither: a single /overview request.
+
+    The breakdown part of a response is only requested when a filter or a requested
+    column needs it. When columns leave out a breakdown dimension, values are summed
+    over it; with the value as the only column, the result is a single total.
+
+    Example:
+        llama.query("dex_volume").protocols(["uniswap", "curve-dex"])
+            .chains(["ethereum"]).since("2024-01-01")
+            .columns(["date", "protocol", "volume"]).collect()
+    """
+
+    def __init__(self, client: "Llama", family: SeriesFamily):
+        self.client = client
+        self.family = family
+        self.filters: Dict = {}
+
+    def _with(self, **filters) -> "Query":
+        query = Query(self.client, self.family)
+        query.filters = {**self.filters, **filters}
+        return query
+
+    def chains(self, chains: Union[str, Sequence[str]]) -> "Query":
+        """Keep only these chains."""
+        return self._with(chains=[chains] if isinstance(chains, str) else list(chains))
+
+    def protocols(self, protocols: Union[str, Sequence[str]]) -> "Query":
+        """Keep only these protocols (slugs)."""
+        if isinstance(protocols, str):
+            protocols = [protocols]
+        return self._with(protocols=list(protocols))
+
+    def since(self, since: Timestamp) -> "Query":
+        """Keep dates on or after `since` (unix seconds or a date string)."""
+        return self._with(since=_seconds(since))
+
+    def until(self, until: Timestamp) -> "Query":
+        """Keep dates before `until` (unix seconds or a date string)."""
+        return self._with(until=_seconds(until))
+
+    def columns(self, columns: Sequence[str]) -> "Query":
+        """Return only these columns."""
+        return self._with(columns=list(columns))
+
+    def data_type(self, data_type: str) -> "Query":
+        """API dataType, e.g. "dailyRevenue" for the fees dataset."""
+        return self._with(data_type=data_type)
+
+    def plan(self) -> QueryPlan:
+        """Resolve the filters into the requests `collect()` will make."""
+        chains = self.filters.get("chains")
+        protocols = self.filters.get("protocols")
+        wanted = set(self.filters.get("columns") or ())
+
+        keep = {}
+        if protocols:
+            endpoint, entities = self.family.protocol, protocols
+            breakdown = bool(chains) or bool(wanted & set(endpoint.breakdown_dims))
+            if chains:
+                keep["chain"] = chains
+        elif chains:
+            endpoint, entities = self.family.chain, chains
+            breakdown = bool(wanted & set(endpoint.breakdown_dims))
+        else:
+            endpoint, entities = self.family.overview, None
+            breakdown = bool(wanted & set(endpoint.breakdown_dims))
+
+        params = {
+            "excludeTotalDataChart": breakdown,
+            "excludeTotalDataChartBreakdown": not breakdown,
+        }
+        if "data_type" in self.filters:
+            params["dataType"] = self.filters["data_type"]
+
+        available = ["date"]
+        if endpoint.entity_dim:
+            available.append(endpoint.entity_dim)
+        if breakdown:
+            available += list(endpoint.breakdown_dims)
+        available.append(value_column(endpoint, params))
+
+        columns = self.filters.get("columns") or available
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown column(s): {', '.join(unknown)}. "
+                f"Available columns: {', '.join(available)}"
+            )
+
+        mode = BREAKDOWN if breakdown else CHART
+        return QueryPlan(endpoint, entities, params, mode, keep, list(columns))
+
+    def collect(self, errors: str = "raise") -> Union[pd.DataFrame, BatchResult]:
+        """Run the query.
+
+        Parameters:
+        - errors (str, optional): "raise" or "collect", as for the volume and fees
+        methods. Defaults to "raise".
+
+        Returns:
+        - DataFrame (in the client's output backend), or a BatchResult of it when
+        errors="collect".
+        """
+        check_error_mode(errors)
+        plan = self.plan()
+        endpoint = plan.endpoint
+
+        result = self.client._get_series(
+            endpoint, plan.entities, plan.params, raw=True, errors=errors
+        )
+        failures = {}
+        if isinstance(result, BatchResult):
+            result, failures = result.data, result.errors
+        responses = result if endpoint.entity_dim else {None: result}
+
+        columns = assemble_columns(
+            endpoint,
+            responses,
+            plan.params,
+            mode=plan.mode,
+            since=self.filters.get("since"),
+            until=self.filters.get("until"),
+            keep=plan.keep,
+            aliases=self.client._chain_alias_table(),
+        )
+
+        value = value_column(endpoint, plan.params)
+        dims = [c for c in columns if c != value]
+        keys = [c for c in columns if c in plan.columns and c != value]
+        if value in plan.columns and any(c not in keys for c in dims):
+            columns = _sum_by(columns, keys, value)
+        df = self.client._from_columns({c: columns[c] for c in plan.columns})
+
+        if errors == "collect":
+            return BatchResult(df, failures)
+        return df
@@ -0,0 +1,38 @@
+"""Client-side request rate limiting."""
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket allowing `requests_per_minute` requests with small bursts.
+
+    Parameters:
+    - requests_per_minute (float, required): Sustained request budget.
+    - burst (int, optional): Maximum number of requests that can be sent back to
+    back. Defaults to 1/10th of the per-minute budget.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive.")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(requests_per_minute // 10)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,131 @@
+"""Compact typed records for the entities returned by the mapping helpers.
+
+Each record class stores its fields in ``__slots__`` rather than a per-instance
+``__dict__``, which keeps large result lists (10k+ pools or protocols) several times
+smaller than the equivalent list of dicts while giving fast attribute access.
+"""
+from typing import Any, Dict, Iterable, List, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+class Record:
+    """Base class for slot-based records.
+
+    Subclasses only need to declare ``__slots__`` (the field names, in order) and
+    ``_api_fields`` (the matching keys in the raw API payload).
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    _api_fields: Tuple[str, ...] = ()
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        if len(args) > len(self.__slots__):
+            raise TypeError(
+                f"{type(self).__name__} takes at most {len(self.__slots__)} "
+                f"positional arguments ({len(args)} given)"
+            )
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args) :]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(
+                f"{type(self).__name__} got unexpected fields: {', '.join(kwargs)}"
+            )
+
+    @classmethod
+    def from_api(cls: Type[R], entry: Dict) -> R:
+        """Build a record from a single raw API entry."""
+        return cls(*[entry.get(field) for field in cls._api_fields])
+
+    @classmethod
+    def from_api_list(cls: Type[R], entries: Iterable[Dict]) -> List[R]:
+        """Build a list of records from raw API entries."""
+        fields = cls._api_fields
+        return [cls(*[entry.get(field) for field in fields]) for entry in entries]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict keyed by field name."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def astuple(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self.astuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self) -> Tuple:
+        return self.astuple()
+
+    def __setstate__(self, state: Tuple):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class Chain(Record):
+    """A chain from /v2/chains."""
+
+    __slots__ = ("chain_id", "name")
+    _api_fields = ("chainId", "name")
+
+
+class Protocol(Record):
+    """A protocol from /protocols."""
+
+    __slots__ = ("id", "name", "slug")
+    _api_fields = ("id", "name", "slug")
+
+
+class Stablecoin(Record):
+    """A stablecoin from /stablecoins."""
+
+    __slots__ = ("id", "name", "symbol")
+    _api_fields = ("id", "name", "symbol")
+
+
+class Pool(Record):
+    """A yield pool from /pools."""
+
+    __slots__ = ("id", "chain", "project", "symbol")
+    _api_fields = ("pool", "chain", "project", "symbol")
+
+
+class BridgeTransaction(Record):
+    """A single bridge transaction from /transactions/{id}."""
+
+    __slots__ = (
+        "tx_hash",
+        "timestamp",
+        "tx_block",
+        "tx_from",
+        "tx_to",
+        "token",
+        "amount",
+        "chain",
+        "bridge_name",
+        "usd_value",
+        "source_chain",
+    )
+    _api_fields = (
+        "tx_hash",
+        "ts",
+        "tx_block",
+        "tx_from",
+        "tx_to",
+        "token",
+        "amount",
+        "chain",
+        "bridge_name",
+        "usd_value",
+        "sourceChain",
+    )
@@ -0,0 +1,209 @@
+"""Background refresh of DefiLlama endpoints with stale-while-revalidate reads."""
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class _Entry:
+    __slots__ = (
+        "name",
+        "fetch",
+        "interval",
+        "jitter",
+        "value",
+        "fetched_at",
+        "error",
+        "future",
+    )
+
+    def __init__(self, name: str, fetch: Callable[[], Any], interval: float, jitter):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.jitter = jitter
+        self.value = None
+        self.fetched_at: Optional[float] = None
+        self.error: Optional[Exception] = None
+        self.future: Optional[Future] = None
+
+
+class Scheduler:
+    """Refreshes registered endpoints in the background and serves the latest result
+    from memory.
+
+    Reads never wait for a refresh once a first result exists: a stale value is
+    returned immediately and a refresh is started behind it (stale-while-
+    revalidate). Periodic refreshes are spread out with jitter and run on a small
+    worker pool, and the client's own rate limiter (see `Llama(rate_limit=...)`)
+    keeps the combined traffic within budget.
+
+    Parameters:
+    - max_workers (int, optional): Number of refreshes that may run at the same time.
+    Defaults to 2.
+    - clock (Callable, optional): Monotonic time source. Defaults to
+    time.monotonic.
+
+    Example:
+        llama = Llama(rate_limit=500)
+        scheduler = Scheduler()
+        scheduler.register("protocols", llama.get_protocols, interval=3600)
+        scheduler.register("dexs", lambda: llama.get_dex_volume(raw=False), 300)
+        scheduler.start()
+        protocols = scheduler.get("protocols")
+    """
+
+    def __init__(
+        self, max_workers: int = 2, clock: Callable[[], float] = time.monotonic
+    ):
+        self.entries: Dict[str, _Entry] = {}
+        self.pool = ThreadPoolExecutor(max_workers, thread_name_prefix="llama-refresh")
+        self.clock = clock
+        self.lock = threading.Lock()
+        # (due, tiebreak, entry); entries replaced by a later register() are dropped
+        # when they come due
+        self.queue: List[Tuple[float, int, _Entry]] = []
+        self.counter = itertools.count()
+        self.wakeup = threading.Condition(self.lock)
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+    def register(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        interval: float,
+        jitter: float = 0.1,
+    ):
+        """Register an endpoint to keep fresh. Registering a name again replaces
+        its fetch function, interval and cached result.
+
+        Parameters:
+        - name (str, required): Key used to read the result with `get()`.
+        - fetch (Callable, required): Function without arguments returning the
+        parsed result, e.g. `llama.get_protocols`.
+        - interval (float, required): Refresh interval in seconds; a result older
+        than this is stale.
+        - jitter (float, optional): Random spread applied to every scheduled refresh,
+        as a fraction of the interval. Defaults to 0.1.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        with self.lock:
+            entry = _Entry(name, fetch, interval, jitter)
+            self.entries[name] = entry
+            # Spread first loads over the jitter window so that endpoints registered
+            # together don't all fire at once
+            self._schedule(entry, random.uniform(0, jitter * interval))
+
+    def _schedule(self, entry: _Entry, delay: float):
+        heapq.heappush(self.queue, (self.clock() + delay, next(self.counter), entry))
+        self.wakeup.notify()
+
+    def _next_delay(self, entry: _Entry) -> float:
+        return entry.interval * (1 + random.uniform(-entry.jitter, entry.jitter))
+
+    def _refresh(self, entry: _Entry):
+        try:
+            value = entry.fetch()
+        except Exception as e:
+            entry.error = e
+        else:
+            entry.value, entry.error = value, None
+            entry.fetched_at = self.clock()
+
+    def refresh(self, name: str) -> Future:
+        """Start a background refresh of `name` unless one is already running."""
+        entry = self.entries[name]
+        with self.lock:
+            if entry.future is None or entry.future.done():
+                entry.future = self.pool.submit(self._refresh, entry)
+            return entry.future
+
+    def is_stale(self, name: str) -> bool:
+        entry = self.entries[name]
+        if entry.fetched_at is None:
+            return True
+        return self.clock() - entry.fetched_at > entry.interval
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Return the latest result for `name`.
+
+        If a result exists it is returned immediately, and a background refresh is
+        started when it is stale. Only the very first read waits for a result.
+
+        Raises the refresh error if no result could be fetched yet, and
+        TimeoutError if the first result doesn't arrive within `timeout` seconds.
+        """
+        entry = self.entries[name]
+        if entry.fetched_at is None:
+            try:
+                self.refresh(name).result(timeout)
+            except FutureTimeoutError:
+                raise TimeoutError(f"No result for '{name}' within {timeout}s.")
+            if entry.fetched_at is None:
+                raise entry.error
+        elif self.is_stale(name):
+            self.refresh(name)
+        return entry.value
+
+    def status(self) -> Dict[str, Dict]:
+        """Age, staleness and last error of every registered endpoint."""
+        now = self.clock()
+        return {
+            name: {
+                "age": None if entry.fetched_at is None else now - entry.fetched_at,
+                "stale": self.is_stale(name),
+                "refreshing": entry.future is not None and not entry.future.done(),
+                "error": entry.error,
+            }
+            for name, entry in self.entries.items()
+        }
+
+    def _run(self):
+        with self.lock:
+            while self.running:
+                if not self.queue:
+                    self.wakeup.wait()
+                    continue
+                due, _, entry = self.queue[0]
+                delay = due - self.clock()
+                if delay > 0:
+                    self.wakeup.wait(delay)
+                    continue
+                heapq.heappop(self.queue)
+                if self.entries.get(entry.name) is not entry:
+                    continue
+                if entry.future is None or entry.future.done():
+                    entry.future = self.pool.submit(self._refresh, entry)
+                self._schedule(entry, self._next_delay(entry))
+
+    def start(self):
+        """Start refreshing registered endpoints in the background."""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="llama-scheduler")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop the background loop and the refresh workers."""
+        with self.lock:
+            self.running = False
+            self.wakeup.notify()
+        if self.thread is not None and wait:
+            self.thread.join()
+        self.pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,124 @@
+"""Diffing of current-state snapshots so that polling emits only changed rows."""
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class SnapshotChanges(NamedTuple):
+    """Rows that differ between two consecutive snapshots.
+
+    - inserted: Rows whose key was not in the previous snapshot.
+    - removed: Rows of the previous snapshot whose key is gone.
+    - changed: Current version of rows whose values changed beyond the tolerance.
+    """
+
+    inserted: pd.DataFrame
+    removed: pd.DataFrame
+    changed: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return self.inserted.empty and self.removed.empty and self.changed.empty
+
+    def __len__(self) -> int:
+        return len(self.inserted) + len(self.removed) + len(self.changed)
+
+
+def _key_hashes(df: pd.DataFrame, keys: List[str]) -> np.ndarray:
+    return pd.util.hash_pandas_object(df[keys], index=False).to_numpy()
+
+
+class SnapshotDiffer:
+    """Keeps the previous snapshot of a keyed table and diffs new snapshots against
+    it.
+
+    The previous snapshot is stored indexed by a uint64 hash of its key columns, so
+    each update is a single hash-join rather than a row by row comparison.
+
+    Parameters:
+    - keys (List[str], required): Columns that identify a row, e.g. ["chain",
+    "protocol"].
+    - rtol (float, optional): Relative tolerance for numeric columns. Defaults to 0.
+    - atol (float, optional): Absolute tolerance for numeric columns. Defaults to 0.
+    - columns (List[str], optional): Value columns to compare. Defaults to every
+    non-key column.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        rtol: float = 0.0,
+        atol: float = 0.0,
+        columns: Optional[Sequence[str]] = None,
+    ):
+        self.keys = list(keys)
+        self.rtol = rtol
+        self.atol = atol
+        self.columns = list(columns) if columns is not None else None
+        self.previous: Optional[pd.DataFrame] = None
+
+    def reset(self):
+        """Forget the previous snapshot; the next update reports every row."""
+        self.previous = None
+
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        missing = [key for key in self.keys if key not in df.columns]
+        if missing:
+            raise ValueError(f"Snapshot is missing key column(s): {', '.join(missing)}")
+
+        columns = self.columns
+        if columns is None:
+            columns = [column for column in df.columns if column not in self.keys]
+        df = df[self.keys + columns]
+        df = df.set_axis(pd.Index(_key_hashes(df, self.keys)), axis=0)
+        return df[~df.index.duplicated(keep="last")]
+
+    def _changed_mask(self, old: pd.DataFrame, new: pd.DataFrame) -> np.ndarray:
+        changed = np.zeros(len(new), dtype=bool)
+        for column in new.columns:
+            if column in self.keys:
+                continue
+            if column not in old.columns:
+                changed[:] = True
+                break
+            a, b = old[column].to_numpy(), new[column].to_numpy()
+            if pd.api.types.is_numeric_dtype(a.dtype) and pd.api.types.is_numeric_dtype(
+                b.dtype
+            ):
+                a, b = a.astype("float64"), b.astype("float64")
+                same = np.isclose(a, b, rtol=self.rtol, atol=self.atol, equal_nan=True)
+            else:
+                same = (a == b) | (pd.isna(a) & pd.isna(b))
+            changed |= ~np.asarray(same, dtype=bool)
+        return changed
+
+    def update(self, df: pd.DataFrame) -> SnapshotChanges:
+        """Diff `df` against the previous snapshot and keep it as the new previous
+        one."""
+        current = self._prepare(df)
+        previous = self.previous
+        self.previous = current
+
+        if previous is None:
+            return SnapshotChanges(
+                current.reset_index(drop=True),
+                current.iloc[:0].reset_index(drop=True),
+                current.iloc[:0].reset_index(drop=True),
+            )
+
+        positions = previous.index.get_indexer(current.index)
+        matched = positions >= 0
+
+        seen = np.zeros(len(previous), dtype=bool)
+        seen[positions[matched]] = True
+
+        common_new = current[matched]
+        common_old = previous.iloc[positions[matched]]
+        changed = self._changed_mask(common_old, common_new)
+
+        return SnapshotChanges(
+            current[~matched].reset_index(drop=True),
+            previous[~seen].reset_index(drop=True),
+            common_new[changed].reset_index(drop=True),
+        )
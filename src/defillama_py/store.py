@@ -0,0 +1,211 @@
+"""Local SQLite store for transformed results."""
+import json
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+Timestamp = Union[int, float, str, pd.Timestamp]
+
+_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(name: str) -> str:
+    """Quote a table or column name, rejecting anything but identifiers."""
+    if not _NAME.match(name):
+        raise ValueError(f"'{name}' is not a valid table or column name.")
+    return f'"{name}"'
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_datetime64_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _seconds(value: Timestamp) -> int:
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp())
+
+
+class LocalStore:
+    """Keeps transformed DataFrames in indexed SQLite tables and queries them back.
+
+    Each table has a primary key on its key columns (e.g. date, chain, protocol),
+    so writing overlapping data updates rows in place instead of duplicating them,
+    and an index on "date" for range queries. Datetime columns are stored as unix
+    seconds and returned as datetime64[s].
+
+    Parameters:
+    - path (str, required): SQLite database file, or ":memory:".
+
+    Example:
+        llama = Llama(store=LocalStore("defillama.db"))
+        llama.get_chain_dex_volume(["ethereum", "arbitrum"], raw=False)
+        llama.store.query("chain_dex_volume", chain="ethereum", since="2024-01-01")
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS _tables "
+            "(name TEXT PRIMARY KEY, keys TEXT NOT NULL, dates TEXT NOT NULL)"
+        )
+
+    def _columns(self, table: str) -> List[str]:
+        rows = self.connection.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+        return [row[1] for row in rows]
+
+    def _meta(self, table: str):
+        """Key and datetime columns of a stored table, or None."""
+        row = self.connection.execute(
+            "SELECT keys, dates FROM _tables WHERE name = ?", (table,)
+        ).fetchone()
+        return (json.loads(row[0]), json.loads(row[1])) if row else None
+
+    def upsert(self, table: str, df: pd.DataFrame, keys: Sequence[str]) -> int:
+        """Insert the rows of `df`, replacing the values of rows with the same keys.
+
+        Columns missing from an existing table are added. Returns the number of rows
+        written.
+        """
+        name = _quote(table)
+        columns = [str(column) for column in df.columns]
+        quoted = {column: _quote(column) for column in columns}
+        keys = list(keys)
+        missing = [key for key in keys if key not in columns]
+        if missing:
+            raise ValueError(f"Missing key column(s): {', '.join(missing)}")
+
+        dates = [c for c in columns if pd.api.types.is_datetime64_dtype(df[c].dtype)]
+        data = []
+        for column in columns:
+            values = df[column]
+            if column in dates:
+                data.append(values.to_numpy().astype("datetime64[s]").astype("int64"))
+            else:
+                data.append(values.astype(object).where(values.notna(), None))
+        rows = list(zip(*(values.tolist() for values in data)))
+
+        conflict = ", ".join(quoted[key] for key in keys)
+        updates = [quoted[c] for c in columns if c not in keys]
+        if updates:
+            action = "DO UPDATE SET " + ", ".join(
+                f"{c} = excluded.{c}" for c in updates
+            )
+        else:
+            action = "DO NOTHING"
+        insert = (
+            f"INSERT INTO {name} ({', '.join(quoted.values())}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({conflict}) {action}"
+        )
+
+        with self.lock, self.connection:
+            existing = self._columns(table)
+            if not existing:
+                definitions = ", ".join(
+                    f"{quoted[c]} {_sql_type(df[c].dtype)}" for c in columns
+                )
+                self.connection.execute(
+                    f"CREATE TABLE {name} ({definitions}, PRIMARY KEY ({conflict}))"
+                )
+                if "date" in keys and keys[0] != "date":
+                    self.connection.execute(
+                        f'CREATE INDEX {_quote(table + "_date")} ON {name} ("date")'
+                    )
+            for column in columns:
+                if existing and column not in existing:
+                    self.connection.execute(
+                        f"ALTER TABLE {name} ADD COLUMN {quoted[column]} "
+                        f"{_sql_type(df[column].dtype)}"
+                    )
+            self.connection.executemany(insert, rows)
+
+            meta = self._meta(table)
+            known_dates = set(dates) | set(meta[1] if meta else [])
+            self.connection.execute(
+                "INSERT OR REPLACE INTO _tables VALUES (?, ?, ?)",
+                (table, json.dumps(keys), json.dumps(sorted(known_dates))),
+            )
+        return len(rows)
+
+    def tables(self) -> Dict[str, List[str]]:
+        """Stored tables with their key columns."""
+        with self.lock:
+            rows = self.connection.execute("SELECT name, keys FROM _tables").fetchall()
+        return {name: json.loads(keys) for name, keys in rows}
+
+    def query(
+        self,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        **filters,
+    ) -> pd.DataFrame:
+        """Read rows of a stored table.
+
+        Parameters:
+        - table (str, required): Table name, see `tables()`.
+        - columns (List[str], optional): Columns to return. Defaults to all.
+        - since (int or str, optional): Earliest date (unix seconds or a date
+        string), inclusive.
+        - until (int or str, optional): Latest date, exclusive.
+        - **filters: Column equal to a value, or in a list of values, e.g.
+        chain=["ethereum", "arbitrum"].
+
+        Returns:
+        - DataFrame ordered by the table's key columns.
+        """
+        name = _quote(table)
+        with self.lock:
+            known = self._columns(table)
+            meta = self._meta(table)
+        if not known or meta is None:
+            raise ValueError(f"Table '{table}' is not in the store.")
+        keys, dates = meta
+
+        selected = list(columns) if columns is not None else known
+        unknown = [c for c in list(selected) + list(filters) if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for '{table}': {', '.join(unknown)}")
+
+        clauses, args = [], []
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                clauses.append(f"{_quote(column)} IN ({', '.join('?' for _ in value)})")
+                args += value
+            else:
+                clauses.append(f"{_quote(column)} = ?")
+                args.append(value)
+        if since is not None:
+            clauses.append('"date" >= ?')
+            args.append(_seconds(since))
+        if until is not None:
+            clauses.append('"date" < ?')
+            args.append(_seconds(until))
+
+        sql = f"SELECT {', '.join(map(_quote, selected))} FROM {name}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + ", ".join(map(_quote, keys))
+
+        with self.lock:
+            df = pd.read_sql_query(sql, self.connection, params=args)
+        for column in dates:
+            if column in df.columns:
+                df[column] = df[column].astype("int64").astype("datetime64[s]")
+        return df
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,42 @@
+"""Background prefetching for iterating over results in bounded memory."""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def prefetch(func: Callable[[T], R], items: Iterable[T], depth: int) -> Iterator[R]:
+    """Yield `func(item)` for each item, in order, while up to `depth` of the
+    following items are computed in background threads.
+
+    At most `depth` results are held besides the one being consumed, so memory
+    stays bounded however many items there are. Closing the generator early
+    cancels the calls that haven't started.
+    """
+    items = iter(items)
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max(1, depth), thread_name_prefix="llama-prefetch") as pool:
+        try:
+            for item in items:
+                pending.append(pool.submit(func, item))
+                if len(pending) > depth:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def row_chunks(df, size: int) -> Iterator:
+    """Split a frame into consecutive chunks of at most `size` rows. Arrow Tables
+    and polars DataFrames are sliced with their own zero-copy `slice`."""
+    for start in range(0, len(df), size):
+        if isinstance(df, pd.DataFrame):
+            yield df.iloc[start : start + size]
+        else:
+            yield df.slice(start, size)
@@ -0,0 +1,461 @@
+"""Shared time-series assembly for the volume and fees endpoints.
+
+Every `/overview/*` and `/summary/*` endpoint returns the same two shapes:
+
+- ``totalDataChart``: ``[[timestamp, value], ...]``
+- ``totalDataChartBreakdown``: ``[[timestamp, {label: value}], ...]`` for overview
+  endpoints, or ``[[timestamp, {chain: {protocol_version: value}}], ...]`` for
+  summary endpoints.
+
+`assemble()` turns one or more of those responses into a typed long-format
+DataFrame (datetime64 dates, float64 values, categorical dimensions) through a single
+code path, driven by a `SeriesEndpoint` descriptor.
+"""
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CHART = "totalDataChart"
+BREAKDOWN = "totalDataChartBreakdown"
+
+
+class SeriesEndpoint(NamedTuple):
+    """Describes a volume/fees endpoint family.
+
+    - api_tag: Base URL tag passed to `Llama._get`.
+    - path: Endpoint path. Entity endpoints append "/{entity}" to it.
+    - entity_dim: Name of the column holding the requested entity ("chain" or
+    "protocol"), or None for endpoints that take no entity.
+    - breakdown_dims: Column names for the nested keys of totalDataChartBreakdown.
+    - default_data_type: dataType the API uses when none is given.
+    - value_name: Fixed name of the value column. If None, the name is derived from
+    dataType (e.g. dailyFees -> daily_fees).
+    - label: Human readable name used in error messages.
+    - name: Dataset name, e.g. "chain_dex_volume", used as the local store table.
+    """
+
+    api_tag: str
+    path: str
+    entity_dim: Optional[str]
+    breakdown_dims: Tuple[str, ...]
+    default_data_type: str
+    value_name: Optional[str] = None
+    label: str = ""
+    name: str = ""
+
+
+def normalize_chain_name(name: str) -> str:
+    """Lowercase a chain name and replace spaces and hyphens with underscores."""
+    return re.sub(r"[-\s]", "_", name.lower())
+
+
+def chain_key(name: str) -> str:
+    """Spelling-insensitive key of a chain name: lowercase letters and digits only,
+    so that e.g. "zkSync Era", "zksync-era" and "ZKsyncEra" share a key."""
+    return re.sub(r"[^0-9a-z]", "", name.lower())
+
+
+def chain_alias_table(names: Iterable[str]) -> Dict[str, str]:
+    """Map the `chain_key` of each known chain to its normalized name."""
+    table: Dict[str, str] = {}
+    for name in names:
+        normalized = normalize_chain_name(name)
+        table.setdefault(chain_key(normalized), normalized)
+    return table
+
+
+def chain_normalizer(aliases: Optional[Dict[str, str]] = None) -> Callable[[str], str]:
+    """Function normalizing a chain name with `normalize_chain_name` and, when it
+    has an entry in `aliases` (see `chain_alias_table`), replacing it with the
+    canonical name."""
+    if not aliases:
+        return normalize_chain_name
+
+    def normalize(name: str) -> str:
+        normalized = normalize_chain_name(name)
+        return aliases.get(chain_key(normalized), normalized)
+
+    return normalize
+
+
+def normalize_chain_column(
+    column: pd.Series, aliases: Optional[Dict[str, str]] = None
+) -> pd.Series:
+    """Normalize a column of chain names, working on its distinct values only.
+
+    Each distinct name is normalized with `normalize_chain_name` and, when it has
+    an entry in `aliases` (see `chain_alias_table`), replaced by the canonical
+    name. Rows are then remapped through integer codes, so the cost of the string
+    work depends on the number of chains rather than rows. Categorical columns stay
+    categorical; other columns keep their dtype.
+    """
+    categorical = isinstance(column.dtype, pd.CategoricalDtype)
+    if categorical:
+        codes, labels = column.cat.codes.to_numpy(), column.cat.categories
+    else:
+        codes, labels = pd.factorize(column)
+
+    normalize = chain_normalizer(aliases)
+    names = [normalize(str(label)) for label in labels]
+    inverse, uniques = pd.factorize(pd.Index(names, dtype=object))
+    # Missing values have code -1, which picks the trailing -1
+    inverse = np.append(inverse, -1)
+
+    result = pd.Categorical.from_codes(inverse[codes], categories=uniques)
+    result = pd.Series(result, index=column.index, name=column.name)
+    return result if categorical else result.astype(column.dtype)
+
+
+def series_mode(params: Optional[Dict]) -> str:
+    """Return which part of the response a transformation uses: CHART or BREAKDOWN.
+
+    The breakdown is only used when it is the sole part requested; in every other
+    combination the aggregated chart is returned.
+    """
+    exclude_chart = params.get("excludeTotalDataChart", False) if params else False
+    exclude_breakdown = (
+        params.get("excludeTotalDataChartBreakdown", False) if params else False
+    )
+    if exclude_chart and not exclude_breakdown:
+        return BREAKDOWN
+    return CHART
+
+
+def data_type(endpoint: SeriesEndpoint, params: Optional[Dict]) -> str:
+    return (params or {}).get("dataType", endpoint.default_data_type)
+
+
+def value_column(endpoint: SeriesEndpoint, params: Optional[Dict]) -> str:
+    """Name of the value column, e.g. "volume" or "daily_fees"."""
+    if endpoint.value_name:
+        return endpoint.value_name
+    # Transforming the dataType into a column name format
+    return (
+        data_type(endpoint, params)
+        .replace("daily", "daily_")
+        .replace("total", "total_")
+        .lower()
+    )
+
+
+def dataset_name(
+    endpoint: SeriesEndpoint, params: Optional[Dict], mode: Optional[str] = None
+) -> str:
+    """Table name of an assembled frame, e.g. "chain_dex_volume_breakdown" or
+    "protocol_fees_revenue_daily_revenue"."""
+    name = endpoint.name
+    if (mode or series_mode(params)) == BREAKDOWN:
+        name += "_breakdown"
+    requested = data_type(endpoint, params)
+    if requested != endpoint.default_data_type:
+        name += "_" + re.sub(r"(?<!^)(?=[A-Z])", "_", requested).lower()
+    return name
+
+
+def has_data(response: Dict) -> bool:
+    return response.get(CHART) is not None or response.get(BREAKDOWN) is not None
+
+
+def coded_categorical(
+    codes, labels: List[str], normalize: Optional[Callable[[str], str]] = None
+) -> pd.Categorical:
+    """Build a Categorical from integer codes into `labels`.
+
+    If `normalize` is given, it is applied once per distinct label and labels that
+    collapse to the same name are merged.
+    """
+    codes = np.asarray(codes, dtype="int32")
+    if normalize is not None:
+        inverse, uniques = pd.factorize(pd.Index([normalize(x) for x in labels]))
+        if len(codes):
+            codes = inverse[codes].astype("int32")
+        labels = list(uniques)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(labels))
+
+
+def _label_filter(
+    dim: str, allowed: Iterable[str], aliases: Optional[Dict[str, str]] = None
+) -> Callable[[str], bool]:
+    """Predicate telling whether a breakdown label is in `allowed`, evaluated once
+    per distinct label. Chain labels are compared after normalization."""
+    normalize = chain_normalizer(aliases) if dim == "chain" else str
+    allowed = {normalize(label) for label in allowed}
+    seen: Dict[str, bool] = {}
+
+    def accept(label: str) -> bool:
+        if label not in seen:
+            seen[label] = normalize(label) in allowed
+        return seen[label]
+
+    return accept
+
+
+class _Codes:
+    """Assigns dense integer codes to labels in first-seen order."""
+
+    __slots__ = ("table", "codes")
+
+    def __init__(self):
+        self.table: Dict[str, int] = {}
+        self.codes: List[int] = []
+
+    def categorical(self, normalize: Optional[Callable[[str], str]] = None):
+        return coded_categorical(self.codes, list(self.table), normalize)
+
+
+def assemble(
+    endpoint: SeriesEndpoint,
+    responses: Dict[Optional[str], Dict],
+    params: Optional[Dict] = None,
+    mode: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    keep: Optional[Dict[str, Iterable[str]]] = None,
+    aliases: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Assemble responses into a long-format DataFrame.
+
+    Parameters:
+    - endpoint (SeriesEndpoint): Descriptor of the endpoint the responses came from.
+    - responses (Dict): Mapping of entity to response. Use a None key for endpoints
+    without an entity.
+    - params (Dict, optional): The params the responses were requested with.
+    - mode (str, optional): CHART or BREAKDOWN. Defaults to `series_mode(params)`.
+    - since (int, optional): Skip points before this unix timestamp.
+    - until (int, optional): Skip points at or after this unix timestamp.
+    - keep (Dict, optional): Mapping of a breakdown dimension to the labels to keep,
+    e.g. {"chain": ["ethereum"]}. Points outside the range or labels are skipped
+    while flattening, so they are never materialized.
+    - aliases (Dict, optional): Chain alias table (see `chain_alias_table`) applied
+    to the chain categories, so spelling variants of a chain become one.
+
+    Returns:
+    - DataFrame with a "date" column (datetime64[s]), categorical dimension columns
+    and a float64 value column.
+    """
+    return pd.DataFrame(
+        assemble_columns(endpoint, responses, params, mode, since, until, keep, aliases)
+    )
+
+
+def assemble_columns(
+    endpoint: SeriesEndpoint,
+    responses: Dict[Optional[str], Dict],
+    params: Optional[Dict] = None,
+    mode: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    keep: Optional[Dict[str, Iterable[str]]] = None,
+    aliases: Optional[Dict[str, str]] = None,
+) -> Dict[str, Union[np.ndarray, pd.Categorical]]:
+    """Like `assemble`, but returns the columns (numpy arrays and Categoricals) so
+    that frames of other libraries can be built from them without pandas.
+    """
+    mode = mode or series_mode(params)
+    value_name = value_column(endpoint, params)
+    depth = len(endpoint.breakdown_dims) if mode == BREAKDOWN else 0
+
+    dates: List = []
+    values: List = []
+    lengths: List[int] = []
+    entities = _Codes()
+    dims = [_Codes() for _ in range(depth)]
+    accepts = [
+        _label_filter(name, keep[name], aliases) if keep and name in keep else None
+        for name in endpoint.breakdown_dims[:depth]
+    ]
+    ranged = since is not None or until is not None
+    lower = since if since is not None else -np.inf
+    upper = until if until is not None else np.inf
+
+    for entity, response in responses.items():
+        start = len(values)
+        points = response.get(mode) or []
+        if ranged:
+            points = [point for point in points if lower <= point[0] < upper]
+
+        if depth == 0:
+            for timestamp, value in points:
+                dates.append(timestamp)
+                values.append(value)
+
+        elif depth == 1:
+            (labels,) = dims
+            (accept,) = accepts
+            table, codes = labels.table, labels.codes
+            for timestamp, inner in points:
+                for label, value in inner.items():
+                    if accept is not None and not accept(label):
+                        continue
+                    dates.append(timestamp)
+                    codes.append(table.setdefault(label, len(table)))
+                    values.append(value)
+
+        else:
+            outer, leaf = dims
+            accept_outer, accept_leaf = accepts
+            outer_table, outer_codes = outer.table, outer.codes
+            leaf_table, leaf_codes = leaf.table, leaf.codes
+            for timestamp, inner in points:
+                for outer_label, leaves in inner.items():
+                    if accept_outer is not None and not accept_outer(outer_label):
+                        continue
+                    code = outer_table.setdefault(outer_label, len(outer_table))
+                    for label, value in leaves.items():
+                        if accept_leaf is not None and not accept_leaf(label):
+                            continue
+                        dates.append(timestamp)
+                        outer_codes.append(code)
+                        leaf_codes.append(leaf_table.setdefault(label, len(leaf_table)))
+                        values.append(value)
+
+        if endpoint.entity_dim:
+            entities.table.setdefault(entity, len(entities.table))
+            lengths.append(len(values) - start)
+
+    columns = {
+        "date": np.asarray(dates, dtype="int64").astype("datetime64[s]"),
+    }
+
+    if endpoint.entity_dim:
+        entity_codes = np.repeat(
+            np.arange(len(lengths), dtype="int32"), np.asarray(lengths, dtype="int64")
+        )
+        entities.codes = entity_codes
+        columns[endpoint.entity_dim] = entities.categorical(
+            chain_normalizer(aliases) if endpoint.entity_dim == "chain" else None
+        )
+
+    for name, codes in zip(endpoint.breakdown_dims[:depth], dims):
+        columns[name] = codes.categorical(
+            chain_normalizer(aliases) if name == "chain" else None
+        )
+
+    columns[value_name] = np.asarray(values, dtype="float64")
+    return columns
+
+
+class SeriesPair(NamedTuple):
+    """Aggregate chart and breakdown assembled from the same responses.
+
+    - total: Long-format frame built from totalDataChart.
+    - breakdown: Long-format frame built from totalDataChartBreakdown.
+    - mismatches: Dates (per entity) where the chart value differs from the sum of
+    the breakdown by more than the tolerance. Empty when everything reconciles.
+    """
+
+    total: pd.DataFrame
+    breakdown: pd.DataFrame
+    mismatches: pd.DataFrame
+
+
+def both_params(params: Optional[Dict]) -> Dict:
+    """Copy of params that requests both the chart and the breakdown."""
+    params = dict(params or {})
+    params["excludeTotalDataChart"] = False
+    params["excludeTotalDataChartBreakdown"] = False
+    return params
+
+
+def reconcile(
+    endpoint: SeriesEndpoint,
+    total: pd.DataFrame,
+    breakdown: pd.DataFrame,
+    value_name: str,
+    rtol: float = 1e-6,
+    atol: float = 1e-6,
+) -> pd.DataFrame:
+    """Compare chart values with breakdown sums on (entity, date).
+
+    Returns one row per mismatching (entity, date) with the chart value, the
+    breakdown sum and their difference. Dates missing from the breakdown count as a
+    breakdown sum of 0.
+    """
+    keys = ["date"] + ([endpoint.entity_dim] if endpoint.entity_dim else [])
+    sums = (
+        breakdown.groupby(keys, observed=True, sort=False)[value_name]
+        .sum()
+        .rename("breakdown_sum")
+    )
+    merged = total.set_index(keys)[[value_name]].join(sums, how="left")
+    merged["breakdown_sum"] = merged["breakdown_sum"].fillna(0.0)
+    merged["difference"] = merged[value_name] - merged["breakdown_sum"]
+
+    tolerance = atol + rtol * merged[value_name].abs()
+    mismatched = merged[merged["difference"].abs() > tolerance]
+    return mismatched.reset_index()
+
+
+def assemble_both(
+    endpoint: SeriesEndpoint,
+    responses: Dict[Optional[str], Dict],
+    params: Optional[Dict] = None,
+    rtol: float = 1e-6,
+    aliases: Optional[Dict[str, str]] = None,
+) -> SeriesPair:
+    """Assemble both the chart and the breakdown from a single set of responses and
+    check the chart against the breakdown sums."""
+    total = assemble(endpoint, responses, params, mode=CHART, aliases=aliases)
+    breakdown = assemble(endpoint, responses, params, BREAKDOWN, aliases=aliases)
+    mismatches = reconcile(
+        endpoint, total, breakdown, value_column(endpoint, params), rtol=rtol
+    )
+    return SeriesPair(total, breakdown, mismatches)
+
+
+def daily_series(points, value_field: Optional[str] = None) -> pd.Series:
+    """Turn API points into a float64 Series on a normalized daily index.
+
+    `points` is either a list of ``[timestamp, value]`` pairs (totalDataChart), or a
+    list of ``{"date": timestamp, value_field: value}`` dicts (e.g. the "tvl" array
+    of /protocol/{protocol}). Timestamps are floored to midnight UTC and, when a day
+    has several points, the last one wins.
+    """
+    if value_field is None:
+        dates = [point[0] for point in points]
+        values = [point[1] for point in points]
+    else:
+        dates = [point["date"] for point in points]
+        values = [point.get(value_field) for point in points]
+
+    seconds = np.asarray(dates, dtype="int64")
+    days = (seconds - seconds % 86400).astype("datetime64[s]")
+    series = pd.Series(np.asarray(values, dtype="float64"), index=pd.Index(days))
+    return series[~series.index.duplicated(keep="last")]
+
+
+def align_daily(
+    series: Dict[str, Dict[str, pd.Series]], entity_dim: str, metrics: List[str]
+) -> pd.DataFrame:
+    """Join per-entity daily series into one wide frame.
+
+    Parameters:
+    - series (Dict): Mapping of entity to {metric: daily Series}. Metrics an entity
+    has no data for are simply absent.
+    - entity_dim (str): Name of the entity column, e.g. "protocol".
+    - metrics (List[str]): Value columns of the result, in order.
+
+    Returns:
+    - DataFrame with columns date, entity (categorical) and one float64 column per
+    metric, outer-joined on date within each entity.
+    """
+    frames = []
+    for entity, by_metric in series.items():
+        if not by_metric:
+            continue
+        frame = pd.DataFrame(by_metric).reindex(columns=metrics).sort_index()
+        frame.index.name = "date"
+        frame = frame.reset_index()
+        frame.insert(1, entity_dim, entity)
+        frames.append(frame)
+
+    if not frames:
+        empty = {"date": np.array([], dtype="datetime64[s]"), entity_dim: []}
+        empty.update({metric: np.array([], dtype="float64") for metric in metrics})
+        frames.append(pd.DataFrame(empty))
+
+    df = pd.concat(frames, ignore_index=True)
+    df[entity_dim] = pd.Categorical(df[entity_dim], categories=list(series))
+    return df.astype({metric: "float64" for metric in metrics})
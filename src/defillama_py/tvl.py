@@ -0,0 +1,389 @@
+"""Columnar extraction of protocol TVL history from /protocol/{protocol} responses.
+
+Each response holds ``chainTvls: {chain: {"tvl": [...], "tokens": [...],
+"tokensInUsd": [...]}}``. Rather than building one dict per (chain, date) entry,
+the extractors below count the rows first, allocate each output column once, and
+fill it slice by slice per chain.
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from defillama_py.timeseries import chain_normalizer, coded_categorical
+
+# chainTvls keys that are not chains but extra TVL categories, either standalone
+# ("borrowed") or as a chain suffix ("Ethereum-borrowed")
+TVL_CATEGORIES = {
+    "borrowed",
+    "staking",
+    "pool2",
+    "vesting",
+    "offers",
+    "treasury",
+    "doublecounted",
+    "liquidstaking",
+    "dcandlsoverlap",
+}
+
+
+def is_chain_key(key: str) -> bool:
+    """Whether a chainTvls key is a plain chain rather than an extra TVL category."""
+    return key.split("-")[-1].lower() not in TVL_CATEGORIES
+
+
+class TvlHistory(NamedTuple):
+    """TVL history with its token breakdown.
+
+    - tvl: One row per (date, chain, protocol).
+    - tokens: One row per (date, chain, protocol, token) with the token amount and
+    its USD value.
+    """
+
+    tvl: pd.DataFrame
+    tokens: pd.DataFrame
+
+
+def _chain_tvls(response: Dict) -> Dict[str, Dict]:
+    return response.get("chainTvls") or {}
+
+
+def extract_tvl(
+    responses: Dict[str, Dict], aliases: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Build the (date, chain, protocol, tvl) table for one or more protocols.
+
+    Parameters:
+    - responses (Dict): Mapping of protocol slug to its /protocol/{protocol} response.
+    - aliases (Dict, optional): Chain alias table (see `chain_alias_table`) applied
+    to the chain categories.
+
+    Returns:
+    - DataFrame with date (datetime64[s]), chain and protocol (categorical) and tvl
+    (float64) columns.
+    """
+    chains: Dict[str, int] = {}
+    slices: List[Tuple[int, int, List[Dict]]] = []
+    total = 0
+
+    for protocol_code, response in enumerate(responses.values()):
+        for chain, chain_data in _chain_tvls(response).items():
+            points = chain_data.get("tvl") or []
+            if points:
+                chain_code = chains.setdefault(chain, len(chains))
+                slices.append((protocol_code, chain_code, points))
+                total += len(points)
+
+    dates = np.empty(total, dtype="int64")
+    values = np.empty(total, dtype="float64")
+    chain_codes = np.empty(total, dtype="int32")
+    protocol_codes = np.empty(total, dtype="int32")
+
+    start = 0
+    for protocol_code, chain_code, points in slices:
+        end = start + len(points)
+        dates[start:end] = np.fromiter(
+            (point["date"] for point in points), dtype="int64", count=len(points)
+        )
+        values[start:end] = np.asarray(
+            [point.get("totalLiquidityUSD") for point in points], dtype="float64"
+        )
+        chain_codes[start:end] = chain_code
+        protocol_codes[start:end] = protocol_code
+        start = end
+
+    return pd.DataFrame(
+        {
+            "date": dates.astype("datetime64[s]"),
+            "chain": coded_categorical(
+                chain_codes, list(chains), chain_normalizer(aliases)
+            ),
+            "protocol": coded_categorical(protocol_codes, list(responses)),
+            "tvl": values,
+        }
+    )
+
+
+class TokenColumns(NamedTuple):
+    """Token breakdown as raw columns; labels are stored once in the dictionaries."""
+
+    dates: np.ndarray
+    protocol_codes: np.ndarray
+    chain_codes: np.ndarray
+    token_codes: np.ndarray
+    amounts: np.ndarray
+    amounts_usd: np.ndarray
+    protocols: List[str]
+    chains: List[str]
+    tokens: List[str]
+
+
+def extract_token_columns(
+    responses: Dict[str, Dict], include_chain: Optional[Callable[[str], bool]] = None
+) -> TokenColumns:
+    """Extract the tokens/tokensInUsd breakdown of every chain as coded columns.
+
+    Amounts come from "tokens" and USD values from "tokensInUsd", matched on
+    (date, token). Missing counterparts are NaN. If `include_chain` is given, only
+    chainTvls keys it returns True for are extracted.
+    """
+    chains: Dict[str, int] = {}
+    tokens: Dict[str, int] = {}
+    slices = []
+    total = 0
+
+    for protocol_code, response in enumerate(responses.values()):
+        for chain, chain_data in _chain_tvls(response).items():
+            if include_chain is not None and not include_chain(chain):
+                continue
+            amounts = chain_data.get("tokens") or []
+            in_usd = chain_data.get("tokensInUsd") or []
+            if not amounts and not in_usd:
+                continue
+            # Use whichever array is present as the row source; the other is
+            # looked up by date.
+            rows, other, rows_are_usd = (
+                (amounts, in_usd, False) if amounts else (in_usd, amounts, True)
+            )
+            count = sum(len(entry.get("tokens") or ()) for entry in rows)
+            chain_code = chains.setdefault(chain, len(chains))
+            slices.append((protocol_code, chain_code, rows, other, rows_are_usd))
+            total += count
+
+    dates = np.empty(total, dtype="int64")
+    protocol_codes = np.empty(total, dtype="int32")
+    chain_codes = np.empty(total, dtype="int32")
+    token_codes = np.empty(total, dtype="int32")
+    amounts = np.empty(total, dtype="float64")
+    amounts_usd = np.empty(total, dtype="float64")
+
+    start = 0
+    for protocol_code, chain_code, rows, other, rows_are_usd in slices:
+        other_by_date = {entry["date"]: entry.get("tokens") or {} for entry in other}
+        slice_dates, slice_tokens, slice_values, slice_other = [], [], [], []
+        for entry in rows:
+            date = entry["date"]
+            matched = other_by_date.get(date, {})
+            for token, value in (entry.get("tokens") or {}).items():
+                slice_dates.append(date)
+                slice_tokens.append(tokens.setdefault(token, len(tokens)))
+                slice_values.append(value)
+                slice_other.append(matched.get(token))
+
+        end = start + len(slice_dates)
+        row_target, other_target = (
+            (amounts_usd, amounts) if rows_are_usd else (amounts, amounts_usd)
+        )
+        dates[start:end] = slice_dates
+        token_codes[start:end] = slice_tokens
+        row_target[start:end] = np.asarray(slice_values, dtype="float64")
+        other_target[start:end] = np.asarray(slice_other, dtype="float64")
+        protocol_codes[start:end] = protocol_code
+        chain_codes[start:end] = chain_code
+        start = end
+
+    return TokenColumns(
+        dates,
+        protocol_codes,
+        chain_codes,
+        token_codes,
+        amounts,
+        amounts_usd,
+        list(responses),
+        list(chains),
+        list(tokens),
+    )
+
+
+def extract_tokens(
+    responses: Dict[str, Dict], aliases: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Build the long (date, chain, protocol, token, amount, amount_usd) table,
+    applying the optional chain alias table to the chain categories."""
+    columns = extract_token_columns(responses)
+    return pd.DataFrame(
+        {
+            "date": columns.dates.astype("datetime64[s]"),
+            "chain": coded_categorical(
+                columns.chain_codes, columns.chains, chain_normalizer(aliases)
+            ),
+            "protocol": coded_categorical(columns.protocol_codes, columns.protocols),
+            "token": coded_categorical(columns.token_codes, columns.tokens),
+            "amount": columns.amounts,
+            "amount_usd": columns.amounts_usd,
+        }
+    )
+
+
+class TokenBreakdown:
+    """Per-token TVL stored as a token dictionary, integer codes and values.
+
+    Each row is a (date, chain, protocol, token) observation. Labels are kept once
+    in `protocols`, `chains` and `tokens`; rows only hold int32 codes into them,
+    int64 dates (unix seconds) and float64 values. Nothing is materialized as a
+    dense (date x token) grid until `to_sparse()` or `to_long()` is called.
+    """
+
+    DIMS = ("date", "chain", "protocol", "token")
+
+    def __init__(
+        self,
+        columns: TokenColumns,
+        usd: bool = True,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        self.dates = columns.dates
+        self.protocol_codes = columns.protocol_codes
+        self.chain_codes = columns.chain_codes
+        self.token_codes = columns.token_codes
+        self.values = columns.amounts_usd if usd else columns.amounts
+        self.protocols = columns.protocols
+        self.chains = columns.chains
+        self.tokens = columns.tokens
+        self.value_name = "tvl_usd" if usd else "amount"
+        self.normalize_chain = chain_normalizer(aliases)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenBreakdown(rows={len(self)}, protocols={len(self.protocols)}, "
+            f"chains={len(self.chains)}, tokens={len(self.tokens)})"
+        )
+
+    def memory_usage(self) -> int:
+        """Bytes used by the coded columns (labels excluded)."""
+        return sum(
+            array.nbytes
+            for array in (
+                self.dates,
+                self.protocol_codes,
+                self.chain_codes,
+                self.token_codes,
+                self.values,
+            )
+        )
+
+    def _mask(self, values: np.ndarray, keep: Optional[Sequence[str]], labels):
+        if keep is None:
+            return None
+        wanted = [labels.index(label) for label in keep if label in labels]
+        return np.isin(values, np.asarray(wanted, dtype="int32"))
+
+    def filter(
+        self,
+        protocols: Optional[Sequence[str]] = None,
+        chains: Optional[Sequence[str]] = None,
+        tokens: Optional[Sequence[str]] = None,
+    ) -> "TokenBreakdown":
+        """Return a breakdown restricted to the given protocols, chains and tokens.
+
+        Dictionaries are shared with this breakdown; only rows are selected.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for codes, keep, labels in (
+            (self.protocol_codes, protocols, self.protocols),
+            (self.chain_codes, chains, self.chains),
+            (self.token_codes, tokens, self.tokens),
+        ):
+            selected = self._mask(codes, keep, labels)
+            if selected is not None:
+                mask &= selected
+
+        result = object.__new__(TokenBreakdown)
+        result.__dict__.update(self.__dict__)
+        for name in ("dates", "protocol_codes", "chain_codes", "token_codes", "values"):
+            setattr(result, name, getattr(self, name)[mask])
+        return result
+
+    def _key_columns(self, by: Sequence[str]):
+        unknown = [dim for dim in by if dim not in self.DIMS]
+        if unknown:
+            raise ValueError(
+                f"Cannot aggregate by {', '.join(unknown)}. "
+                f"Available dimensions are: {', '.join(self.DIMS)}"
+            )
+        return {
+            "date": self.dates,
+            "chain": self.chain_codes,
+            "protocol": self.protocol_codes,
+            "token": self.token_codes,
+        }
+
+    def aggregate(self, by: Sequence[str] = ("date", "token")) -> pd.DataFrame:
+        """Sum values over every dimension not in `by` (e.g. across protocols).
+
+        Runs on the integer codes with np.unique/np.bincount, so cost scales with
+        the number of rows rather than the number of (date, token) cells.
+        """
+        if isinstance(by, str):
+            by = [by]
+        columns = self._key_columns(by)
+        values = np.nan_to_num(self.values)
+
+        if not by:
+            return pd.DataFrame({self.value_name: [values.sum()]})
+
+        keys = np.stack([np.asarray(columns[dim], dtype="int64") for dim in by])
+        unique_keys, inverse = np.unique(keys, axis=1, return_inverse=True)
+        sums = np.bincount(
+            inverse.ravel(), weights=values, minlength=unique_keys.shape[1]
+        )
+
+        result = {}
+        for row, dim in zip(unique_keys, by):
+            result[dim] = self._decode(dim, row)
+        result[self.value_name] = sums
+        return pd.DataFrame(result)
+
+    def _decode(self, dim: str, codes: np.ndarray):
+        if dim == "date":
+            return codes.astype("datetime64[s]")
+        if dim == "chain":
+            return coded_categorical(codes, self.chains, self.normalize_chain)
+        labels = self.protocols if dim == "protocol" else self.tokens
+        return coded_categorical(codes, labels)
+
+    def to_long(self) -> pd.DataFrame:
+        """Long format: one row per (date, chain, protocol, token)."""
+        columns = self._key_columns(self.DIMS)
+        result = {dim: self._decode(dim, columns[dim]) for dim in self.DIMS}
+        result[self.value_name] = self.values
+        return pd.DataFrame(result)
+
+    def to_sparse(self, fill_value: float = 0.0) -> pd.DataFrame:
+        """Wide (date x token) frame of values summed across protocols and chains.
+
+        Columns are pandas sparse arrays, so tokens that are only held on a few
+        dates cost memory only for those dates. Dates a token has no value on hold
+        `fill_value` (e.g. np.nan to tell them apart from a zero balance).
+        """
+        sums = self.aggregate(("date", "token"))
+        dates, date_codes = np.unique(
+            sums["date"].to_numpy(dtype="int64"), return_inverse=True
+        )
+        token_codes = sums["token"].cat.codes.to_numpy()
+        values = sums[self.value_name].to_numpy()
+
+        order = np.argsort(token_codes, kind="stable")
+        token_codes, date_codes, values = (
+            token_codes[order],
+            date_codes[order],
+            values[order],
+        )
+        bounds = np.searchsorted(token_codes, np.arange(len(self.tokens) + 1))
+
+        # One dense column at a time, so only a single (dates,) buffer is live
+        data = {}
+        for code, token in enumerate(self.tokens):
+            start, end = bounds[code], bounds[code + 1]
+            if start == end:
+                continue
+            dense = np.full(len(dates), fill_value, dtype="float64")
+            dense[date_codes[start:end]] = values[start:end]
+            data[token] = pd.arrays.SparseArray(dense, fill_value=fill_value)
+
+        return pd.DataFrame(
+            data, index=pd.Index(dates.astype("datetime64[s]"), name="date")
+        )
@@ -0,0 +1,126 @@
+"""Pre-flight validation of chain, protocol, bridge and pool inputs."""
+import difflib
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from defillama_py.timeseries import normalize_chain_name
+
+CHAIN = "chain"
+PROTOCOL = "protocol"
+BRIDGE = "bridge"
+POOL = "pool"
+
+
+class KnownNames(NamedTuple):
+    """What a mapping loader may return instead of a plain list of names.
+
+    - names: Valid identifiers.
+    - hints: Other labels (e.g. display names) mapped to the identifier to suggest
+    for them. They are never accepted as inputs.
+    """
+
+    names: Iterable
+    hints: Dict[str, str]
+
+
+def _normalizer(kind: str) -> Callable[[str], str]:
+    # Chain names are matched like `Llama._clean_chain_name`; other kinds are
+    # identifiers the API only accepts verbatim
+    return normalize_chain_name if kind == CHAIN else str
+
+
+class MappingIndex:
+    """Known identifiers of one kind, indexed by their normalized form.
+
+    Chain names are normalized like `Llama._clean_chain_name` (lowercase, spaces
+    and hyphens replaced by underscores), so "Zksync Era", "zksync-era" and
+    "zksync_era" all match. Protocol slugs, bridge ids and pool ids must match
+    exactly. `hints` only feed the suggestions for unknown values, e.g. "Aave V3"
+    suggests the slug "aave-v3".
+    """
+
+    def __init__(
+        self, kind: str, names: Iterable, hints: Optional[Dict[str, str]] = None
+    ):
+        self.kind = kind
+        self.normalize = _normalizer(kind)
+        self.names: Dict[str, str] = {}
+        for name in names:
+            if name is not None:
+                self.names.setdefault(self.normalize(str(name)), str(name))
+        # Lowercase label -> identifier, for suggestions only
+        self.labels: Dict[str, str] = {
+            key.lower(): name for key, name in self.names.items()
+        }
+        for label, name in (hints or {}).items():
+            if label is not None and name is not None:
+                self.labels.setdefault(str(label).lower(), str(name))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, value) -> bool:
+        return self.normalize(str(value)) in self.names
+
+    def suggest(self, value, n: int = 3) -> List[str]:
+        """Closest known names to `value`, best first."""
+        matches = difflib.get_close_matches(
+            self.normalize(str(value)).lower(), list(self.labels), n=n, cutoff=0.6
+        )
+        return list(dict.fromkeys(self.labels[match] for match in matches))
+
+    def describe(self, value) -> str:
+        """Error message for an unknown `value`."""
+        message = f"Unknown {self.kind} '{value}'."
+        suggestions = self.suggest(value)
+        if suggestions:
+            message += f" Did you mean {' or '.join(repr(s) for s in suggestions)}?"
+        return message
+
+
+class Validator:
+    """Checks inputs against cached copies of the mapping endpoints.
+
+    Each mapping is fetched the first time an input of its kind is checked and then
+    kept for `max_age` seconds, so validation adds no requests to later calls.
+
+    Parameters:
+    - loaders (Dict[str, Callable], required): Function returning the known
+    identifiers, or a KnownNames, for each kind.
+    - max_age (float, optional): Seconds a mapping is reused before it is fetched
+    again. Defaults to one day.
+    """
+
+    def __init__(
+        self, loaders: Dict[str, Callable[[], Iterable]], max_age: float = 86400
+    ):
+        self.loaders = loaders
+        self.max_age = max_age
+        self.indexes: Dict[str, MappingIndex] = {}
+        self.loaded_at: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def index(self, kind: str) -> MappingIndex:
+        with self.lock:
+            loaded_at = self.loaded_at.get(kind)
+            if loaded_at is None or time.monotonic() - loaded_at > self.max_age:
+                known = self.loaders[kind]()
+                if isinstance(known, KnownNames):
+                    index = MappingIndex(kind, known.names, known.hints)
+                else:
+                    index = MappingIndex(kind, known)
+                self.indexes[kind] = index
+                self.loaded_at[kind] = time.monotonic()
+            return self.indexes[kind]
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drop the cached mapping of `kind`, or of every kind."""
+        with self.lock:
+            for name in [kind] if kind else list(self.loaded_at):
+                self.loaded_at.pop(name, None)
+
+    def unknown(self, kind: str, values: Sequence) -> Dict[str, str]:
+        """Map each unknown value to an error message with suggestions."""
+        index = self.index(kind)
+        return {value: index.describe(value) for value in values if value not in index}
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+import requests
+
+from defillama_py.archive import ResponseArchive, endpoint_family
+from defillama_py.client import Llama
+
+
+def body(days):
+    return json.dumps({"tvl": [{"date": d, "totalLiquidityUSD": d} for d in days]})
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive.db"))
+    first = archive.add("TVL", "/protocol/aave", None, body(range(100)).encode(), 1.0)
+    second = archive.add("TVL", "/protocol/aave", None, body(range(100)).encode(), 2.0)
+    archive.add("TVL", "/protocol/aave", None, body(range(101)).encode(), 3.0)
+
+    stats = archive.stats()
+    assert first == second
+    assert stats["fetches"] == 3
+    assert stats["blobs"] == 2
+    assert stats["stored_bytes"] < stats["raw_bytes"] / 2
+    assert archive.get(first) == body(range(100)).encode()
+
+
+def test_near_duplicate_bodies_are_stored_as_deltas(tmp_path):
+    bodies = [body(range(day, day + 200)).encode() for day in range(10)]
+    whole = ResponseArchive(str(tmp_path / "whole.db"), max_delta_depth=0)
+    delta = ResponseArchive(str(tmp_path / "delta.db"), max_delta_depth=8)
+    for i, content in enumerate(bodies):
+        whole.add("TVL", "/protocol/aave", None, content, float(i))
+        delta.add("TVL", "/protocol/aave", None, content, float(i))
+    # A different endpoint doesn't serve as a base
+    delta.add("TVL", "/protocol/maker", None, body(range(500, 700)).encode(), 10.0)
+
+    assert delta.stats()["stored_bytes"] < whole.stats()["stored_bytes"] / 2
+    depths = delta.connection.execute(
+        "SELECT depth FROM blobs ORDER BY rowid"
+    ).fetchall()
+    assert [depth for (depth,) in depths] == [0, 1, 2, 3, 4, 5, 6, 7, 8, 0, 0]
+    for entry, content in zip(delta.lookup("/protocol/aave"), bodies):
+        assert delta.get(entry.digest) == content
+
+    # Bodies are rebuilt from their bases after reopening
+    delta.close()
+    reopened = ResponseArchive(str(tmp_path / "delta.db"))
+    assert reopened.latest("/protocol/aave") == bodies[-1]
+
+
+def test_lookup_by_endpoint_params_and_time(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive.db"))
+    archive.add("VOLUMES", "/overview/dexs", {"dataType": "dailyVolume"}, b"[1]", 1.0)
+    archive.add("VOLUMES", "/overview/dexs", {"dataType": "totalVolume"}, b"[2]", 2.0)
+    archive.add("VOLUMES", "/overview/dexs", {"dataType": "dailyVolume"}, b"[3]", 3.0)
+
+    entries = archive.lookup("/overview/dexs", {"dataType": "dailyVolume"})
+    assert [entry.fetched_at for entry in entries] == [1.0, 3.0]
+    assert len(archive.lookup(since=2.0)) == 2
+    assert archive.latest("/overview/dexs", {"dataType": "dailyVolume"}) == b"[3]"
+    assert archive.latest("/overview/options") is None
+
+    archive.add("COINS", "/chart/x", None, b"[4]", 4.0)
+    archive.add("STABLECOINS", "/chart/x", None, b"[5]", 5.0)
+    assert archive.latest("/chart/x", api_tag="COINS") == b"[4]"
+
+
+def test_zstd_dictionary_is_trained_per_family(tmp_path):
+    pytest.importorskip("zstandard")
+    archive = ResponseArchive(str(tmp_path / "archive.db"), train_after=8)
+    bodies = [body(range(i, i + 200)).encode() for i in range(12)]
+    for i, content in enumerate(bodies):
+        archive.add("TVL", f"/protocol/p{i}", None, content, float(i))
+
+    assert "TVL:protocol" in archive.dictionaries
+    rows = archive.connection.execute(
+        "SELECT codec, dictionary FROM blobs ORDER BY rowid"
+    ).fetchall()
+    assert {codec for codec, _ in rows} == {"zstd"}
+    assert [d is not None for _, d in rows] == [False] * 8 + [True] * 4
+    for entry, content in zip(archive.lookup(), bodies):
+        assert archive.get(entry.digest) == content
+
+    # Dictionaries are reloaded from the database
+    archive.close()
+    reopened = ResponseArchive(str(tmp_path / "archive.db"))
+    assert reopened.get(reopened.lookup()[-1].digest) == bodies[-1]
+
+
+def test_endpoint_family():
+    assert endpoint_family("TVL", "/protocol/aave") == "TVL:protocol"
+    assert endpoint_family("TVL", "/v2/historicalChainTvl/Ethereum") == (
+        "TVL:historicalChainTvl"
+    )
+
+
+def test_client_archives_successful_responses(tmp_path, monkeypatch):
+    archive = ResponseArchive(str(tmp_path / "archive.db"))
+    obj = Llama(archive=archive)
+
+    def fake_request(method, url, timeout=None, params=None):
+        response = requests.Response()
+        response._content = b'[{"chainId": 1, "name": "Ethereum"}]'
+        response.status_code = 200
+        response.url = url
+        return response
+
+    monkeypatch.setattr(obj.session, "request", fake_request)
+    obj.get_chains()
+
+    (entry,) = archive.lookup("/v2/chains")
+    assert archive.get(entry.digest) == b'[{"chainId": 1, "name": "Ethereum"}]'
@@ -0,0 +1,88 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from defillama_py.backends import Backend, get_backend
+from defillama_py.client import Llama
+
+
+class RecordingBackend(Backend):
+    """Returns plain dicts, recording which builder was used."""
+
+    name = "records"
+
+    def __init__(self):
+        self.calls = []
+
+    def from_columns(self, columns):
+        self.calls.append("columns")
+        return {name: list(values) for name, values in columns.items()}
+
+    def from_pandas(self, df):
+        self.calls.append("pandas")
+        return df.to_dict("list")
+
+
+def test_series_skip_pandas_and_other_methods_convert(monkeypatch):
+    backend = RecordingBackend()
+    obj = Llama(backend=backend)
+    responses = {
+        "/overview/dexs/ethereum": {"totalDataChart": [[0, 1.5]]},
+        "/v2/chains": [{"name": "Ethereum", "tvl": 10}],
+    }
+    monkeypatch.setattr(
+        obj, "_get", lambda api_tag, endpoint, params=None: responses[endpoint]
+    )
+
+    volume = obj.get_chain_dex_volume("ethereum", raw=False)
+    assert volume["chain"] == ["ethereum"] and volume["volume"] == [1.5]
+    assert obj.get_all_chains_current_tvl(raw=False) == {
+        "chain": ["ethereum"],
+        "tvl": [10],
+    }
+    assert backend.calls == ["columns", "pandas"]
+
+
+BACKENDS = [("arrow", "pyarrow"), ("polars", "polars")]
+SUMMARY = {
+    "totalDataChartBreakdown": [
+        [1690000000, {"Ethereum": {"v2": 1, "v3": 2}}],
+        [1690086400, {"Base": {"v3": 4}}],
+    ]
+}
+
+
+@pytest.mark.parametrize("name, module", BACKENDS)
+def test_optional_backends_build_series_results(name, module, monkeypatch):
+    pytest.importorskip(module)
+    obj = Llama(backend=name)
+    monkeypatch.setattr(obj, "_get", lambda api_tag, endpoint, params=None: SUMMARY)
+
+    frame = obj.get_protocol_dex_volume(
+        ["uniswap", "curve"], raw=False, params={"excludeTotalDataChart": True}
+    )
+
+    df = obj.backend.to_pandas(frame)
+    assert df["date"].dt.strftime("%Y-%m-%d").tolist()[:3] == [
+        "2023-07-22",
+        "2023-07-22",
+        "2023-07-23",
+    ]
+    assert df["protocol"].astype(str).tolist() == ["uniswap"] * 3 + ["curve"] * 3
+    assert df["chain"].astype(str).tolist()[:3] == ["ethereum", "ethereum", "base"]
+    assert df["volume"].tolist() == [1.0, 2.0, 4.0] * 2
+    assert isinstance(df["chain"].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize("name, module", BACKENDS)
+def test_missing_backend_names_the_package(name, module, monkeypatch):
+    monkeypatch.setitem(sys.modules, module, None)
+    with pytest.raises(ImportError, match=f"pip install {module}"):
+        get_backend(name)
+
+
+def test_unknown_backend():
+    assert isinstance(get_backend(), Backend)
+    with pytest.raises(ValueError, match="backend must be"):
+        get_backend("numpy")
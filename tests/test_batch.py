@@ -0,0 +1,49 @@
+import pytest
+
+from defillama_py.batch import CONNECTION, NO_DATA, BatchResult
+from defillama_py.client import Llama
+
+RESPONSES = {
+    "/summary/dexs/uniswap": {"totalDataChart": [[1690000000, 10]]},
+    "/summary/dexs/curve": {"totalDataChart": [[1690000000, 5]]},
+    "/summary/dexs/aave": {},
+}
+
+
+@pytest.fixture(params=[1, 4])
+def obj(request, monkeypatch):
+    obj = Llama(max_workers=request.param)
+
+    def fake_get(api_tag, endpoint, params=None):
+        if endpoint not in RESPONSES:
+            raise ConnectionError(f"404 for {endpoint}")
+        return RESPONSES[endpoint]
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    return obj
+
+
+def test_collect_keeps_successful_entities(obj):
+    protocols = ["uniswap", "aave", "typo", "curve"]
+    result = obj.get_protocol_dex_volume(protocols, raw=False, errors="collect")
+
+    assert isinstance(result, BatchResult)
+    assert result.data["protocol"].tolist() == ["uniswap", "curve"]
+    assert result.errors["aave"].kind == NO_DATA
+    assert result.errors["typo"].kind == CONNECTION
+    assert not result.ok
+
+
+def test_collect_raw(obj):
+    result = obj.get_protocol_dex_volume(["uniswap", "aave"], errors="collect")
+
+    assert list(result.data) == ["uniswap"]
+    assert list(result.errors) == ["aave"]
+
+
+def test_raise_is_default(obj):
+    with pytest.raises(ValueError, match="No data available for dex protocol: aave"):
+        obj.get_protocol_dex_volume(["uniswap", "aave"], raw=False)
+
+    with pytest.raises(ValueError, match="errors must be one of"):
+        obj.get_protocol_dex_volume("uniswap", errors="ignore")
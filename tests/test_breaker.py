@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from defillama_py.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LastGoodCache,
+)
+from defillama_py.client import Llama
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(min_requests=4, open_seconds=0.0)
+    for ok in (True, False, False, True):
+        breaker.before()
+        breaker.record(ok)
+    assert breaker.state == OPEN
+
+    breaker.before()  # open period over: one probe is let through
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(ConnectionError):
+        breaker.before()
+
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_fails_fast_or_serves_last_good_response(monkeypatch):
+    obj = Llama(circuit_breaker=True)
+    sent = []
+
+    def fake_request(method, url, timeout=None, params=None):
+        sent.append(url)
+        response = requests.Response()
+        response.url = url
+        if len(sent) == 1:
+            response._content = b'{"bridges": []}'
+            response.status_code = 200
+        else:
+            response._content = b""
+            response.status_code = 503
+        return response
+
+    monkeypatch.setattr(obj.session, "request", fake_request)
+
+    assert obj.get_all_bridge_volume() == {"bridges": []}
+    for _ in range(5):
+        with pytest.raises(ConnectionError):
+            obj._get("BRIDGES", "/bridge/1")
+    assert obj.circuit_states() == {"https://bridges.llama.fi": OPEN}
+    attempts = len(sent)
+
+    # Served from the last good response without touching the network
+    with pytest.warns(RuntimeWarning, match="is open, serving the last successful"):
+        assert obj.get_all_bridge_volume() == {"bridges": []}
+    with pytest.raises(ConnectionError, match="is open"):
+        obj._get("BRIDGES", "/bridge/2")
+    assert len(sent) == attempts
+
+
+def test_last_good_cache_keeps_bodies_within_max_bytes():
+    cache = LastGoodCache(max_bytes=10)
+
+    def response(content):
+        response = requests.Response()
+        response._content = content
+        response.status_code = 200
+        response.url = "https://api.llama.fi/chains"
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    cache.put("a", response(b"12345"))
+    cache.put("b", response(b"6789"))
+    cache.get("a")
+    cache.put("c", response(b"abc"))
+    assert list(cache.entries) == ["a", "c"] and cache.size == 8
+
+    cache.put("big", response(b"x" * 11))
+    assert "big" not in cache.entries
+
+    cached = cache.get("a")
+    assert cached.json() == 12345
+    assert cached.headers["content-type"] == "application/json"
+    assert cached is not cache.get("a")
@@ -0,0 +1,100 @@
+import datetime
+import json
+import time
+import zipfile
+
+import pytest
+import requests
+
+from defillama_py.cassette import Cassette
+from defillama_py.client import Llama
+
+PROTOCOLS = [{"id": "1", "name": "Aave", "slug": "aave"}]
+
+
+def make_response(url, body, status=200):
+    response = requests.Response()
+    response._content = json.dumps(body).encode()
+    response.status_code = status
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response.elapsed = datetime.timedelta(seconds=0.05)
+    return response
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.zip")
+    obj = Llama(cassette=Cassette(path, mode="record"))
+
+    def fake_request(method, url, timeout=None, params=None):
+        if url.endswith("/protocols"):
+            return make_response(url, PROTOCOLS)
+        return make_response(url, {"message": "not found"}, status=404)
+
+    monkeypatch.setattr(obj.session, "request", fake_request)
+    return obj, path
+
+
+def test_replay_serves_recorded_responses(recording, monkeypatch):
+    obj, path = recording
+    expected = obj.get_protocols()
+    with pytest.raises(ConnectionError):
+        obj.get_protocol_historical_tvl("missing")
+    obj.cassette.close()
+
+    with Cassette(path) as cassette:
+        replay = Llama(cassette=cassette)
+        monkeypatch.setattr(replay.session, "request", None)  # no network access
+
+        assert len(cassette) == 2
+        assert ("TVL", "/protocols") in cassette
+        assert replay.get_protocols() == expected
+        # Recorded error statuses are raised again
+        with pytest.raises(ConnectionError, match="404"):
+            replay.get_protocol_historical_tvl("missing")
+        # Unrecorded requests fail like a connection error
+        with pytest.raises(ConnectionError, match="No recorded response"):
+            replay.get_chains()
+
+
+def test_replay_keys_ignore_param_order(tmp_path):
+    path = str(tmp_path / "cassette.zip")
+    with Cassette(path, mode="record") as cassette:
+        response = make_response("https://api.llama.fi/x", {"a": 1})
+        cassette.record("TVL", "/x", {"a": 1, "b": 2}, response)
+
+    with Cassette(path) as replay:
+        assert replay.play("TVL", "/x", {"b": 2, "a": 1}).json() == {"a": 1}
+
+
+def test_replay_simulates_latency(tmp_path):
+    path = str(tmp_path / "cassette.zip")
+    with Cassette(path, mode="record") as cassette:
+        cassette.record("TVL", "/x", None, make_response("https://api.llama.fi/x", {}))
+
+    with Cassette(path, latency="recorded") as replay:
+        start = time.perf_counter()
+        replay.play("TVL", "/x")
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_recording_keeps_one_archive_open(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.zip")
+    opened = []
+    zip_file = zipfile.ZipFile
+
+    def counting_zip_file(*args, **kwargs):
+        opened.append(args)
+        return zip_file(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "ZipFile", counting_zip_file)
+    with Cassette(path, mode="record") as cassette:
+        for i in range(20):
+            url = f"https://api.llama.fi/x/{i}"
+            cassette.record("TVL", f"/x/{i}", None, make_response(url, {"i": i}))
+    assert len(opened) == 1
+
+    with Cassette(path) as replay:
+        assert len(replay) == 20
+        assert replay.play("TVL", "/x/7").json() == {"i": 7}
@@ -1,7 +1,18 @@
+import os
+
+from defillama_py.cassette import Cassette
 from defillama_py.client import Llama
 
-# create a DefiLlama instance
-obj = Llama()
+# create a DefiLlama instance. Set DEFILLAMA_CASSETTE to a cassette file to run
+# offline (or DEFILLAMA_CASSETTE_MODE=record to record one from the live API)
+CASSETTE = os.environ.get("DEFILLAMA_CASSETTE")
+obj = Llama(
+    cassette=Cassette(
+        CASSETTE, mode=os.environ.get("DEFILLAMA_CASSETTE_MODE", "replay")
+    )
+    if CASSETTE
+    else None
+)
 
 # Global test parameters
 RAW_VALUES = [True, False]
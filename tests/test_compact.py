@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from defillama_py.client import Llama
+from defillama_py.compact import compact_floats, compact_frame
+
+
+def test_compact_frame_dtypes():
+    df = pd.DataFrame(
+        {
+            "date": ["1681084800", "1681171200", "1681257600", "1681344000"],
+            "timestamp": ["2023-05-01T12:00:00.000Z"] * 4,
+            "chain": ["ethereum", "ethereum", "arbitrum", "ethereum"],
+            "tx_hash": ["0x1", "0x2", "0x3", "0x4"],
+            "depositTxs": [1.0, 2.0, None, 4.0],
+            "usd": [1.5, 2.25, 1e9, 3.0],
+        }
+    )
+    compact = compact_frame(df)
+
+    assert compact["date"].dtype == "datetime64[s]"
+    assert compact["date"].iloc[0] == pd.Timestamp("2023-04-10")
+    assert compact["timestamp"].iloc[0] == pd.Timestamp("2023-05-01 12:00")
+    assert isinstance(compact["chain"].dtype, pd.CategoricalDtype)
+    assert not isinstance(compact["tx_hash"].dtype, pd.CategoricalDtype)
+    assert compact["depositTxs"].dtype == "Int32"
+    assert compact["depositTxs"].isna().tolist() == [False, False, True, False]
+    assert compact["usd"].dtype == np.float32
+
+
+def test_compact_floats_keeps_float64_beyond_range_or_tolerance():
+    assert compact_floats(np.array([1.0, 1e300])).dtype == np.float64
+    assert compact_floats(np.array([1.0, np.nan])).dtype == np.float32
+
+    tvl = np.array([1e10 + 123.0, np.nan])
+    assert compact_floats(tvl).dtype == np.float32
+    assert compact_floats(tvl, atol=0.01).dtype == np.float64
+    assert compact_floats(np.array([0.5, 1e4, np.nan]), atol=0.01).dtype == (np.float32)
+
+
+def test_compact_is_opt_in(monkeypatch):
+    responses = {"/overview/dexs/ethereum": {"totalDataChart": [[0, 1.5]]}}
+    frames = []
+    for compact in (False, True):
+        obj = Llama(compact=compact)
+        monkeypatch.setattr(
+            obj, "_get", lambda api_tag, endpoint, params=None: responses[endpoint]
+        )
+        frames.append(obj.get_chain_dex_volume("ethereum", raw=False))
+
+    assert frames[0]["volume"].dtype == np.float64
+    assert frames[1]["volume"].dtype == np.float32
+    assert frames[1]["date"].dtype == "datetime64[s]"
+
+    obj = Llama(compact=True, compact_atol=0.01)
+    monkeypatch.setattr(
+        obj,
+        "_get",
+        lambda api_tag, endpoint, params=None: {"totalDataChart": [[0, 1e10 + 0.37]]},
+    )
+    assert obj.get_chain_dex_volume("ethereum", raw=False)["volume"].dtype == np.float64
+
+
+def test_bridge_volume_transaction_counts_become_integers(monkeypatch):
+    periods = ["lastHourly", "currentDay", "prevDay", "dayBeforeLast", "weekly"]
+    chain = {f"{period}Volume": 1.5 for period in periods + ["lastDaily", "monthly"]}
+    chain.update(
+        {
+            f"{period}Txs": {"deposits": 3, "withdrawals": 2**24 + 1}
+            for period in periods + ["monthly"]
+        }
+    )
+    missing = dict(chain, lastHourlyTxs={"deposits": None, "withdrawals": 5})
+    response = {
+        "id": 1,
+        "displayName": "Bridge",
+        "chainBreakdown": {"Ethereum": chain, "Arbitrum": missing},
+    }
+    obj = Llama(compact=True)
+    monkeypatch.setattr(obj, "_get", lambda api_tag, endpoint, params=None: response)
+
+    df = obj.get_bridge_volume([1], raw=False)
+
+    assert df["lastHourlyTxs_deposits"].dtype == "Int32"
+    assert df["lastHourlyTxs_deposits"].isna().tolist() == [False, True]
+    assert df["monthlyTxs_withdrawals"].tolist() == [2**24 + 1] * 2
+    assert df["weeklyVolume"].dtype == np.float32
+    assert compact_frame(pd.DataFrame({"tx_block": [17000000]}))["tx_block"].dtype == (
+        np.int64
+    )
@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+
+import pytest
+
+from defillama_py.concurrency import AIMDLimit, ConcurrencyController
+
+
+def test_limit_grows_while_healthy_and_halves_on_congestion():
+    limit = AIMDLimit(initial=4, max_limit=16)
+    for _ in range(100):
+        limit.acquire()
+        limit.release(time.monotonic() - 0.01, congested=False)
+    assert 8 < limit.limit <= 16
+
+    grown = limit.limit
+    with limit.slot() as slot:
+        slot.status = 429
+    assert limit.limit == pytest.approx(grown / 2)
+
+
+def test_limit_recovers_after_a_fast_outlier():
+    limit = AIMDLimit(initial=8, max_limit=64)
+    limit.acquire()
+    limit.release(time.monotonic() - 0.01, congested=False)
+    for _ in range(200):
+        limit.acquire()
+        limit.release(time.monotonic() - 0.03, congested=False)
+
+    assert limit.baseline() == pytest.approx(0.03, abs=0.005)
+    assert limit.limit > 8
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(limit, clock, latencies):
+    for latency in latencies:
+        clock.now += 0.01
+        limit.acquire()
+        limit.release(clock.now - latency, congested=False)
+
+
+@pytest.mark.parametrize("sigma", [0.2, 0.5, 1.0])
+def test_limit_does_not_collapse_on_healthy_latency_spread(sigma):
+    clock = FakeClock()
+    limit = AIMDLimit(initial=8, max_limit=64, clock=clock)
+    rng = random.Random(0)
+    run(limit, clock, [0.1 * rng.lognormvariate(0, sigma) for _ in range(3000)])
+
+    assert limit.limit > 40
+
+
+def test_sustained_slowdown_cuts_the_limit():
+    clock = FakeClock()
+    limit = AIMDLimit(initial=16, max_limit=64, clock=clock)
+    run(limit, clock, [0.1] * 100)
+    grown = limit.limit
+
+    run(limit, clock, [0.3] * 15)
+    assert limit.limit < grown / 2 + 1
+
+
+def test_baseline_is_kept_per_endpoint_family():
+    limit = AIMDLimit(initial=8)
+    for _ in range(20):
+        limit.acquire()
+        limit.release(time.monotonic() - 0.01, congested=False, key="/tvl/*")
+    grown = limit.limit
+    limit.acquire()
+    limit.release(time.monotonic() - 0.5, congested=False, key="/protocols")
+
+    assert limit.limit > grown
+    assert limit.baseline("/protocols") == pytest.approx(0.5, abs=0.05)
+
+
+def test_burst_of_failures_cuts_the_limit_once():
+    limit = AIMDLimit(initial=8)
+    started = [limit.acquire() for _ in range(4)]
+    for start in started:
+        limit.release(start, congested=True)
+    assert limit.limit == 4
+
+
+def test_exceptions_count_as_congestion_and_limit_gates_requests():
+    limit = AIMDLimit(initial=2, min_limit=1)
+    with pytest.raises(TimeoutError):
+        with limit.slot():
+            raise TimeoutError
+    assert limit.limit == 1
+
+    limit.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (limit.acquire(), acquired.set()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    limit.release(time.monotonic(), congested=False)
+    waiter.join(1)
+    assert acquired.is_set()
+
+
+def test_controller_reports_limits_per_host():
+    controller = ConcurrencyController(initial=4)
+    with controller.limiter("https://bridges.llama.fi").slot() as slot:
+        slot.status = 503
+
+    assert controller.limits() == {"https://bridges.llama.fi": 2.0}
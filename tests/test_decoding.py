@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from defillama_py.decoding import get_decoder
+
+
+def test_auto_decoder_parses_bytes():
+    body = json.dumps({"tvl": [[1, 2.5]], "name": "Aave"}).encode()
+
+    assert get_decoder()(body) == {"tvl": [[1, 2.5]], "name": "Aave"}
+
+
+def test_standard_library_and_custom_decoders():
+    assert get_decoder("json") is json.loads
+
+    def custom(body):
+        return body
+
+    assert get_decoder(custom) is custom
+
+
+def test_unknown_decoder():
+    with pytest.raises(ValueError, match="decoder must be"):
+        get_decoder("simdjson")
+
+
+def test_client_decodes_with_configured_decoder(monkeypatch):
+    import requests
+
+    from defillama_py.client import Llama
+
+    response = requests.Response()
+    response._content = b'{"a": 1}'
+    response.status_code = 200
+    response.url = "https://api.llama.fi/protocols"
+
+    obj = Llama(json_decoder=lambda body: ("decoded", body))
+    monkeypatch.setattr(obj, "_request", lambda *args, **kwargs: response)
+
+    assert obj._get("TVL", "/protocols") == ("decoded", b'{"a": 1}')
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from defillama_py.hedging import Hedger, latency_key
+
+
+def test_latency_key_groups_entities():
+    assert latency_key("/protocol/aave") == "/protocol/*"
+    assert latency_key("/summary/fees/aave") == "/summary/fees/*"
+    assert latency_key("/protocols") == "/protocols"
+    assert latency_key("/overview/dexs") == "/overview/dexs"
+    assert latency_key("/overview/dexs/ethereum") == "/overview/dexs/*"
+    assert latency_key("/bridgedaystats/1700000000/ethereum") == "/bridgedaystats/*"
+
+
+def test_latency_key_keeps_unrelated_routes_apart():
+    assert latency_key("/v2/chains") == "/v2/chains"
+    assert latency_key("/v2/historicalChainTvl/x") == "/v2/historicalChainTvl/*"
+    assert latency_key("/v2/historicalChainTvl") == "/v2/historicalChainTvl"
+
+
+def test_slow_request_is_hedged_and_first_response_wins():
+    hedger = Hedger(min_samples=5, max_ratio=1.0)
+    for _ in range(5):
+        hedger.record("/protocol", 0.01)
+
+    calls = []
+    lock = threading.Lock()
+
+    def attempt():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        time.sleep(1.0 if first else 0.01)
+        return "slow" if first else "fast"
+
+    start = time.monotonic()
+    assert hedger.run("/protocol", attempt) == "fast"
+    assert time.monotonic() - start < 0.5
+
+    stats = hedger.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    hedger.shutdown()
+
+
+def test_hedges_are_capped_by_budget():
+    hedger = Hedger(min_samples=1, max_ratio=0.0)
+    hedger.record("/protocol", 0.0)
+    hedger.tokens = 0
+
+    assert hedger.run("/protocol", lambda: time.sleep(0.05) or "only") == "only"
+    assert hedger.stats()["hedged"] == 0
+    hedger.shutdown()
+
+
+def test_errors_are_raised_when_every_attempt_fails():
+    hedger = Hedger(min_samples=1, max_ratio=1.0)
+    hedger.record("/protocol", 0.0)
+
+    def attempt():
+        time.sleep(0.01)
+        raise TimeoutError("slow host")
+
+    with pytest.raises(TimeoutError):
+        hedger.run("/protocol", attempt)
+    hedger.shutdown()
@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+import pytest
+
+from defillama_py.client import Llama
+from defillama_py.matrix import DAY, TVLMatrix
+
+TODAY = int(time.time()) // DAY * DAY
+START = TODAY - 3 * DAY
+
+
+def test_matrix_grows_in_days_and_chains_without_losing_data(tmp_path):
+    path = str(tmp_path / "tvl.f64")
+    matrix = TVLMatrix.create(path, START, ["Ethereum"])
+    matrix.extend(START + DAY)
+    matrix.set_series("Ethereum", [START, START + DAY], [1.0, 2.0])
+
+    matrix.add_chains([f"chain{i}" for i in range(70)])
+    matrix.set_day(START + 2 * DAY, {"Ethereum": 3.0, "chain69": 9.0})
+
+    reader = TVLMatrix(path)
+    assert reader.capacity == 128
+    assert reader.values.shape == (3, 71)
+    assert reader.column("Ethereum").tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(reader.column("chain69").iloc[:2]).all()
+    assert reader.to_frame().loc[:, "chain69"].iloc[-1] == 9.0
+    assert not reader.values.flags.writeable
+    with pytest.raises(ValueError, match="read-only"):
+        reader.add_chains(["Base"])
+
+
+def test_reader_between_data_rewrite_and_index_write(tmp_path, monkeypatch):
+    path = str(tmp_path / "tvl.f64")
+    matrix = TVLMatrix.create(path, START, ["Ethereum"])
+    matrix.set_day(START + DAY, {"Ethereum": 2.0})
+
+    # The data file is rewritten with 128 columns, the index isn't updated yet
+    monkeypatch.setattr(matrix, "_save_meta", lambda: None)
+    matrix.add_chains([f"chain{i}" for i in range(70)])
+
+    reader = TVLMatrix(path)
+    assert reader.capacity == 128
+    assert reader.chains == ["Ethereum"]
+    assert reader.column("Ethereum").iloc[-1] == 2.0
+
+
+def test_client_backfills_new_chains_and_appends_today(tmp_path, monkeypatch):
+    obj = Llama(max_workers=4)
+    calls = []
+    history = {
+        "Ethereum": [{"date": START, "tvl": 10}, {"date": START + DAY, "tvl": 11}],
+        "Arbitrum": [{"date": START + DAY, "tvl": 5}],
+    }
+    current = [{"name": "Ethereum", "tvl": 14}, {"name": "Arbitrum", "tvl": 7}]
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(endpoint)
+        if endpoint == "/v2/chains":
+            return current
+        return history[endpoint.rsplit("/", 1)[1]]
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    path = str(tmp_path / "tvl.f64")
+
+    matrix = obj.get_chain_tvl_matrix(path, ["Ethereum"], start=START)
+    assert matrix.column("Ethereum").tolist()[:2] == [10, 11]
+    assert matrix.column("Ethereum").iloc[-1] == 14
+
+    calls.clear()
+    current[0]["tvl"] = 15
+    matrix = obj.get_chain_tvl_matrix(path)
+    assert sorted(calls) == ["/v2/chains", "/v2/historicalChainTvl/Arbitrum"]
+    assert matrix.chains == ["Ethereum", "Arbitrum"]
+    assert matrix.values[-1].tolist() == [15, 7]
+    assert TVLMatrix(path).column("Arbitrum").iloc[1] == 5
+
+
+def test_client_replaces_yesterdays_intraday_row_with_the_close(tmp_path, monkeypatch):
+    obj = Llama()
+    calls = []
+    history = [{"date": START, "tvl": 10}]
+    current = [{"name": "Ethereum", "tvl": 12}]
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(endpoint)
+        return current if endpoint == "/v2/chains" else history
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    monkeypatch.setattr("defillama_py.client.time.time", lambda: START + DAY + 600)
+    path = str(tmp_path / "tvl.f64")
+    obj.get_chain_tvl_matrix(path, start=START)
+
+    # Later the same day only the provisional row is updated
+    calls.clear()
+    current[0]["tvl"] = 13
+    matrix = obj.get_chain_tvl_matrix(path)
+    assert calls == ["/v2/chains"]
+    assert matrix.column("Ethereum").tolist() == [10, 13]
+
+    # The next day the history holds the close of the previous one
+    calls.clear()
+    history.append({"date": START + DAY, "tvl": 11})
+    current[0]["tvl"] = 14
+    monkeypatch.setattr("defillama_py.client.time.time", lambda: START + 2 * DAY + 600)
+    matrix = obj.get_chain_tvl_matrix(path)
+    assert sorted(calls) == ["/v2/chains", "/v2/historicalChainTvl/Ethereum"]
+    assert matrix.column("Ethereum").tolist() == [10, 11, 14]
@@ -0,0 +1,144 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from defillama_py import parallel
+from defillama_py.client import CHAIN_DEX_VOLUME, Llama
+from defillama_py.parallel import export_frame, import_frames
+from defillama_py.timeseries import assemble
+
+DAY = 86400
+
+RESPONSES = {
+    "/overview/dexs/Ethereum": {
+        "totalDataChart": [[0, 10], [DAY, 12]],
+        "totalDataChartBreakdown": [[0, {"uniswap": 7, "curve": 3}]],
+    },
+    "/overview/dexs/BSC": {
+        "totalDataChart": [[0, 4]],
+        "totalDataChartBreakdown": [[0, {"pancakeswap": 4}], [DAY, {"uniswap": 1}]],
+    },
+    "/overview/dexs/Empty": {"totalDataChart": None},
+}
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = body
+
+
+@pytest.fixture
+def obj(monkeypatch):
+    obj = Llama(max_workers=2, transform_processes=2)
+
+    def fake_request(api_tag, endpoint, params=None):
+        if endpoint not in RESPONSES:
+            raise ConnectionError(f"404 for {endpoint}")
+        return FakeResponse(json.dumps(RESPONSES[endpoint]).encode())
+
+    monkeypatch.setattr(obj, "_request", fake_request)
+    with obj:
+        yield obj
+
+
+def expected(entities, params=None):
+    responses = {e: RESPONSES[f"/overview/dexs/{e}"] for e in entities}
+    return assemble(CHAIN_DEX_VOLUME, responses, params)
+
+
+@pytest.mark.parametrize("params", [None, {"excludeTotalDataChart": True}])
+def test_process_pool_matches_in_process_transform(obj, params):
+    df = obj.get_chain_dex_volume(["Ethereum", "BSC"], raw=False, params=params)
+
+    pd.testing.assert_frame_equal(df, expected(["Ethereum", "BSC"], params))
+
+
+def test_process_pool_collects_errors(obj):
+    result = obj.get_chain_dex_volume(
+        ["Ethereum", "Empty", "Missing"], raw=False, errors="collect"
+    )
+
+    pd.testing.assert_frame_equal(result.data, expected(["Ethereum"]))
+    assert result.errors["Empty"].kind == "no_data"
+    assert result.errors["Missing"].kind == "connection"
+
+
+def test_process_pool_raises_first_error(obj):
+    with pytest.raises(ValueError, match="No data available"):
+        obj.get_chain_dex_volume(["Ethereum", "Empty"], raw=False)
+
+
+def test_shared_memory_round_trip_merges_categories():
+    first = expected(["Ethereum"], {"excludeTotalDataChart": True})
+    second = expected(["BSC"], {"excludeTotalDataChart": True})
+
+    df = import_frames([export_frame(first), export_frame(second)])
+
+    both = expected(["Ethereum", "BSC"], {"excludeTotalDataChart": True})
+    pd.testing.assert_frame_equal(df, both)
+
+
+def assert_unlinked(blocks):
+    for block in blocks:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=block.shm_name)
+
+
+def test_export_frame_unlinks_written_blocks_on_failure(monkeypatch):
+    created = []
+    export_array = parallel._export_array
+
+    def failing_export(array):
+        if created:
+            raise MemoryError("no space left")
+        created.append(parallel.ColumnBlock("date", export_array(array), "<i8", 1))
+        return created[-1].shm_name
+
+    monkeypatch.setattr(parallel, "_export_array", failing_export)
+    with pytest.raises(MemoryError):
+        export_frame(expected(["Ethereum"]))
+    assert_unlinked(created)
+
+
+def test_process_pool_releases_blocks_on_unexpected_errors(obj, monkeypatch):
+    submitted = []
+    submit = obj.transform_pool.submit
+
+    def failing_submit(endpoint, entity, *args):
+        if entity == "BSC":
+            future = Future()
+            future.set_exception(RuntimeError("worker died"))
+        else:
+            future = submit(endpoint, entity, *args)
+        submitted.append(future)
+        return future
+
+    monkeypatch.setattr(obj.transform_pool, "submit", failing_submit)
+    with pytest.raises(RuntimeError, match="worker died"):
+        obj.get_chain_dex_volume(["Ethereum", "BSC"], raw=False, errors="collect")
+
+    ethereum = next(future for future in submitted if future.exception() is None)
+    assert_unlinked(ethereum.result()[1])
+
+
+def test_pool_is_started_once_from_concurrent_submits(monkeypatch):
+    started = []
+    executor = parallel.ProcessPoolExecutor
+
+    def counting_executor(*args, **kwargs):
+        started.append(kwargs["mp_context"].get_start_method())
+        return executor(*args, **kwargs)
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", counting_executor)
+    pool = parallel.TransformPool(1)
+    body = json.dumps(RESPONSES["/overview/dexs/Empty"]).encode()
+    args = (CHAIN_DEX_VOLUME, "Empty", body, None, json.loads)
+    with ThreadPoolExecutor(8) as threads:
+        futures = list(threads.map(lambda _: pool.submit(*args), range(16)))
+    assert [future.result() for future in futures] == [(False, [])] * 16
+    pool.shutdown()
+
+    assert len(started) == 1 and started[0] != "fork"
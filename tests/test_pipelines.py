@@ -0,0 +1,99 @@
+import pytest
+
+from defillama_py.client import PROTOCOL_METRICS, Llama
+
+DAY = 86400
+START = 1690000000 - 1690000000 % DAY
+
+RESPONSES = {
+    "/protocol/aave": {
+        "tvl": [
+            {"date": START, "totalLiquidityUSD": 100},
+            {"date": START + DAY, "totalLiquidityUSD": 110},
+            {"date": START + DAY + 3600, "totalLiquidityUSD": 115},
+        ]
+    },
+    "/summary/fees/aave": {"totalDataChart": [[START + DAY, 5]]},
+    "/protocol/uniswap": {"tvl": [{"date": START, "totalLiquidityUSD": 50}]},
+    "/summary/dexs/uniswap": {"totalDataChart": [[START, 1000], [START + DAY, 900]]},
+    "/summary/fees/uniswap": {"totalDataChart": [[START, 3]]},
+}
+
+
+@pytest.fixture
+def obj(monkeypatch):
+    obj = Llama(max_workers=4)
+
+    def fake_get(api_tag, endpoint, params=None):
+        if endpoint == "/summary/fees/broken":
+            raise ConnectionError(f"502 for {endpoint}")
+        return RESPONSES.get(endpoint, {})
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    return obj
+
+
+def test_get_protocol_metrics_aligns_on_daily_index(obj):
+    df = obj.get_protocol_metrics(["aave", "uniswap"])
+
+    assert list(df.columns) == ["date", "protocol", "tvl", "dex_volume", "fees"]
+    assert df["date"].dtype == "datetime64[s]"
+
+    aave = df[df["protocol"] == "aave"]
+    assert aave["tvl"].tolist() == [100.0, 115.0]
+    assert aave["dex_volume"].isna().all()
+    assert aave["fees"].fillna(0).tolist() == [0.0, 5.0]
+
+    uniswap = df[df["protocol"] == "uniswap"]
+    assert uniswap["dex_volume"].tolist() == [1000.0, 900.0]
+
+
+def test_get_protocol_metrics_does_not_hide_failed_requests(obj):
+    with pytest.raises(ConnectionError, match="502"):
+        obj.get_protocol_metrics(["aave", "broken"])
+
+    result = obj.get_protocol_metrics(["aave", "broken"], errors="collect")
+    assert list(result.errors) == [("broken", "fees")]
+    assert result.errors[("broken", "fees")].kind == "connection"
+    assert result.data[result.data["protocol"] == "aave"]["tvl"].notna().all()
+
+
+def test_get_protocol_metrics_rejects_unknown_metric(obj):
+    with pytest.raises(ValueError, match="Unknown metric"):
+        obj.get_protocol_metrics("aave", metrics=["tvl", "apy"])
+
+
+def test_protocol_current_tvl_uses_bulk_endpoint_above_threshold(monkeypatch):
+    obj = Llama(bulk_threshold=3)
+    calls = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(endpoint)
+        if endpoint == "/protocols":
+            return [{"slug": f"p{i}", "tvl": i} for i in range(5)]
+        return 42
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+
+    assert obj.get_protocol_current_tvl(["p1", "p2"]) == {"p1": 42.0, "p2": 42.0}
+    assert calls == ["/tvl/p1", "/tvl/p2"]
+
+    calls.clear()
+    df = obj.get_protocol_current_tvl(["p1", "p3", "other"], raw=False)
+    assert df.to_dict("records") == [
+        {"protocol": "p1", "tvl": 1.0},
+        {"protocol": "p3", "tvl": 3.0},
+        {"protocol": "other", "tvl": 42.0},
+    ]
+    assert calls == ["/protocols", "/tvl/other"]
+
+    # The bulk response is reused by later calls
+    calls.clear()
+    obj.get_protocol_current_tvl(["p0", "p1", "p4"])
+    assert calls == []
+
+
+@pytest.mark.parametrize("metric", ["dex_volume", "fees", "revenue"])
+def test_summary_metrics_skip_the_breakdown(metric):
+    # Only totalDataChart is read, so the per-chain breakdown isn't downloaded
+    assert PROTOCOL_METRICS[metric].params["excludeTotalDataChartBreakdown"] is True
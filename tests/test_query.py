@@ -0,0 +1,94 @@
+import pytest
+
+from defillama_py.client import Llama
+
+DAY = 86400
+
+RESPONSES = {
+    "/summary/dexs/uniswap": {
+        "totalDataChart": [[0, 12], [DAY, 13]],
+        "totalDataChartBreakdown": [
+            [0, {"ethereum": {"uniswap-v2": 1, "uniswap-v3": 2}, "base": {"v3": 9}}],
+            [DAY, {"ethereum": {"uniswap-v3": 4}, "base": {"v3": 9}}],
+        ],
+    },
+    "/overview/dexs/ethereum": {"totalDataChart": [[0, 10], [DAY, 20]]},
+    "/overview/dexs": {
+        "totalDataChartBreakdown": [
+            [0, {"Uniswap": 1, "Curve": 2}],
+            [DAY, {"Curve": 5, "Uniswap": 3}],
+        ]
+    },
+}
+
+
+@pytest.fixture
+def obj(monkeypatch):
+    obj = Llama()
+    calls = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append((endpoint, params))
+        return RESPONSES[endpoint]
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    obj.calls = calls
+    return obj
+
+
+def test_nothing_runs_until_collect_and_filters_are_pushed_down(obj):
+    query = (
+        obj.query("dex_volume")
+        .protocols(["uniswap"])
+        .chains(["Ethereum"])
+        .since(DAY)
+        .columns(["date", "protocol", "volume"])
+    )
+    assert obj.calls == []
+
+    df = query.collect()
+    ((endpoint, params),) = obj.calls
+    assert endpoint == "/summary/dexs/uniswap"
+    assert params["excludeTotalDataChart"] is True
+    assert list(df.columns) == ["date", "protocol", "volume"]
+    assert df["volume"].tolist() == [4.0]
+
+
+def test_breakdown_dimensions_are_summed_when_left_out(obj):
+    df = (
+        obj.query("dex_volume")
+        .protocols("uniswap")
+        .chains("ethereum")
+        .columns(["date", "chain", "volume"])
+        .collect()
+    )
+    assert df["chain"].tolist() == ["ethereum", "ethereum"]
+    assert df["volume"].tolist() == [3.0, 4.0]
+
+
+def test_value_alone_is_summed_to_a_total(obj):
+    df = obj.query("dex_volume").protocols("uniswap").columns(["volume"]).collect()
+    assert list(df.columns) == ["volume"]
+    assert df["volume"].tolist() == [25.0]
+
+    df = obj.query("dex_volume").chains("ethereum").columns(["volume"]).collect()
+    assert df["volume"].tolist() == [30.0]
+
+
+def test_plan_requests_only_the_needed_part(obj):
+    chart = obj.query("dex_volume").chains("ethereum").until(DAY).collect()
+    assert obj.calls[-1] == (
+        "/overview/dexs/ethereum",
+        {"excludeTotalDataChart": False, "excludeTotalDataChartBreakdown": True},
+    )
+    assert chart["volume"].tolist() == [10.0]
+
+    by_protocol = obj.query("dex_volume").columns(["protocol", "volume"]).collect()
+    assert obj.calls[-1][0] == "/overview/dexs"
+    assert by_protocol["protocol"].tolist() == ["Uniswap", "Curve"]
+    assert by_protocol["volume"].tolist() == [4.0, 7.0]
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        obj.query("dex_volume").columns(["chain"]).plan()
+    with pytest.raises(ValueError, match="Unknown dataset"):
+        obj.query("lending")
@@ -0,0 +1,53 @@
+import pickle
+import sys
+
+import pytest
+
+from defillama_py.client import Llama
+from defillama_py.records import BridgeTransaction, Chain, Pool, Protocol
+
+
+POOLS_RESPONSE = {
+    "data": [
+        {
+            "pool": "747c1d2a-c668-4682-b9f9-296708a3dd90",
+            "chain": "Ethereum",
+            "project": "lido",
+            "symbol": "STETH",
+            "tvlUsd": 1.0,
+        }
+    ]
+}
+
+
+def test_get_pools_typed(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: POOLS_RESPONSE)
+
+    pools = obj.get_pools(typed=True)
+
+    assert pools == [
+        Pool("747c1d2a-c668-4682-b9f9-296708a3dd90", "Ethereum", "lido", "STETH")
+    ]
+    assert pools[0].project == "lido"
+    assert pools[0].to_dict() == obj.get_pools()[0]
+
+
+def test_records_have_no_instance_dict():
+    chain = Chain(chain_id=1, name="Ethereum")
+
+    assert not hasattr(chain, "__dict__")
+    assert sys.getsizeof(chain) < sys.getsizeof(chain.to_dict())
+    with pytest.raises(AttributeError):
+        chain.tvl = 1
+
+
+def test_record_round_trips():
+    protocol = Protocol.from_api({"id": "1", "name": "Aave", "slug": "aave"})
+    tx = BridgeTransaction.from_api({"tx_hash": "0xabc", "ts": 1, "sourceChain": "a"})
+
+    assert pickle.loads(pickle.dumps(protocol)) == protocol
+    assert tx.source_chain == "a"
+    assert tx.amount is None
+    with pytest.raises(TypeError):
+        Protocol(id="1", tvl=2)
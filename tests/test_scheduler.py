@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from defillama_py.ratelimit import RateLimiter
+from defillama_py.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_serves_stale_value_while_revalidating():
+    clock = FakeClock()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(clock())
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    scheduler = Scheduler(clock=clock)
+    scheduler.register("protocols", fetch, interval=60, jitter=0)
+    assert scheduler.get("protocols") == 1
+    assert not scheduler.is_stale("protocols")
+
+    clock.now += 61
+    # Stale: returned immediately while a refresh runs in the background
+    assert scheduler.get("protocols") == 1
+    assert scheduler.status()["protocols"]["refreshing"]
+
+    release.set()
+    scheduler.refresh("protocols").result(5)
+    assert scheduler.get("protocols") == 2
+    assert scheduler.status()["protocols"]["age"] == 0
+    scheduler.stop()
+
+
+def test_registering_a_name_again_replaces_its_refresh_chain():
+    clock = FakeClock()
+    replaced = []
+    fetched = threading.Event()
+
+    scheduler = Scheduler(clock=clock)
+    scheduler.register("protocols", lambda: replaced.append(1), interval=60, jitter=0)
+    scheduler.register("protocols", fetched.set, interval=60, jitter=0)
+
+    with scheduler:
+        assert fetched.wait(5)
+    # Only the second registration was fetched and rescheduled
+    assert replaced == []
+    assert [(due, entry.fetch) for due, _, entry in scheduler.queue] == [
+        (60, fetched.set)
+    ]
+
+
+def test_first_read_raises_fetch_error():
+    def fetch():
+        raise ConnectionError("bridges.llama.fi is down")
+
+    scheduler = Scheduler()
+    scheduler.register("bridges", fetch, interval=60)
+    with pytest.raises(ConnectionError):
+        scheduler.get("bridges")
+    assert isinstance(scheduler.status()["bridges"]["error"], ConnectionError)
+    scheduler.stop()
+
+
+def test_rate_limiter_spreads_requests():
+    limiter = RateLimiter(requests_per_minute=600, burst=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+
+    # Two requests from the burst, then one every 0.1s
+    assert time.monotonic() - start >= 0.15
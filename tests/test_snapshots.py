@@ -0,0 +1,37 @@
+import pandas as pd
+
+from defillama_py.client import Llama
+from defillama_py.snapshots import SnapshotDiffer
+
+
+def test_snapshot_differ_emits_only_changes():
+    differ = SnapshotDiffer(["chain"], rtol=1e-3)
+    first = pd.DataFrame({"chain": ["ethereum", "arbitrum"], "tvl": [100.0, 50.0]})
+
+    changes = differ.update(first)
+    assert len(changes.inserted) == 2 and changes.removed.empty
+
+    second = pd.DataFrame(
+        {"chain": ["ethereum", "arbitrum", "base"], "tvl": [100.01, 60.0, 5.0]}
+    )
+    changes = differ.update(second)
+    assert changes.inserted["chain"].tolist() == ["base"]
+    assert changes.changed["chain"].tolist() == ["arbitrum"]
+    assert changes.removed.empty
+
+    changes = differ.update(second[second["chain"] != "ethereum"])
+    assert changes.removed["chain"].tolist() == ["ethereum"]
+    assert changes.inserted.empty and changes.changed.empty
+
+
+def test_poll_changes(monkeypatch):
+    obj = Llama()
+    snapshots = [
+        [{"name": "Ethereum", "tvl": 1.0}, {"name": "Base", "tvl": None}],
+        [{"name": "Ethereum", "tvl": 2.0}, {"name": "Base", "tvl": None}],
+    ]
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: snapshots.pop(0))
+
+    assert len(obj.poll_changes("chains_tvl").inserted) == 2
+    changes = obj.poll_changes("chains_tvl")
+    assert changes.changed.to_dict("records") == [{"chain": "ethereum", "tvl": 2.0}]
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from defillama_py.client import Llama
+from defillama_py.store import LocalStore
+
+DAY = 86400
+
+
+def frame(values, chain="ethereum"):
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime([i * DAY for i in range(len(values))], unit="s"),
+            "chain": chain,
+            "tvl": values,
+        }
+    )
+
+
+def test_upsert_updates_overlapping_rows_and_adds_columns():
+    store = LocalStore(":memory:")
+    store.upsert("chain_tvl", frame([1.0, 2.0]), ["chain", "date"])
+    store.upsert("chain_tvl", frame([5.0, 6.0, 7.0]).iloc[1:], ["chain", "date"])
+    store.upsert(
+        "chain_tvl", frame([3.0]).assign(fees=0.5, chain="arbitrum"), ["chain", "date"]
+    )
+
+    df = store.query("chain_tvl")
+    assert store.tables() == {"chain_tvl": ["chain", "date"]}
+    assert df["chain"].tolist() == ["arbitrum", "ethereum", "ethereum", "ethereum"]
+    assert df["tvl"].tolist() == [3.0, 1.0, 6.0, 7.0]
+    assert df["fees"].isna().tolist() == [False, True, True, True]
+    assert df["date"].dtype == "datetime64[s]"
+
+
+def test_query_filters_date_range_and_columns():
+    store = LocalStore(":memory:")
+    store.upsert("chain_tvl", frame([1.0, 2.0, 3.0]), ["chain", "date"])
+    store.upsert("chain_tvl", frame([4.0], chain="base"), ["chain", "date"])
+
+    df = store.query(
+        "chain_tvl", columns=["date", "tvl"], since=DAY, chain=["ethereum"]
+    )
+    assert list(df.columns) == ["date", "tvl"]
+    assert df["tvl"].tolist() == [2.0, 3.0]
+    assert store.query("chain_tvl", until="1970-01-02")["tvl"].tolist() == [4.0, 1.0]
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        store.query("chain_tvl", protocol="aave")
+    with pytest.raises(ValueError, match="not in the store"):
+        store.query("fees")
+    with pytest.raises(ValueError, match="not a valid"):
+        store.upsert("fees; drop", frame([1.0]), ["date"])
+
+
+def test_client_writes_transformed_results_to_store(monkeypatch):
+    obj = Llama(store=LocalStore(":memory:"))
+    responses = {
+        "/overview/dexs/ethereum": {"totalDataChart": [[0, 10], [DAY, 20]]},
+        "/overview/dexs/arbitrum": {"totalDataChart": [[DAY, 5]]},
+    }
+    monkeypatch.setattr(
+        obj, "_get", lambda api_tag, endpoint, params=None: responses[endpoint]
+    )
+
+    obj.get_chain_dex_volume(["ethereum", "arbitrum"], raw=False)
+    responses["/overview/dexs/arbitrum"] = {"totalDataChart": [[DAY, 6]]}
+    obj.get_chain_dex_volume("arbitrum", raw=False)
+
+    df = obj.store.query("chain_dex_volume", since=DAY)
+    assert df["chain"].tolist() == ["arbitrum", "ethereum"]
+    assert df.iloc[:, -1].tolist() == [6, 20]
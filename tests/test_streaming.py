@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from defillama_py.client import Llama
+from defillama_py.streaming import prefetch
+
+DAY = 86400
+
+
+def test_prefetch_keeps_order_and_bounds_work_ahead():
+    started = []
+    gate = threading.Event()
+
+    def work(item):
+        started.append(item)
+        if item > 0:
+            gate.wait(1)
+        return item * 10
+
+    results = prefetch(work, range(10), depth=2)
+    assert next(results) == 0
+    assert len(started) <= 3
+    gate.set()
+    assert list(results) == [10 * i for i in range(1, 10)]
+
+
+def test_iter_batches_yields_per_entity_and_row_chunks(monkeypatch):
+    obj = Llama()
+    responses = {
+        "/overview/dexs/ethereum": {"totalDataChart": [[0, 1], [DAY, 2], [2 * DAY, 3]]},
+        "/overview/dexs/arbitrum": {"totalDataChart": [[0, 4]]},
+    }
+    monkeypatch.setattr(
+        obj, "_get", lambda api_tag, endpoint, params=None: responses[endpoint]
+    )
+
+    frames = list(obj.iter_batches("get_chain_dex_volume", ["ethereum", "arbitrum"]))
+    assert [f["chain"].iloc[0] for f in frames] == ["ethereum", "arbitrum"]
+
+    chunks = list(
+        obj.iter_batches("get_chain_dex_volume", ["ethereum", "arbitrum"], batch_size=2)
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 1, 1]
+
+    with pytest.raises(ValueError, match="raw=False"):
+        next(obj.iter_batches("get_chains"))
@@ -0,0 +1,202 @@
+import pandas as pd
+import pytest
+
+from defillama_py.client import (
+    CHAIN_DEX_VOLUME,
+    PROTOCOL_FEES_REVENUE,
+    Llama,
+)
+from defillama_py.timeseries import (
+    BREAKDOWN,
+    CHART,
+    assemble,
+    chain_alias_table,
+    normalize_chain_column,
+    series_mode,
+)
+
+OVERVIEW_RESPONSE = {
+    "totalDataChart": [[1690000000, 10], [1690086400, 20]],
+    "totalDataChartBreakdown": [
+        [1690000000, {"uniswap": 6, "curve": 4}],
+        [1690086400, {"uniswap": 15, "curve": 5}],
+    ],
+}
+
+SUMMARY_RESPONSE = {
+    "totalDataChart": [[1690000000, 3.5]],
+    "totalDataChartBreakdown": [
+        [1690000000, {"Ethereum": {"v2": 1, "v3": 2}, "zkSync Era": {"v3": 0.5}}],
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        (None, CHART),
+        ({"excludeTotalDataChart": True}, BREAKDOWN),
+        (
+            {"excludeTotalDataChart": True, "excludeTotalDataChartBreakdown": True},
+            CHART,
+        ),
+        ({"excludeTotalDataChartBreakdown": True}, CHART),
+    ],
+)
+def test_series_mode(params, expected):
+    assert series_mode(params) == expected
+
+
+def test_assemble_chart_is_typed():
+    df = assemble(CHAIN_DEX_VOLUME, {"Arbitrum One": OVERVIEW_RESPONSE})
+
+    assert list(df.columns) == ["date", "chain", "volume"]
+    assert df["date"].dtype == "datetime64[s]"
+    assert df["volume"].dtype == "float64"
+    assert isinstance(df["chain"].dtype, pd.CategoricalDtype)
+    assert df["chain"].tolist() == ["arbitrum_one", "arbitrum_one"]
+
+
+def test_assemble_summary_breakdown():
+    params = {"excludeTotalDataChart": True, "dataType": "dailyRevenue"}
+    df = assemble(PROTOCOL_FEES_REVENUE, {"uniswap": SUMMARY_RESPONSE}, params)
+
+    assert list(df.columns) == [
+        "date",
+        "protocol",
+        "chain",
+        "protocol_version",
+        "daily_revenue",
+    ]
+    assert df["chain"].tolist() == ["ethereum", "ethereum", "zksync_era"]
+    assert df["daily_revenue"].sum() == SUMMARY_RESPONSE["totalDataChart"][0][1]
+
+
+def test_volume_methods_share_engine(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: OVERVIEW_RESPONSE)
+    params = {"excludeTotalDataChart": True}
+
+    dex = obj.get_dex_volume(params=params, raw=False)
+    chains = obj.get_chain_dex_volume(["ethereum", "optimism"], params, raw=False)
+
+    assert list(dex.columns) == ["date", "protocol", "volume"]
+    assert len(chains) == 2 * len(dex)
+    assert chains["chain"].cat.categories.tolist() == ["ethereum", "optimism"]
+
+
+def test_missing_data_raises(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: {})
+
+    with pytest.raises(ValueError, match="dailyFees"):
+        obj.get_protocol_fees_revenue("uniswap", raw=False)
+
+
+def test_both_uses_one_request_and_reconciles(monkeypatch):
+    obj = Llama()
+    calls = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(params)
+        return SUMMARY_RESPONSE
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    pair = obj.get_protocol_dex_volume(
+        "uniswap", params={"excludeTotalDataChart": True}, raw=False, both=True
+    )
+
+    assert len(calls) == 1
+    assert calls[0]["excludeTotalDataChart"] is False
+    assert calls[0]["excludeTotalDataChartBreakdown"] is False
+    assert len(pair.total) == 1 and len(pair.breakdown) == 3
+    assert pair.mismatches.empty
+
+
+def test_both_reports_mismatches(monkeypatch):
+    obj = Llama()
+    response = dict(
+        OVERVIEW_RESPONSE, totalDataChart=[[1690000000, 10], [1690086400, 21]]
+    )
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: response)
+
+    pair = obj.get_chain_dex_volume("ethereum", raw=False, both=True)
+
+    assert pair.mismatches["difference"].tolist() == [1.0]
+    assert pair.mismatches["chain"].tolist() == ["ethereum"]
+
+
+def test_normalize_chain_column_uses_distinct_values_and_aliases():
+    aliases = chain_alias_table(["zkSync Era", "Ethereum"])
+    column = pd.Series(["zkSync Era", "ZKsyncEra", None, "Polygon-PoS", "ethereum"])
+
+    result = normalize_chain_column(column, aliases)
+    assert result.dtype == column.dtype
+    assert result.tolist()[:2] == ["zksync_era", "zksync_era"]
+    assert pd.isna(result[2])
+    assert result.tolist()[3:] == ["polygon_pos", "ethereum"]
+
+    categorical = normalize_chain_column(column.astype("category"), aliases)
+    assert sorted(categorical.cat.categories) == [
+        "ethereum",
+        "polygon_pos",
+        "zksync_era",
+    ]
+
+
+def test_clean_chain_name_uses_cached_alias_table(monkeypatch):
+    obj = Llama(chain_aliases=True)
+    calls = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(endpoint)
+        return [{"chainId": 324, "name": "zkSync Era"}]
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    for _ in range(2):
+        df = obj._clean_chain_name(pd.DataFrame({"chain": ["ZKsyncEra", "zksync era"]}))
+        assert df["chain"].tolist() == ["zksync_era", "zksync_era"]
+    assert calls == ["/v2/chains"]
+
+
+def test_assemble_applies_chain_aliases():
+    response = {
+        "totalDataChartBreakdown": [
+            [1690000000, {"zkSync Era": {"v3": 1}, "ZKsyncEra": {"v3": 2}}],
+        ]
+    }
+    aliases = chain_alias_table(["zkSync Era"])
+
+    responses = {"uniswap": response}
+    df = assemble(PROTOCOL_FEES_REVENUE, responses, mode=BREAKDOWN, aliases=aliases)
+    assert list(df["chain"].cat.categories) == ["zksync_era"]
+    df = assemble(PROTOCOL_FEES_REVENUE, responses, mode=BREAKDOWN)
+    assert list(df["chain"].cat.categories) == ["zksync_era", "zksyncera"]
+
+
+def test_series_methods_apply_chain_aliases(monkeypatch):
+    obj = Llama(chain_aliases=True)
+
+    def fake_get(api_tag, endpoint, params=None):
+        if endpoint == "/v2/chains":
+            return [{"chainId": 324, "name": "zkSync Era"}]
+        return {"totalDataChart": [[1690000000, 1]]}
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    df = obj.get_chain_dex_volume(["ZKsyncEra", "zksync-era"], raw=False)
+    assert df["chain"].tolist() == ["zksync_era", "zksync_era"]
+
+
+def test_failed_alias_fetch_is_not_cached(monkeypatch):
+    obj = Llama(chain_aliases=True)
+    chains = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        if not chains:
+            raise ConnectionError("down")
+        return chains
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    assert obj._chain_alias_table() == {}
+    chains.append({"chainId": 324, "name": "zkSync Era"})
+    assert obj._chain_alias_table() == {"zksyncera": "zksync_era"}
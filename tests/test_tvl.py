@@ -0,0 +1,110 @@
+import numpy as np
+
+from defillama_py.client import Llama
+from defillama_py.timeseries import chain_alias_table
+from defillama_py.tvl import TvlHistory, extract_tokens, extract_tvl
+
+AAVE = {
+    "chainTvls": {
+        "Ethereum": {
+            "tvl": [
+                {"date": 1690000000, "totalLiquidityUSD": 100},
+                {"date": 1690086400, "totalLiquidityUSD": 120},
+            ],
+            "tokens": [
+                {"date": 1690000000, "tokens": {"USDC": 40, "WETH": 0.5}},
+                {"date": 1690086400, "tokens": {"USDC": 60}},
+            ],
+            "tokensInUsd": [
+                {"date": 1690000000, "tokens": {"USDC": 40, "WETH": 60}},
+                {"date": 1690086400, "tokens": {"USDC": 60}},
+            ],
+        },
+        "Polygon-borrowed": {
+            "tvl": [{"date": 1690000000, "totalLiquidityUSD": None}],
+            "tokensInUsd": [{"date": 1690000000, "tokens": {"USDC": 7}}],
+        },
+    }
+}
+CURVE = {"chainTvls": {"Ethereum": {"tvl": [{"date": 1690000000, "tvl": 1}]}}}
+
+
+def test_extract_tvl_columns():
+    df = extract_tvl({"aave": AAVE, "curve": CURVE})
+
+    assert list(df.columns) == ["date", "chain", "protocol", "tvl"]
+    assert df["date"].dtype == "datetime64[s]"
+    assert df["chain"].tolist() == ["ethereum"] * 2 + ["polygon_borrowed", "ethereum"]
+    assert df["protocol"].tolist() == ["aave"] * 3 + ["curve"]
+    assert df["tvl"].iloc[:2].tolist() == [100.0, 120.0]
+    assert np.isnan(df["tvl"].iloc[2:]).all()
+
+
+def test_extract_tokens_long_table():
+    df = extract_tokens({"aave": AAVE})
+
+    assert df["token"].tolist() == ["USDC", "WETH", "USDC", "USDC"]
+    assert df["amount"].iloc[:3].tolist() == [40.0, 0.5, 60.0]
+    assert df["amount_usd"].tolist() == [40.0, 60.0, 60.0, 7.0]
+    assert np.isnan(df["amount"].iloc[3])
+
+
+def test_extractors_apply_chain_aliases():
+    zksync = {
+        "chainTvls": {
+            "zkSync Era": AAVE["chainTvls"]["Ethereum"],
+            "ZKsyncEra": AAVE["chainTvls"]["Ethereum"],
+        }
+    }
+    aliases = chain_alias_table(["zkSync Era"])
+
+    tvl = extract_tvl({"aave": zksync}, aliases)
+    assert list(tvl["chain"].cat.categories) == ["zksync_era"]
+    tokens = extract_tokens({"aave": zksync}, aliases)
+    assert list(tokens["chain"].cat.categories) == ["zksync_era"]
+    assert list(extract_tvl({"aave": zksync})["chain"].cat.categories) == [
+        "zksync_era",
+        "zksyncera",
+    ]
+
+
+def test_get_protocol_historical_tvl_include_tokens(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: AAVE)
+
+    result = obj.get_protocol_historical_tvl("aave", raw=False, include_tokens=True)
+
+    assert isinstance(result, TvlHistory)
+    assert len(result.tvl) == 3 and len(result.tokens) == 4
+
+
+def test_token_breakdown(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda api_tag, endpoint, params=None: AAVE)
+
+    breakdown = obj.get_protocol_token_tvl(["aave", "spark"])
+
+    # Polygon-borrowed is an extra TVL category, not a chain
+    assert breakdown.chains == ["Ethereum"]
+    assert breakdown.tokens == ["USDC", "WETH"]
+    assert breakdown.token_codes.dtype == np.int32
+    assert len(breakdown) == 6
+
+    totals = breakdown.aggregate(["token"])
+    assert dict(zip(totals["token"], totals["tvl_usd"])) == {
+        "USDC": 200.0,
+        "WETH": 120.0,
+    }
+
+    sparse = breakdown.to_sparse()
+    assert sparse["WETH"].dtype.subtype == np.float64
+    assert sparse["WETH"].sparse.density == 0.5
+    assert sparse.sparse.to_dense()["USDC"].tolist() == [80.0, 120.0]
+
+    missing = breakdown.to_sparse(fill_value=np.nan)["WETH"]
+    assert missing.sparse.density == 0.5
+    assert np.isnan(missing.iloc[1])
+
+    spark = breakdown.filter(protocols=["spark"]).to_long()
+    assert spark["protocol"].unique().tolist() == ["spark"]
+    assert len(spark) == 3
@@ -0,0 +1,77 @@
+import pytest
+
+from defillama_py.client import Llama
+from defillama_py.validation import MappingIndex
+
+RESPONSES = {
+    "/v2/chains": [{"chainId": 1, "name": "Ethereum"}, {"name": "zkSync Era"}],
+    "/protocols": [
+        {"slug": "aave-v3", "name": "Aave V3", "parentProtocol": "parent#aave"},
+        {"slug": "uniswap-v3", "name": "Uniswap V3"},
+    ],
+    "/overview/dexs/Ethereum": {"totalDataChart": [[0, 1]]},
+    "/overview/dexs/zksync era": {"totalDataChart": [[0, 1]]},
+    "/summary/dexs/aave": {"totalDataChart": [[0, 1]]},
+}
+
+
+@pytest.fixture
+def obj(monkeypatch):
+    obj = Llama(validate=True)
+    calls = []
+
+    def fake_get(api_tag, endpoint, params=None):
+        calls.append(endpoint)
+        return RESPONSES[endpoint]
+
+    monkeypatch.setattr(obj, "_get", fake_get)
+    obj.calls = calls
+    return obj
+
+
+def test_index_normalizes_like_clean_chain_name():
+    index = MappingIndex("chain", ["zkSync Era", "Ethereum"])
+
+    assert "zksync-era" in index
+    assert "ZKSYNC_ERA" in index
+    assert index.suggest("etherum") == ["Ethereum"]
+
+
+@pytest.mark.parametrize("name", ["Aave V3", "aave_v3", "AAVE-V3"])
+def test_protocols_match_exact_slugs_only(obj, name):
+    # Display names and chain-style spellings would pass a normalized lookup but
+    # fail at the API, so they are rejected with the slug as the suggestion
+    with pytest.raises(
+        ValueError, match=f"Unknown protocol '{name}'. Did you mean 'aave-v3'"
+    ):
+        obj.get_protocol_dex_volume(name)
+
+    assert obj.calls == ["/protocols"]
+
+
+def test_unknown_inputs_fail_before_any_request(obj):
+    with pytest.raises(ValueError, match="Unknown chain 'etherum'. Did you mean"):
+        obj.get_chain_dex_volume(["Ethereum", "etherum"])
+
+    # Only the mapping itself was fetched
+    assert obj.calls == ["/v2/chains"]
+
+    # The mapping is cached for later calls
+    obj.get_chain_dex_volume("zksync era")
+    assert obj.calls.count("/v2/chains") == 1
+
+
+def test_collect_mode_skips_unknown_inputs(obj):
+    result = obj.get_protocol_dex_volume(["aave", "aavee"], errors="collect")
+
+    assert list(result.data) == ["aave"]
+    assert result.errors["aavee"].kind == "invalid_input"
+    assert "'aave'" in result.errors["aavee"].message
+    assert "/summary/dexs/aavee" not in obj.calls
+
+
+def test_validation_is_opt_in(monkeypatch):
+    obj = Llama()
+    monkeypatch.setattr(obj, "_get", lambda *args, **kwargs: {"tvl": []})
+
+    obj.get_protocol_historical_tvl("anything")